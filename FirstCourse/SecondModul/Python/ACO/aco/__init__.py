@@ -1,7 +1,13 @@
-import matplotlib.pyplot as plt
 import numpy as np
 from ant import Ant
+from aco.kernels import construct_batch, select_index
+from aco.local_search import LOCAL_SEARCHES
+from aco.result import ColonyResult, IterationStats
+from concurrent.futures import ProcessPoolExecutor
+import math
+import os
 import random
+import time
 
 
 class AntColony:
@@ -15,6 +21,19 @@ class AntColony:
         pheromone_evaporation_rate=0.3,  # Скорость испарения феромонов
         pheromone_constant=1.0,  # Константа феромонов
         iterations=100,  # Количество итераций алгоритма
+        use_matrix=False,  # Хранить веса и феромоны в плотных массивах NumPy
+        seed=None,  # Зерно генератора случайных чисел
+        workers=None,  # Количество процессов для построения маршрутов
+        executor=None,  # Внешний пул процессов для построения маршрутов
+        batched=False,  # Строить маршруты всех муравьев одновременно
+        candidate_count=None,  # Размер списков ближайших соседей
+        local_search=None,  # Локальный поиск после построения маршрутов
+        local_search_scope='best',  # Какие маршруты улучшать: 'best' или 'all'
+        patience=None,  # Остановка после стольких итераций без улучшения
+        min_branching=None,  # Остановка при коэффициенте ветвления ниже порога
+        min_entropy=None,  # Остановка при энтропии феромонов ниже порога
+        time_limit=None,  # Ограничение времени работы в секундах
+        track_best_path_probability=True,  # Считать вероятность лучшего пути на каждой итерации
     ):
         """
         Инициализация алгоритма колонии муравьев с заданными параметрами.
@@ -27,7 +46,44 @@ class AntColony:
         :param pheromone_evaporation_rate: Скорость испарения феромонов.
         :param pheromone_constant: Константа феромонов.
         :param iterations: Количество итераций для выполнения алгоритма.
+        :param use_matrix: Если True, граф один раз компилируется в плотные матрицы
+            весов, эвристики и феромонов (float64), а испарение и отложение феромонов
+            выполняются операциями над целыми массивами.
+        :param seed: Зерно генератора случайных чисел для воспроизводимых запусков.
+        :param workers: Количество процессов ProcessPoolExecutor, между которыми
+            распределяются муравьи каждой итерации (требует use_matrix=True).
+        :param executor: Готовый пул процессов вместо создаваемого по workers.
+            Колония не закрывает переданный пул.
+        :param batched: Если True, все муравьи итерации строят маршруты одновременно
+            векторными операциями над двумерными массивами (требует use_matrix=True).
+        :param candidate_count: Если задан, муравей выбирает следующий узел только среди
+            candidate_count ближайших соседей текущего узла и переходит к полному набору
+            соседей, лишь когда все кандидаты посещены.
+        :param local_search: Стадия улучшения маршрутов: '2-opt', 'or-opt' или функция
+            (маршрут в индексах, матрица весов) -> улучшенный маршрут (требует use_matrix=True).
+        :param local_search_scope: 'best' — улучшать лучший маршрут итерации (вклад улучшенного
+            маршрута заменяет вклад исходного), 'all' — улучшать маршрут каждого
+            муравья до отложения феромона.
+        :param patience: Остановить поиск, если лучший путь не улучшался patience итераций подряд.
+        :param min_branching: Остановить поиск, когда средний lambda-коэффициент ветвления
+            (branching_factor) опустится ниже порога — феромоны сошлись к одному маршруту.
+        :param min_entropy: Остановить поиск, когда средняя нормированная энтропия
+            феромонов (pheromone_entropy) опустится ниже порога.
+        :param time_limit: Остановить поиск после указанного числа секунд.
+        :param track_best_path_probability: Если False, вероятность лучшего пути не
+            вычисляется (экономит время в рабочих запусках).
         """
+        if (workers or executor) and not use_matrix:
+            raise ValueError("Параллельное построение маршрутов требует use_matrix=True")
+        if batched and not use_matrix:
+            raise ValueError("Пакетное построение маршрутов требует use_matrix=True")
+        if batched and (workers or executor):
+            raise ValueError("Пакетное построение маршрутов не совместимо с пулом процессов")
+        if local_search and not use_matrix:
+            raise ValueError("Локальный поиск требует use_matrix=True")
+        if local_search_scope not in ('best', 'all'):
+            raise ValueError("local_search_scope должен быть 'best' или 'all'")
+
         self.graph = graph  # Граф для поиска
         self.start_node = start_node  # Начальный узел
         self.ant_count = ant_count  # Количество муравьев
@@ -36,57 +92,543 @@ class AntColony:
         self.pheromone_evaporation_rate = pheromone_evaporation_rate  # Скорость испарения феромонов
         self.pheromone_constant = pheromone_constant  # Константа феромонов
         self.iterations = iterations  # Количество итераций
+        self.use_matrix = use_matrix  # Режим хранения феромонов в матрицах
+        self.seed = seed  # Зерно генератора случайных чисел
+        self.random = random.Random(seed)  # Генератор для словарного режима
+        self.rng = np.random.default_rng(seed)  # Генератор для матричного режима
+        self.seed_sequence = np.random.SeedSequence(seed)  # Источник зерен для муравьев в процессах
+        self.workers = workers  # Количество процессов
+        self.executor = executor  # Внешний пул процессов
+        self.batched = batched  # Пакетное построение маршрутов
+        self.candidate_count = candidate_count  # Размер списков кандидатов
+        self.local_search = LOCAL_SEARCHES.get(local_search, local_search)  # Процедура локального поиска
+        self.local_search_scope = local_search_scope  # Область применения локального поиска
+        self.patience = patience  # Допустимое число итераций без улучшения
+        self.min_branching = min_branching  # Порог коэффициента ветвления
+        self.min_entropy = min_entropy  # Порог энтропии феромонов
+        self.time_limit = time_limit  # Ограничение времени работы
+        self.track_best_path_probability = track_best_path_probability  # Отслеживание вероятности лучшего пути
+        # Списки кандидатов принадлежат колонии: граф не изменяется, и колонии с разными
+        # candidate_count на одном графе не мешают друг другу
+        self.candidate_lists = graph.nearest_neighbors(candidate_count) if candidate_count else None
 
         self.num_nodes = len(graph.nodes)  # Количество узлов в графе
-        self.pheromone_map = {
-            (i, j): 1 for i in graph.nodes for j in graph.get_neighbors(i)
-        }  # Инициализация карты феромонов
-
-        self.tmp_pheromone_map = {
-            (i, j): 0 for i in graph.nodes for j in graph.get_neighbors(i)
-        }  # Временная карта феромонов для обновления
+        if self.use_matrix:
+            self.compile_graph()  # Компилируем граф в матрицы
+            self.update_attractiveness()  # Кэшируем привлекательность ребер
+            self.pheromone_map = None
+            self.tmp_pheromone_map = None
+        else:
+            self.pheromone_map = {
+                (i, j): 1 for i in graph.nodes for j, _ in graph.iter_neighbors(i)
+            }  # Инициализация карты феромонов
+
+            self.tmp_pheromone_map = {
+                (i, j): 0 for i in graph.nodes for j, _ in graph.iter_neighbors(i)
+            }  # Временная карта феромонов для обновления
 
         self.best_path = None  # Лучший найденный путь
         self.best_cost = float('inf')  # Стоимость лучшего пути
-        self.path_lengths = [float('inf')] * self.iterations  # Длины путей на каждой итерации
-        self.best_path_probabilities = []  # Вероятности для лучшего пути на каждой итерации
-
-    def run(self):
+        self.iteration_best_path = None  # Лучший путь последней итерации
+        self.iteration_best_cost = float('inf')  # Стоимость лучшего пути последней итерации
+        self.best_costs = np.full(self.iterations, np.inf)  # Стоимость лучшего пути после каждой итерации
+        self.iterations_done = 0  # Количество выполненных итераций
+        self.stale_iterations = 0  # Итерации подряд без улучшения лучшего пути
+        self.best_path_probabilities = np.zeros(self.iterations)  # Вероятности для лучшего пути на каждой итерации
+        self.best_path_log_probabilities = np.full(self.iterations, -np.inf)  # Те же вероятности в log-шкале
+        self.best_path_log_heuristic = None  # Кэш: (лучший путь, beta * сумма log эвристики по его ребрам)
+        self.best_path_log_pheromone = None  # Кэш: (лучший путь, номер итерации, сумма log феромона по его ребрам)
+        self.best_path_edges = None  # Матрица-маска ребер лучшего пути (для инкрементного обновления кэша)
+        self.best_path_deposits = []  # Ребра лучшего пути, получившие феромон на текущей итерации
+        self.result = None  # Результат последнего запуска (ColonyResult)
+
+    def run(self, callback=None):
         """
         Запуск алгоритма колонии муравьев. Итерирует по количеству итераций,
-        строит решения для каждого муравья и обновляет феромоны.
+        строит решения для каждого муравья и обновляет феромоны. Поиск может
+        завершиться раньше по критериям patience, min_branching, min_entropy и time_limit.
         
-        :return: Лучший путь и его стоимость.
+        :param callback: Функция, которая вызывается после каждой итерации с объектом
+            IterationStats (например, для записи метрик в лог).
+        :return: Объект ColonyResult (распаковывается как лучший путь и его стоимость).
+        """
+        for stats in self.iterate():
+            if callback is not None:
+                callback(stats)
+        return self.result
+
+    def iterate(self):
         """
-        ants = [Ant(alpha=self.alpha, beta=self.beta) for _ in range(self.ant_count)]  # Создаем муравьев
+        Запускает алгоритм как генератор: после каждой итерации выдает объект
+        IterationStats (лучшая стоимость, средняя стоимость, доля успешных муравьев,
+        время работы). После завершения результат доступен в self.result.
+        Не требует matplotlib и не блокирует выполнение.
 
-        for iteration in range(self.iterations):  # Проходим по итерациям
+        :return: Генератор объектов IterationStats.
+        """
+        if self.workers or self.executor:
+            yield from self.iterate_parallel()
+        elif self.batched:
+            yield from self.iterate_with(lambda iteration: self.construct_batched())
+        else:
+            ants = [Ant(alpha=self.alpha, beta=self.beta) for _ in range(self.ant_count)]  # Создаем муравьев
+            yield from self.iterate_with(lambda iteration: self.construct_sequential(ants))
+
+    def iterate_parallel(self):
+        """
+        Итерации с построением маршрутов в пуле процессов. Матрицы
+        привлекательности и весов на время запуска переносятся в разделяемую память,
+        поэтому работники видят обновления феромонов без копирования.
+
+        :return: Генератор объектов IterationStats.
+        """
+        from aco.parallel import SharedMatrix
+
+        shared = {
+            'attractiveness': SharedMatrix(self.attractiveness),
+            'weights': SharedMatrix(self.weights),
+            'candidates': None if self.candidates is None else SharedMatrix(self.candidates),
+        }  # Матрицы в разделяемой памяти
+        self.attractiveness = shared['attractiveness'].array  # update_attractiveness пишет прямо в блок
+        executor = self.executor or ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            yield from self.iterate_with(lambda iteration: self.construct_parallel(executor, iteration, shared))
+        finally:
+            if executor is not self.executor:
+                executor.shutdown()
+            self.attractiveness = None
+            self.attractiveness = shared['attractiveness'].release()  # Возвращаем матрицу в память процесса
+            shared['weights'].release()
+            if shared['candidates'] is not None:
+                shared['candidates'].release()
+
+    def iterate_with(self, construct):
+        """
+        Основной цикл итераций, общий для последовательного и параллельного запуска.
+        Начинается с итерации iterations_done, поэтому повторный вызов или запуск
+        после restore_checkpoint продолжает поиск, а не начинает его заново.
+
+        :param construct: Функция, которая по номеру итерации возвращает
+            последовательность (успех, стоимость, маршрут) для всех муравьев.
+        :return: Генератор объектов IterationStats; итоговый ColonyResult записывается в self.result.
+        """
+        start_time = time.perf_counter()  # Время начала запуска
+
+        for iteration in range(self.iterations_done, self.iterations):  # Продолжаем с первой невыполненной итерации
+            iteration_start = time.perf_counter()
             iteration_best_cost = float('inf')  # Наилучшая стоимость пути для текущей итерации
             successful_paths = 0  # Количество успешных путей
+            total_cost = 0.0  # Сумма стоимостей успешных путей
 
-            best_path_probability = 0  # Вероятность для лучшего пути в текущей итерации
-
-            for ant in ants:  # Строим пути для каждого муравья
-                ant.reset(self.start_node)  # Сбрасываем муравья для новой итерации
-                success, path_cost = self.construct_solution(ant)  # Строим решение
+            iteration_best_path = None  # Лучший путь текущей итерации
 
+            for success, path_cost, route in construct(iteration):  # Строим пути для каждого муравья
                 if success:
                     successful_paths += 1  # Увеличиваем количество успешных путей
-                    if path_cost < self.best_cost:
+                    total_cost += path_cost
+                    if path_cost < iteration_best_cost:
                         iteration_best_cost = path_cost
-                        self.best_cost = iteration_best_cost
-                        self.best_path = ant.route  # Обновляем лучший путь
-
-            self.path_lengths[iteration] = self.best_cost  # Сохраняем стоимость лучшего пути на итерации
+                        iteration_best_path = route
+
+            if iteration_best_path is not None and self.local_search and self.local_search_scope == 'best':
+                improved_path, improved_cost = self.improve_route(iteration_best_path)
+                if improved_cost < iteration_best_cost:
+                    # Исходный маршрут уже отложил феромон при построении: заменяем его вклад вкладом улучшенного
+                    self.deposit_route(self.route_indices(iteration_best_path), iteration_best_cost, scale=-1.0)
+                    self.deposit_route(self.route_indices(improved_path), improved_cost)
+                    iteration_best_path, iteration_best_cost = improved_path, improved_cost
+
+            if iteration_best_cost < self.best_cost:
+                self.best_cost = iteration_best_cost
+                self.best_path = iteration_best_path  # Обновляем лучший путь
+                self.stale_iterations = 0
+            else:
+                self.stale_iterations += 1
+
+            self.iteration_best_path = iteration_best_path  # Доступно вариантам с отложением только лучшим путем
+            self.iteration_best_cost = iteration_best_cost
+            self.best_costs[iteration] = self.best_cost  # Сохраняем стоимость лучшего пути на итерации
+            self.iterations_done = iteration + 1
             self.update_pheromones()  # Обновляем феромоны
 
-            if self.best_path:
-                best_path_probability = self.calculate_best_path_probability()  # Рассчитываем вероятность лучшего пути
-            self.best_path_probabilities.append(best_path_probability)  # Добавляем вероятность в список
+            if self.track_best_path_probability and self.best_path:
+                log_probability = self.calculate_best_path_log_probability()  # Рассчитываем вероятность в log-шкале
+                self.best_path_log_probabilities[iteration] = log_probability
+                self.best_path_probabilities[iteration] = math.exp(log_probability)
+
+            now = time.perf_counter()
+            yield IterationStats(
+                iteration=iteration,
+                best_cost=self.best_cost,
+                iteration_best_cost=iteration_best_cost,
+                mean_cost=total_cost / successful_paths if successful_paths else float('inf'),
+                success_ratio=successful_paths / self.ant_count if self.ant_count else 0.0,
+                iteration_time=now - iteration_start,
+                wall_time=now - start_time,
+            )
+
+            stop_reason = self.check_convergence(self.stale_iterations, time.perf_counter() - start_time)
+            if stop_reason:  # Критерий остановки выполнен
+                break
+        else:
+            stop_reason = 'iterations'
+
+        self.result = self.build_result(stop_reason, time.perf_counter() - start_time)
+
+    def build_result(self, stop_reason, wall_time):
+        """
+        Собирает ColonyResult из текущего состояния колонии.
+
+        :param stop_reason: Причина остановки.
+        :param wall_time: Время работы в секундах.
+        :return: Объект ColonyResult.
+        """
+        return ColonyResult(
+            best_path=self.best_path,
+            best_cost=self.best_cost,
+            iterations=self.iterations_done,
+            wall_time=wall_time,
+            best_costs=self.best_costs[:self.iterations_done].copy(),
+            stop_reason=stop_reason,
+        )
+
+    def save_checkpoint(self, path):
+        """
+        Сохраняет состояние колонии в каталог: матрицу феромонов в pheromone.npy
+        и остальное состояние (лучший путь, номер итерации, состояния генераторов)
+        в state.pkl. Удобно вызывать из callback метода run.
+
+        :param path: Путь к каталогу контрольной точки.
+        """
+        from aco.checkpoint import save_checkpoint
+
+        save_checkpoint(self, path)
+
+    def restore_checkpoint(self, path, mmap=True):
+        """
+        Восстанавливает состояние колонии из контрольной точки. Колония должна быть
+        создана с теми же графом и параметрами; после восстановления run продолжает
+        поиск так же, как продолжил бы исходный запуск.
+
+        :param path: Путь к каталогу контрольной точки.
+        :param mmap: Отображать pheromone.npy в память (копирование при записи)
+            вместо чтения файла целиком.
+        """
+        from aco.checkpoint import load_checkpoint
+
+        load_checkpoint(self, path, mmap=mmap)
+
+    def checkpoint_state(self):
+        """
+        Возвращает состояние, которое сохраняется в контрольной точке помимо
+        матрицы феромонов. Варианты алгоритма дополняют словарь своими полями.
+
+        :return: Словарь состояния.
+        """
+        return {
+            'best_path': self.best_path,
+            'best_cost': self.best_cost,
+            'iteration_best_path': self.iteration_best_path,
+            'iteration_best_cost': self.iteration_best_cost,
+            'iterations_done': self.iterations_done,
+            'stale_iterations': self.stale_iterations,
+            'best_costs': self.best_costs[:self.iterations_done].copy(),
+            'best_path_log_probabilities': self.best_path_log_probabilities[:self.iterations_done].copy(),
+            'random_state': self.random.getstate(),
+            'rng_state': self.rng.bit_generator.state,
+            'seed_entropy': self.seed_sequence.entropy,
+            'pheromone_map': self.pheromone_map,
+        }
+
+    def load_state(self, state):
+        """
+        Восстанавливает состояние из словаря checkpoint_state. Массивы по итерациям
+        заново выделяются под текущее значение iterations, поэтому восстановленный
+        запуск можно продлить.
+
+        :param state: Словарь состояния.
+        """
+        done = state['iterations_done']
+        if done > self.iterations:
+            raise ValueError(f"Контрольная точка содержит {done} итераций, а колония рассчитана на {self.iterations}")
+
+        self.best_path = state['best_path']
+        self.best_cost = state['best_cost']
+        self.iteration_best_path = state['iteration_best_path']
+        self.iteration_best_cost = state['iteration_best_cost']
+        self.iterations_done = done
+        self.stale_iterations = state['stale_iterations']
+        self.best_costs = np.full(self.iterations, np.inf)
+        self.best_costs[:done] = state['best_costs']
+        self.best_path_log_probabilities = np.full(self.iterations, -np.inf)
+        self.best_path_log_probabilities[:done] = state['best_path_log_probabilities']
+        self.best_path_probabilities = np.exp(self.best_path_log_probabilities)
+        self.best_path_log_heuristic = None
+        self.best_path_log_pheromone = None
+        self.random.setstate(state['random_state'])
+        self.rng.bit_generator.state = state['rng_state']
+        self.seed_sequence = np.random.SeedSequence(state['seed_entropy'])
+        if not self.use_matrix:
+            self.pheromone_map = state['pheromone_map']
+            self.tmp_pheromone_map = dict.fromkeys(self.pheromone_map, 0)
+
+    def check_convergence(self, stale_iterations, elapsed):
+        """
+        Проверяет критерии досрочной остановки.
+
+        :param stale_iterations: Количество итераций подряд без улучшения.
+        :param elapsed: Время работы в секундах.
+        :return: Причина остановки или None, если поиск продолжается.
+        """
+        if self.patience is not None and stale_iterations >= self.patience:
+            return 'patience'
+        if self.time_limit is not None and elapsed >= self.time_limit:
+            return 'time_limit'
+        if self.min_branching is not None and self.branching_factor() < self.min_branching:
+            return 'branching'
+        if self.min_entropy is not None and self.pheromone_entropy() < self.min_entropy:
+            return 'entropy'
+        return None
+
+    def branching_factor(self, lam=0.05):
+        """
+        Вычисляет средний lambda-коэффициент ветвления: для каждого узла считается
+        число ребер с феромоном не ниже tau_min + lam * (tau_max - tau_min).
+        Значение около 1 означает, что феромоны сошлись к одному маршруту.
+
+        :param lam: Параметр lambda.
+        :return: Среднее число "активных" ребер на узел.
+        """
+        if self.use_matrix:
+            edges = np.isfinite(self.weights)
+            pheromone = self.pheromone_matrix()
+            tau_max = np.where(edges, pheromone, -np.inf).max(axis=1, keepdims=True)
+            tau_min = np.where(edges, pheromone, np.inf).min(axis=1, keepdims=True)
+            active = edges & (pheromone >= tau_min + lam * (tau_max - tau_min))
+            return active.sum() / max(len(self.weights), 1)
+
+        total = 0
+        for node_id in self.graph.nodes:
+            values = [self.pheromone_map[(node_id, neighbor)] for neighbor, _ in self.graph.iter_neighbors(node_id)]
+            if values:
+                threshold = min(values) + lam * (max(values) - min(values))
+                total += sum(value >= threshold for value in values)
+        return total / max(self.num_nodes, 1)
+
+    def pheromone_entropy(self):
+        """
+        Вычисляет среднюю по узлам энтропию распределения феромонов на исходящих
+        ребрах, нормированную на log(степень узла): 1 — феромоны распределены
+        равномерно, 0 — весь феромон сосредоточен на одном ребре.
+
+        :return: Нормированная энтропия в диапазоне [0, 1].
+        """
+        if self.use_matrix:
+            pheromone = self.pheromone_matrix()
+            totals = pheromone.sum(axis=1, keepdims=True)
+            shares = np.divide(pheromone, totals, out=np.zeros_like(pheromone), where=totals > 0)
+            logs = np.log(shares, out=np.zeros_like(shares), where=shares > 0)
+            entropy = -(shares * logs).sum(axis=1)
+            degrees = np.isfinite(self.weights).sum(axis=1)
+        else:
+            entropy, degrees = [], []
+            for node_id in self.graph.nodes:
+                values = [self.pheromone_map[(node_id, neighbor)] for neighbor, _ in self.graph.iter_neighbors(node_id)]
+                total = sum(values)
+                entropy.append(-sum(v / total * np.log(v / total) for v in values if v > 0) if total > 0 else 0.0)
+                degrees.append(len(values))
+            entropy, degrees = np.asarray(entropy), np.asarray(degrees)
+
+        branching = degrees > 1  # Узлы с единственным ребром не влияют на сходимость
+        if not branching.any():
+            return 0.0
+        return float((entropy[branching] / np.log(degrees[branching])).mean())
+
+    def construct_sequential(self, ants):
+        """
+        Строит маршруты всех муравьев итерации в текущем процессе.
+
+        :param ants: Список муравьев.
+        :return: Генератор троек (успех, стоимость, маршрут).
+        """
+        for ant in ants:
+            ant.reset(self.start_node)  # Сбрасываем муравья для новой итерации
+            if self.use_matrix:
+                ant.reset_mask(self.node_index[self.start_node], self.num_nodes)
+            success, path_cost = self.construct_solution(ant)  # Строим решение
+            yield success, path_cost, ant.route
+
+    def construct_batched(self):
+        """
+        Строит маршруты всех муравьев итерации пакетным ядром construct_batch
+        и откладывает их феромоны одной операцией. Маршрут в идентификаторах
+        узлов восстанавливается только для лучшего муравья итерации.
+
+        :return: Список троек (успех, стоимость, маршрут).
+        """
+        routes, costs = construct_batch(
+            self.selection_matrix(), self.weights, self.node_index[self.start_node], self.ant_count, self.rng,
+            self.candidates,
+        )
+        success = np.isfinite(costs)
+        if self.local_search and self.local_search_scope == 'all':
+            for i in np.flatnonzero(success):  # Улучшаем маршруты до отложения феромона
+                routes[i] = self.local_search(routes[i], self.weights)
+                costs[i] = self.weights[routes[i, :-1], routes[i, 1:]].sum()
+        if success.any():
+            self.deposit_route(routes[success], costs[success])  # Откладываем феромон всех маршрутов
+
+        best = int(np.argmin(costs))
+        return [
+            (bool(success[i]), costs[i], [self.node_ids[j] for j in routes[i]] if i == best else None)
+            for i in range(self.ant_count)
+        ]
+
+    def construct_parallel(self, executor, iteration, shared):
+        """
+        Строит маршруты муравьев итерации в пуле процессов. Зерна муравьев
+        выводятся из seed и номера итерации, а вклады феромонов суммируются в
+        tmp_pheromone в порядке муравьев, поэтому результат воспроизводим при любом
+        числе работников.
+
+        :param executor: Пул процессов.
+        :param iteration: Номер итерации.
+        :param shared: Словарь матриц в разделяемой памяти (привлекательность, веса, кандидаты).
+        :return: Список троек (успех, стоимость, маршрут).
+        """
+        from aco.parallel import construct_tours
+
+        seeds = np.random.SeedSequence(self.seed_sequence.entropy, spawn_key=(iteration,)).spawn(self.ant_count)
+        chunks = self.workers or os.cpu_count() or 1  # Число порций муравьев
+        chunk_size = -(-self.ant_count // chunks)
+        futures = [
+            executor.submit(
+                construct_tours,
+                shared['attractiveness'].spec,
+                shared['weights'].spec,
+                None if shared['candidates'] is None else shared['candidates'].spec,
+                self.node_index[self.start_node],
+                seeds[i:i + chunk_size],
+            )
+            for i in range(0, self.ant_count, chunk_size)
+        ]
+
+        results = []
+        for future in futures:  # Собираем результаты в порядке муравьев
+            for rows, path_cost in future.result():
+                if rows is None:
+                    results.append((False, float('inf'), None))
+                    continue
+                rows = np.asarray(rows)
+                if self.local_search and self.local_search_scope == 'all':
+                    rows = self.local_search(rows, self.weights)  # Улучшаем маршрут до отложения феромона
+                    path_cost = self.weights[rows[:-1], rows[1:]].sum()
+                self.deposit_route(rows, path_cost)  # Редуцируем вклад муравья
+                results.append((True, path_cost, [self.node_ids[i] for i in rows.tolist()]))
+        return results
+
+    def improve_route(self, route):
+        """
+        Применяет локальный поиск к маршруту. Выигрыш ходов считается по матрице
+        весов, а стоимость результата — одной векторной операцией.
+
+        :param route: Замкнутый маршрут (список узлов).
+        :return: Улучшенный маршрут и его стоимость.
+        """
+        rows = self.local_search(self.route_indices(route), self.weights)
+        return [self.node_ids[i] for i in rows.tolist()], self.weights[rows[:-1], rows[1:]].sum()
+
+    def compile_graph(self):
+        """
+        Компилирует граф в плотные непрерывные матрицы float64: веса ребер,
+        эвристику (1/вес) и феромоны. Узлы нумеруются в порядке graph.nodes.
+        Отсутствующие ребра имеют вес inf, нулевую эвристику и нулевой феромон.
+        """
+        self.node_ids = list(self.graph.nodes)  # Индекс -> идентификатор узла
+        self.node_index = {node_id: i for i, node_id in enumerate(self.node_ids)}  # Идентификатор узла -> индекс
+
+        n = len(self.node_ids)
+        if hasattr(self.graph, 'to_dense'):  # Замороженный CSR-граф разворачивается без обхода словарей
+            self.weights = self.graph.to_dense()
+        else:
+            self.weights = np.full((n, n), np.inf)  # Матрица весов ребер
+            for i, node_id in enumerate(self.node_ids):
+                for neighbor, weight in self.graph.iter_neighbors(node_id):
+                    self.weights[i, self.node_index[neighbor]] = weight
+
+        edges = np.isfinite(self.weights)  # Маска существующих ребер
+        self.heuristic = np.zeros((n, n))  # Эвристическая информация (1/вес ребра)
+        np.divide(1.0, self.weights, out=self.heuristic, where=edges)
+        self.pheromone = edges.astype(np.float64)  # Начальный феромон 1 на каждом ребре
+        self.tmp_pheromone = np.zeros((n, n))  # Временная матрица феромонов для обновления
+        self.heuristic_beta = self.heuristic ** self.beta  # Эвристика не меняется, степень считаем один раз
+
+        self.candidates = None  # Матрица кандидатов (n x k) в индексах узлов
+        if self.candidate_count:
+            self.candidates = np.empty((n, self.candidate_count), dtype=np.intp)
+            for i, node_id in enumerate(self.node_ids):
+                row = [self.node_index[neighbor] for neighbor in self.candidate_lists[node_id]]
+                # Короткие списки дополняем самим узлом: он всегда посещен и не будет выбран
+                self.candidates[i] = row + [i] * (self.candidate_count - len(row))
+
+    def update_attractiveness(self):
+        """
+        Пересчитывает матрицу привлекательности ребер tau^alpha * eta^beta.
+        Вызывается один раз после каждого обновления феромонов, поэтому при выборе
+        следующего узла степени не вычисляются заново.
+        """
+        if getattr(self, 'attractiveness', None) is None:
+            self.attractiveness = np.empty_like(self.pheromone)
+        np.power(self.pheromone, self.alpha, out=self.attractiveness)  # Пишем на месте: матрица может быть разделяемой
+        self.attractiveness *= self.heuristic_beta
+
+    def attractiveness_row(self, current):
+        """
+        Возвращает строку привлекательности, по которой выбирается следующий узел.
+        Варианты алгоритма переопределяют метод, если хранят феромоны лениво.
+
+        :param current: Индекс текущего узла.
+        :return: Строка привлекательности.
+        """
+        return self.attractiveness[current]
+
+    def selection_matrix(self):
+        """
+        Возвращает полную матрицу привлекательности для пакетного построения маршрутов.
+
+        :return: Матрица привлекательности.
+        """
+        return self.attractiveness
+
+    def pheromone_matrix(self):
+        """
+        Возвращает фактическую матрицу феромонов (матричный режим).
 
-            self.update_pheromones()  # Еще раз обновляем феромоны
+        :return: Матрица феромонов.
+        """
+        return self.pheromone
+
+    def route_indices(self, path):
+        """
+        Переводит маршрут из идентификаторов узлов в индексы строк матриц.
 
-        return self.best_path, self.best_cost  # Возвращаем лучший путь и его стоимость
+        :param path: Маршрут (список узлов).
+        :return: Массив индексов узлов.
+        """
+        return np.fromiter((self.node_index[node] for node in path), dtype=np.intp, count=len(path))
+
+    def get_pheromone(self, a, b, default=0):
+        """
+        Возвращает количество феромона на ребре независимо от режима хранения.
+
+        :param a: Начальный узел ребра.
+        :param b: Конечный узел ребра.
+        :param default: Значение для отсутствующего ребра в словарном режиме.
+        :return: Феромон на ребре.
+        """
+        if self.use_matrix:
+            return self.pheromone[self.node_index[a], self.node_index[b]]
+        return self.pheromone_map.get((a, b), default)
 
     def construct_solution(self, ant):
         """
@@ -95,6 +637,9 @@ class AntColony:
         :param ant: Муравей, для которого строится решение.
         :return: True, если решение успешно, иначе False и бесконечная стоимость.
         """
+        if self.use_matrix:
+            return self.construct_solution_matrix(ant)
+
         current_node = self.start_node  # Начинаем с начального узла
 
         while len(ant.visited) < self.num_nodes:  # Пока все узлы не посещены
@@ -115,6 +660,53 @@ class AntColony:
 
         return False, float('inf')  # Если не удалось завершить путь, возвращаем бесконечную стоимость
 
+    def construct_solution_matrix(self, ant):
+        """
+        Строит решение для муравья в матричном режиме: посещенные узлы хранятся
+        в булевой маске, а выбор следующего узла выполняется по индексам матриц.
+
+        :param ant: Муравей, для которого строится решение.
+        :return: True и стоимость пути, если решение успешно, иначе False и бесконечная стоимость.
+        """
+        start = self.node_index[self.start_node]  # Индекс начального узла
+        current = start
+
+        for _ in range(self.num_nodes - 1):  # Каждый шаг посещает один новый узел
+            next_index = self.choose_next_index(ant.visited_mask, current)  # Выбираем следующий узел
+            if next_index is None:  # Если нет доступных узлов для перехода, завершаем
+                return False, float('inf')
+
+            next_node = self.node_ids[next_index]
+            ant.route.append(next_node)  # Добавляем узел в маршрут
+            ant.visited.add(next_node)  # Добавляем узел в множество посещенных
+            ant.visited_mask[next_index] = True  # Отмечаем узел в маске
+            current = next_index  # Переходим в следующий узел
+
+        # Завершаем маршрут, если есть путь к стартовому узлу
+        if np.isfinite(self.weights[current, start]):
+            ant.route.append(self.start_node)  # Добавляем стартовый узел в маршрут
+            if self.local_search and self.local_search_scope == 'all':
+                ant.route, path_cost = self.improve_route(ant.route)  # Улучшаем маршрут до отложения феромона
+            else:
+                path_cost = self.calculate_path_cost(ant.route)  # Вычисляем стоимость пути
+            self.update_tmp_pheromones(ant.route, path_cost)  # Обновляем временные феромоны
+            return True, path_cost
+
+        return False, float('inf')
+
+    def choose_next_index(self, visited_mask, current):
+        """
+        Выбирает индекс следующего узла методом рулетки: привлекательность строки
+        берется из кэша, посещенные узлы обнуляются маской, а выбор делается через
+        накопленную сумму и бинарный поиск.
+
+        :param visited_mask: Булева маска посещенных узлов.
+        :param current: Индекс текущего узла.
+        :return: Индекс следующего узла, или None, если нет доступных для перехода.
+        """
+        candidates = None if self.candidates is None else self.candidates[current]
+        return select_index(self.attractiveness_row(current), visited_mask, self.rng, candidates)
+
     def choose_next_node(self, ant, current_node):
         """
         Выбирает следующий узел для муравья на основе вероятностей, пропорциональных феромонам и эвристике.
@@ -123,14 +715,25 @@ class AntColony:
         :param current_node: Текущий узел муравья.
         :return: Следующий узел, или None, если нет доступных для перехода.
         """
+        if self.use_matrix:
+            next_index = self.choose_next_index(ant.visited_mask, self.node_index[current_node])
+            return None if next_index is None else self.node_ids[next_index]
+
+        # Пары (сосед, вес ребра); FrozenGraph отдает их прямо из строки CSR без промежуточного словаря
+        neighbors = self.graph.iter_neighbors(current_node)
+        if self.candidate_count:
+            candidates = [c for c in self.candidate_lists[current_node] if c not in ant.visited]
+            if candidates:  # Если есть непосещенные кандидаты, выбираем только среди них
+                neighbors = [(c, self.graph.get_weight(current_node, c)) for c in candidates]
+
         probabilities = []  # Список вероятностей для перехода к соседям
         total_probability = 0  # Общая вероятность для нормализации
 
-        for neighbor, weight in self.graph.get_neighbors(current_node).items():  # Проходим по соседям
+        for neighbor, weight in neighbors:  # Проходим по соседям
             if neighbor in ant.visited:  # Если сосед уже посещен, пропускаем его
                 continue
 
-            pheromone = self.pheromone_map[(current_node, neighbor)]  # Считываем феромон на ребре
+            pheromone = self.get_pheromone(current_node, neighbor)  # Считываем феромон на ребре
             heuristic = 1 / weight  # Эвристическая информация (например, 1/вес ребра)
             probability = (pheromone ** self.alpha) * (heuristic ** self.beta)  # Вычисляем вероятность
 
@@ -140,7 +743,7 @@ class AntColony:
         if not probabilities:  # Если нет доступных соседей, возвращаем None
             return None
 
-        random_choice = random.uniform(0, total_probability)  # Выбираем случайное число в пределах общей вероятности
+        random_choice = self.random.uniform(0, total_probability)  # Выбираем случайное число в пределах общей вероятности
         cumulative_probability = 0  # Переменная для накопления вероятности
 
         for neighbor, probability in probabilities:
@@ -157,6 +760,10 @@ class AntColony:
         :param path: Маршрут (список узлов).
         :return: Стоимость пути.
         """
+        if self.use_matrix:
+            rows = self.route_indices(path)
+            return self.weights[rows[:-1], rows[1:]].sum()  # Суммируем веса ребер одной операцией
+
         cost = 0  # Начальная стоимость пути
         for i in range(len(path) - 1):  # Проходим по всем ребрам в пути
             cost += self.graph.get_weight(path[i], path[i + 1])  # Суммируем вес ребра
@@ -169,58 +776,195 @@ class AntColony:
         :param path: Маршрут муравья.
         :param path_cost: Стоимость найденного пути.
         """
+        if self.use_matrix:
+            self.deposit_route(self.route_indices(path), path_cost)
+            return
+
         for i in range(len(path) - 1):  # Проходим по всем ребрам в пути
             a, b = path[i], path[i + 1]
             self.tmp_pheromone_map[(a, b)] += self.pheromone_constant / path_cost  # Увеличиваем феромон
             self.tmp_pheromone_map[(b, a)] += self.pheromone_constant / path_cost  # Симметрично для обратного ребра
 
+    def deposit_route(self, rows, path_cost, scale=1.0):
+        """
+        Откладывает феромон маршрута во временную матрицу феромонов. Принимает и
+        пакет маршрутов: матрицу (по маршруту в строке) и вектор стоимостей.
+
+        :param rows: Маршрут в индексах узлов или матрица маршрутов.
+        :param path_cost: Стоимость маршрута или вектор стоимостей.
+        :param scale: Множитель вклада (-1 снимает ранее отложенный вклад маршрута).
+        """
+        starts, ends = rows[..., :-1], rows[..., 1:]
+        deposit = scale * self.pheromone_constant / np.asarray(path_cost, dtype=np.float64)
+        deposit = np.broadcast_to(deposit[..., None], starts.shape)  # Вклад маршрута на каждом его ребре
+        np.add.at(self.tmp_pheromone, (starts, ends), deposit)  # Откладываем феромон на ребра маршрута
+        np.add.at(self.tmp_pheromone, (ends, starts), deposit)  # Симметрично для обратных ребер
+        self.note_deposits(starts.ravel(), ends.ravel())
+
+    def note_deposits(self, rows_a, rows_b):
+        """
+        Запоминает ребра лучшего пути, на которые отложен феромон (в любом
+        направлении), для инкрементного обновления его log-вероятности.
+        Затраты пропорциональны числу отложенных ребер.
+
+        :param rows_a: Индексы начальных узлов отложенных ребер.
+        :param rows_b: Индексы конечных узлов отложенных ребер.
+        """
+        if self.best_path_edges is None:
+            return
+        forward = self.best_path_edges[rows_a, rows_b]
+        backward = self.best_path_edges[rows_b, rows_a]
+        if forward.any():
+            self.best_path_deposits.append((rows_a[forward], rows_b[forward]))
+        if backward.any():
+            self.best_path_deposits.append((rows_b[backward], rows_a[backward]))
+
     def update_pheromones(self):
         """
         Обновляет карту феромонов, учитывая испарение феромонов и новые данные.
         """
+        if self.use_matrix:
+            self.advance_best_path_log_pheromone()  # До изменения матрицы: нужны старые значения
+            self.pheromone *= (1 - self.pheromone_evaporation_rate)  # Испаряем феромоны на всех ребрах
+            self.pheromone += self.tmp_pheromone  # Добавляем новые феромоны
+            self.tmp_pheromone.fill(0)  # Очищаем временную матрицу феромонов
+            self.update_attractiveness()  # Обновляем кэш привлекательности
+            return
+
         for edge in self.pheromone_map:
             self.pheromone_map[edge] *= (1 - self.pheromone_evaporation_rate)  # Испаряем феромоны
             self.pheromone_map[edge] += self.tmp_pheromone_map[edge]  # Добавляем новые феромоны
             self.tmp_pheromone_map[edge] = 0  # Очищаем временную карту феромонов
 
-    def plot_graphs(self):
+    def plot_graphs(self, show=True):
         """
         Строит график длин путей на протяжении всех итераций.
+        matplotlib импортируется только при вызове.
+
+        :param show: Показать окно графика (блокирует выполнение).
+        :return: Объект matplotlib.figure.Figure.
         """
-        path_lengths_no_inf = [np.nan if length == float('inf') else length for length in self.path_lengths]
-        plt.figure(figsize=(8, 6))
-        plt.plot(range(1, self.iterations + 1), path_lengths_no_inf, color='orange')  # График длины пути
-        plt.title('Path Lengths Over Iterations')  # Заголовок графика
-        plt.xlabel('Iteration')  # Подпись оси X
-        plt.ylabel('Path Length')  # Подпись оси Y
-        plt.tight_layout()  # Автоматически подстраиваем layout
-        plt.grid()  # Включаем сетку
-        plt.show()  # Отображаем график
+        from aco.plotting import plot_path_lengths
+
+        return plot_path_lengths(self, show=show)
 
     def calculate_best_path_probability(self):
         """
         Рассчитывает вероятность того, что лучший путь будет выбран на основе феромонов и эвристики.
+        Вычисление идет в log-шкале; на длинных маршрутах результат может быть равен 0,
+        тогда следует использовать calculate_best_path_log_probability.
         
         :return: Вероятность для лучшего пути.
         """
-        probability = 1.0  # Начальная вероятность
-        for i in range(len(self.best_path) - 1):  # Проходим по всем ребрам лучшего пути
-            a, b = self.best_path[i], self.best_path[i + 1]
-            pheromone = self.pheromone_map.get((a, b), 1)  # Считываем феромон
-            weight = self.graph.get_weight(a, b)  # Получаем вес ребра
-            heuristic = 1 / weight  # Эвристическая информация (обратный вес)
-            probability *= (pheromone ** self.alpha) * (heuristic ** self.beta)  # Обновляем вероятность
-        return probability  # Возвращаем итоговую вероятность
+        return math.exp(self.calculate_best_path_log_probability())
+
+    def calculate_best_path_log_probability(self):
+        """
+        Рассчитывает логарифм произведения tau^alpha * eta^beta по ребрам лучшего пути.
+        Эвристическая часть не меняется, пока не меняется лучший путь, поэтому она
+        кэшируется. Сумма log феромона в матричном режиме ведется инкрементно
+        (advance_best_path_log_pheromone): равномерное испарение добавляет
+        L * log(1 - rho), а точно пересчитываются только ребра пути, получившие
+        феромон. Полный пересчет O(длина пути) выполняется, когда меняется лучший
+        путь, в словарном режиме и в вариантах со своим обновлением феромонов (MMAS, ACS).
+
+        :return: Логарифм вероятности для лучшего пути.
+        """
+        if self.best_path_log_heuristic is None or self.best_path_log_heuristic[0] is not self.best_path:
+            self.best_path_log_heuristic = (self.best_path, self.beta * self.path_log_heuristic(self.best_path))
+
+        if self.use_matrix:
+            cache = self.best_path_log_pheromone
+            if cache is None or cache[0] is not self.best_path or cache[1] != self.iterations_done:
+                cache = (self.best_path, self.iterations_done, self.path_log_pheromone(self.best_path))
+                self.best_path_log_pheromone = cache
+            log_pheromone = cache[2]
+        else:
+            log_pheromone = self.path_log_pheromone(self.best_path)
+        return self.alpha * log_pheromone + self.best_path_log_heuristic[1]
+
+    def path_log_pheromone(self, path):
+        """
+        Сумма логарифмов феромона по ребрам пути. В матричном режиме заодно
+        отмечает ребра пути в маске best_path_edges для инкрементного обновления.
+
+        :param path: Маршрут (список узлов).
+        :return: Сумма log феромона (-inf, если на каком-то ребре феромона нет).
+        """
+        if not self.use_matrix:
+            log_pheromone = 0.0
+            for a, b in zip(path, path[1:]):
+                pheromone = self.get_pheromone(a, b, 1)  # Считываем феромон
+                log_pheromone += math.log(pheromone) if pheromone > 0 else -math.inf
+            return log_pheromone
+
+        rows = self.route_indices(path)
+        if self.best_path_edges is None:
+            self.best_path_edges = np.zeros((self.num_nodes, self.num_nodes), dtype=bool)
+        self.best_path_edges.fill(False)
+        self.best_path_edges[rows[:-1], rows[1:]] = True
+        self.best_path_deposits = []
+        with np.errstate(divide='ignore'):  # Нулевой феромон дает -inf, а не предупреждение
+            return float(np.log(self.edge_pheromones(rows[:-1], rows[1:])).sum())
+
+    def advance_best_path_log_pheromone(self):
+        """
+        Переносит кэш суммы log феромона лучшего пути через обновление
+        tau' = (1 - rho) * tau + tmp: каждое ребро пути получает log(1 - rho), а
+        ребра, на которые отложен феромон, пересчитываются точно. Вызывается до
+        изменения матрицы. Если кэш устарел (путь сменился, итерация пропущена) или
+        сумма перестала быть конечной, кэш сбрасывается и будет пересчитан полностью.
+        """
+        cache, deposits = self.best_path_log_pheromone, self.best_path_deposits
+        self.best_path_deposits = []
+        if cache is None or cache[0] is not self.best_path or cache[1] != self.iterations_done - 1:
+            return
+
+        log_decay = math.log1p(-self.pheromone_evaporation_rate) if self.pheromone_evaporation_rate < 1 else -math.inf
+        log_pheromone = cache[2] + (len(self.best_path) - 1) * log_decay
+        if deposits:
+            a = np.concatenate([edges[0] for edges in deposits])
+            b = np.concatenate([edges[1] for edges in deposits])
+            a, b = np.divmod(np.unique(a * self.num_nodes + b), self.num_nodes)  # Каждое ребро — один раз
+            old = self.pheromone[a, b]
+            new = old * (1 - self.pheromone_evaporation_rate) + self.tmp_pheromone[a, b]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                log_pheromone += float((np.log(new) - np.log(old)).sum()) - len(a) * log_decay
+        self.best_path_log_pheromone = (self.best_path, self.iterations_done, log_pheromone) if np.isfinite(log_pheromone) else None
+
+    def path_log_heuristic(self, path):
+        """
+        Сумма логарифмов эвристики (1/вес) по ребрам пути.
+
+        :param path: Маршрут (список узлов).
+        :return: Сумма log(1/вес).
+        """
+        if self.use_matrix:
+            rows = self.route_indices(path)
+            return float(-np.log(self.weights[rows[:-1], rows[1:]]).sum())
+        return -sum(math.log(self.graph.get_weight(a, b)) for a, b in zip(path, path[1:]))
+
+    def edge_pheromones(self, rows_a, rows_b):
+        """
+        Возвращает феромоны на наборе ребер (матричный режим).
+
+        :param rows_a: Индексы начальных узлов ребер.
+        :param rows_b: Индексы конечных узлов ребер.
+        :return: Массив феромонов.
+        """
+        return self.pheromone[rows_a, rows_b]
     
-    def plot_best_path_probability(self):
+    def plot_best_path_probability(self, show=True):
         """
         Строит график вероятности лучшего пути на протяжении всех итераций.
+        matplotlib импортируется только при вызове.
+
+        :param show: Показать окно графика (блокирует выполнение).
+        :return: Объект matplotlib.figure.Figure.
         """
-        plt.figure(figsize=(8, 6))
-        plt.plot(range(1, self.iterations + 1), self.best_path_probabilities, color='green')  # График вероятности
-        plt.title('Best Path Probability Over Iterations')  # Заголовок графика
-        plt.xlabel('Iteration')  # Подпись оси X
-        plt.ylabel('Best Path Probability')  # Подпись оси Y
-        plt.tight_layout()  # Автоматически подстраиваем layout
-        plt.grid()  # Включаем сетку
-        plt.show()  # Отображаем график
\ No newline at end of file
+        from aco.plotting import plot_best_path_probability
+
+        return plot_best_path_probability(self, show=show)
+
+
+from aco.variants import AntColonySystem, MaxMinAntColony  # noqa: E402  Варианты наследуют AntColony
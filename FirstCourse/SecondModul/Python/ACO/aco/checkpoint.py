@@ -0,0 +1,73 @@
+import os
+import pickle
+import shutil
+
+import numpy as np
+
+FORMAT_VERSION = 1  # Версия формата контрольной точки
+PHEROMONE_FILE = 'pheromone.npy'  # Матрица феромонов (матричный режим)
+STATE_FILE = 'state.pkl'  # Остальное состояние колонии
+
+
+def save_checkpoint(colony, path):
+    """
+    Сохраняет состояние колонии в каталог. Файлы сначала пишутся во временный
+    каталог, который затем заменяет прежнюю контрольную точку, поэтому сбой во
+    время записи не портит последнюю сохраненную точку.
+
+    :param colony: Объект AntColony.
+    :param path: Путь к каталогу контрольной точки.
+    """
+    path = os.fspath(path)
+    tmp_path = path + '.tmp'
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    if colony.use_matrix:
+        np.save(os.path.join(tmp_path, PHEROMONE_FILE), colony.pheromone)  # Формат .npy можно отобразить в память
+
+    state = colony.checkpoint_state()
+    state.update(
+        format_version=FORMAT_VERSION,
+        colony_class=type(colony).__name__,
+        use_matrix=colony.use_matrix,
+        num_nodes=colony.num_nodes,
+    )
+    with open(os.path.join(tmp_path, STATE_FILE), 'wb') as file:
+        pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    old_path = path + '.old'
+    if os.path.exists(path):
+        os.replace(path, old_path)  # Прежняя точка удаляется только после появления новой
+    os.replace(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+
+def load_checkpoint(colony, path, mmap=True):
+    """
+    Восстанавливает состояние колонии из каталога контрольной точки.
+
+    :param colony: Объект AntColony, созданный с теми же графом и параметрами.
+    :param path: Путь к каталогу контрольной точки.
+    :param mmap: Отображать матрицу феромонов в память с копированием при записи:
+        страницы читаются по мере обращения, а файл на диске не изменяется.
+    """
+    path = os.fspath(path)
+    with open(os.path.join(path, STATE_FILE), 'rb') as file:
+        state = pickle.load(file)
+
+    if state['format_version'] != FORMAT_VERSION:
+        raise ValueError(f"Неподдерживаемая версия контрольной точки: {state['format_version']}")
+    if state['colony_class'] != type(colony).__name__ or state['use_matrix'] != colony.use_matrix:
+        raise ValueError(
+            f"Контрольная точка создана для {state['colony_class']}(use_matrix={state['use_matrix']}), "
+            f"а восстанавливается в {type(colony).__name__}(use_matrix={colony.use_matrix})"
+        )
+    if state['num_nodes'] != colony.num_nodes:
+        raise ValueError(f"Контрольная точка создана для графа из {state['num_nodes']} узлов")
+
+    colony.load_state(state)
+    if colony.use_matrix:
+        colony.pheromone = np.load(os.path.join(path, PHEROMONE_FILE), mmap_mode='c' if mmap else None)
+        colony.tmp_pheromone.fill(0)
+        colony.update_attractiveness()
@@ -0,0 +1,233 @@
+import itertools
+import math
+import multiprocessing
+import queue
+import time
+
+import numpy as np
+
+from aco import AntColony
+from aco.parallel import SharedMatrix, attach, release_stale
+from aco.result import ColonyResult
+
+
+class IslandModel:
+    def __init__(self, graph, islands, migration_interval=10, blend=0.1, iterations=100, seed=None, **kwargs):
+        """
+        Модель островов: несколько независимых колоний (матричный режим) работают
+        в отдельных процессах, каждая со своими параметрами. Каждые
+        migration_interval итераций острова обмениваются по кольцу: остров i
+        получает лучший маршрут острова i - 1 (если он лучше собственного) и
+        смешивает свою матрицу феромонов с матрицей соседа. Обмен идет через
+        разделяемую память, острова синхронизируются барьером.
+
+        Разделяемая память под феромоны занимает len(islands) * n * n * 8 байт.
+
+        :param graph: Граф, в котором будет происходить поиск пути.
+        :param islands: Список словарей с параметрами AntColony для каждого острова
+            (например, alpha, beta, pheromone_evaporation_rate); они дополняют kwargs.
+        :param migration_interval: Количество итераций между обменами.
+        :param blend: Доля феромона соседа при смешивании: tau = (1 - blend) * tau + blend * tau_соседа.
+        :param iterations: Количество итераций каждого острова.
+        :param seed: Зерно, из которого выводятся зерна островов без собственного seed.
+        :param kwargs: Общие параметры AntColony для всех островов.
+        """
+        if not islands:
+            raise ValueError("Нужен хотя бы один остров")
+        if migration_interval < 1:
+            raise ValueError("migration_interval должен быть положительным")
+        if not 0 <= blend <= 1:
+            raise ValueError("blend должен быть в диапазоне [0, 1]")
+        for params in [kwargs, *islands]:
+            if params.get('workers') or params.get('executor'):
+                raise ValueError("Острова уже работают в отдельных процессах: workers и executor не поддерживаются")
+            if params.get('use_matrix') is False:
+                raise ValueError("IslandModel работает только в матричном режиме")
+
+        self.graph = graph  # Граф для поиска
+        self.islands = [dict(params) for params in islands]  # Параметры островов
+        self.migration_interval = migration_interval  # Итерации между обменами
+        self.blend = blend  # Доля феромона соседа
+        self.iterations = iterations  # Количество итераций острова
+        self.seed = seed  # Общее зерно
+        self.kwargs = kwargs  # Общие параметры колоний
+        self.seeds = [int(s) for s in np.random.SeedSequence(seed).generate_state(len(islands))]  # Зерна островов
+        self.island_results = []  # Результаты островов (ColonyResult) последнего запуска
+        self.result = None  # Лучший результат последнего запуска (ColonyResult)
+
+    def island_kwargs(self, index):
+        """
+        Собирает параметры AntColony для острова.
+
+        :param index: Номер острова.
+        :return: Словарь параметров.
+        """
+        params = dict(self.kwargs, seed=self.seeds[index], iterations=self.iterations)
+        params.update(self.islands[index])
+        params['use_matrix'] = True
+        return params
+
+    def run(self):
+        """
+        Запускает острова в отдельных процессах и ждет их завершения.
+
+        :return: ColonyResult лучшего острова (время работы — общее время запуска).
+            Результаты всех островов доступны в self.island_results.
+        """
+        start_time = time.perf_counter()
+        count, n = len(self.islands), len(self.graph.nodes)
+        epochs = math.ceil(self.iterations / self.migration_interval)  # Количество обменов
+
+        context = multiprocessing.get_context()
+        barrier = context.Barrier(count)  # Синхронизация островов перед и после обмена
+        results_queue = context.Queue()  # Результаты островов
+        shared = {
+            'pheromones': SharedMatrix(np.zeros((count, n, n))),
+            'tours': SharedMatrix(np.zeros((count, n + 1), dtype=np.intp)),
+            'costs': SharedMatrix(np.full(count, np.inf)),
+        }  # Опубликованные феромоны, лучшие маршруты и их стоимости
+
+        processes = [
+            context.Process(
+                target=run_island,
+                args=(
+                    index, self.graph, self.island_kwargs(index), self.migration_interval, epochs, self.blend,
+                    barrier, shared['pheromones'].spec, shared['tours'].spec, shared['costs'].spec, results_queue,
+                ),
+            )
+            for index in range(count)
+        ]
+        for process in processes:
+            process.start()
+
+        try:
+            results = collect_results(results_queue, processes)
+        except BaseException:
+            # Остров погиб, не дойдя до барьера: освобождаем ждущих его соседей,
+            # а не успевшие завершиться процессы останавливаем принудительно
+            barrier.abort()
+            for process in processes:
+                process.join(timeout=5.0)
+                if process.is_alive():
+                    process.terminate()
+            raise
+        finally:
+            for process in processes:
+                process.join()
+            for matrix in shared.values():
+                matrix.release()
+
+        errors = [result for result in results.values() if isinstance(result, BaseException)]
+        if errors:
+            raise errors[0]
+
+        self.island_results = [results[index] for index in range(count)]
+        best = min(self.island_results, key=lambda result: result.best_cost)
+        self.result = ColonyResult(
+            best_path=best.best_path,
+            best_cost=best.best_cost,
+            iterations=best.iterations,
+            wall_time=time.perf_counter() - start_time,
+            best_costs=best.best_costs,
+            stop_reason=best.stop_reason,
+        )
+        return self.result
+
+
+def collect_results(results_queue, processes):
+    """
+    Собирает результаты островов из очереди. Если процесс завершился аварийно,
+    не успев отправить результат, вместо бесконечного ожидания возбуждается
+    RuntimeError; остальные острова останавливает IslandModel.run.
+
+    :param results_queue: Очередь пар (номер острова, ColonyResult или исключение).
+    :param processes: Процессы островов.
+    :return: Словарь номер острова -> результат.
+    """
+    results = {}
+    while len(results) < len(processes):
+        try:
+            index, result = results_queue.get(timeout=1.0)
+            results[index] = result
+        except queue.Empty:
+            for index, process in enumerate(processes):
+                if index not in results and process.exitcode not in (None, 0):
+                    raise RuntimeError(f"Процесс острова {index} завершился с кодом {process.exitcode}")
+    return results
+
+
+def run_island(index, graph, kwargs, interval, epochs, blend, barrier, pheromones_spec, tours_spec, costs_spec,
+               results_queue):
+    """
+    Задание процесса острова: запускает AntColony.iterate эпохами по interval
+    итераций и после каждой эпохи выполняет обмен с соседом по кольцу. Остров,
+    остановившийся досрочно, продолжает участвовать в обменах, чтобы не
+    блокировать барьер остальных.
+
+    :param index: Номер острова.
+    :param graph: Граф.
+    :param kwargs: Параметры AntColony.
+    :param interval: Итерации между обменами.
+    :param epochs: Количество обменов.
+    :param blend: Доля феромона соседа.
+    :param barrier: Барьер островов.
+    :param pheromones_spec: Описание блока опубликованных матриц феромонов.
+    :param tours_spec: Описание блока опубликованных маршрутов (в индексах узлов).
+    :param costs_spec: Описание блока стоимостей опубликованных маршрутов.
+    :param results_queue: Очередь результатов.
+    """
+    try:
+        start_time = time.perf_counter()
+        colony = AntColony(graph, **kwargs)
+        pheromones, tours, costs = attach(pheromones_spec), attach(tours_spec), attach(costs_spec)
+        neighbor = (index - 1) % len(costs)  # Сосед по кольцу
+        iterations = colony.iterate()
+
+        for _ in range(epochs):
+            for _ in itertools.islice(iterations, interval):  # Эпоха обычного цикла колонии
+                pass
+
+            pheromones[index] = colony.pheromone  # Публикуем состояние острова
+            if colony.best_path is not None:
+                tours[index] = colony.route_indices(colony.best_path)
+                costs[index] = colony.best_cost
+            barrier.wait()  # Все острова опубликовали состояние
+            migrate(colony, pheromones[neighbor], tours[neighbor], costs[neighbor], blend)
+            barrier.wait()  # Все острова прочитали состояние соседей
+
+        for _ in iterations:  # Завершаем генератор: он определяет причину остановки
+            pass
+        # Результат собирается после последнего обмена, который мог сменить лучший путь
+        colony.result = colony.build_result(colony.result.stop_reason, time.perf_counter() - start_time)
+        results_queue.put((index, colony.result))
+    except BaseException as error:
+        barrier.abort()  # Освобождаем острова, ожидающие на барьере
+        results_queue.put((index, error))
+    finally:
+        release_stale(set())
+
+
+def migrate(colony, pheromone, tour, cost, blend):
+    """
+    Принимает состояние соседа: смешивает матрицы феромонов и, если маршрут
+    соседа лучше, делает его лучшим путем острова (с записью в best_costs
+    последней итерации) и откладывает по нему феромон.
+
+    :param colony: Колония острова.
+    :param pheromone: Матрица феромонов соседа.
+    :param tour: Лучший маршрут соседа в индексах узлов.
+    :param cost: Стоимость маршрута соседа (inf, если маршрута нет).
+    :param blend: Доля феромона соседа.
+    """
+    if blend:
+        colony.pheromone *= (1 - blend)
+        colony.pheromone += blend * pheromone
+        colony.update_attractiveness()
+
+    if cost < colony.best_cost:
+        rows = np.array(tour)  # Копия: блок перезапишется на следующем обмене
+        colony.best_path = [colony.node_ids[i] for i in rows.tolist()]
+        colony.best_cost = float(cost)
+        if colony.iterations_done:
+            colony.best_costs[colony.iterations_done - 1] = colony.best_cost  # История заканчивается принятым маршрутом
+        colony.deposit_route(rows, colony.best_cost)  # Феромон добавится при следующем update_pheromones
@@ -0,0 +1,177 @@
+import numpy as np
+
+
+def select_index(attractiveness_row, visited_mask, rng, candidates=None):
+    """
+    Выбирает индекс следующего узла методом рулетки: посещенные узлы обнуляются
+    маской, а выбор делается через накопленную сумму и бинарный поиск.
+
+    :param attractiveness_row: Строка матрицы привлекательности tau^alpha * eta^beta.
+    :param visited_mask: Булева маска посещенных узлов.
+    :param rng: Генератор случайных чисел numpy.random.Generator.
+    :param candidates: Индексы ближайших соседей текущего узла. Если задан, выбор
+        идет только среди непосещенных кандидатов, а полная строка используется,
+        лишь когда все кандидаты уже посещены.
+    :return: Индекс следующего узла, или None, если нет доступных для перехода.
+    """
+    if candidates is not None:
+        probabilities = np.where(visited_mask[candidates], 0.0, attractiveness_row[candidates])
+        choice = _roulette(probabilities, rng)
+        if choice is not None:
+            return int(candidates[choice])
+
+    probabilities = np.where(visited_mask, 0.0, attractiveness_row)  # Обнуляем посещенные узлы
+    return _roulette(probabilities, rng)
+
+
+def _roulette(probabilities, rng):
+    """
+    Выбирает индекс с вероятностью, пропорциональной значению. Если сумма не
+    конечна (переполнение привлекательности), значения нормируются на максимум,
+    а бесконечные значения делят вероятность поровну, поэтому результат всегда
+    указывает на элемент с положительным значением.
+
+    :param probabilities: Неотрицательные значения (изменяются при нормировке).
+    :param rng: Генератор случайных чисел numpy.random.Generator.
+    :return: Индекс или None, если все значения нулевые.
+    """
+    with np.errstate(over='ignore'):  # Переполнение суммы обрабатывается ниже
+        cumulative = np.cumsum(probabilities)  # Накопленная вероятность
+    total_probability = cumulative[-1]
+    if not np.isfinite(total_probability):  # Переполнение: переходим к относительным значениям
+        probabilities = np.nan_to_num(probabilities, nan=0.0)
+        peak = probabilities.max()
+        if np.isinf(peak):
+            probabilities = (probabilities == peak).astype(np.float64)
+        elif peak > 0:
+            probabilities = probabilities / peak
+        cumulative = np.cumsum(probabilities)
+        total_probability = cumulative[-1]
+    if not total_probability > 0:  # Если нет доступных соседей, возвращаем None
+        return None
+
+    random_choice = rng.random() * total_probability  # Случайное число в [0, total)
+    index = int(np.searchsorted(cumulative, random_choice, side='right'))  # Первый узел с суммой больше числа
+    if index == len(cumulative):  # Округление дало random_choice == total: берем последний доступный узел
+        index = int(np.searchsorted(cumulative, total_probability, side='left'))
+    return index
+
+
+def build_tour(attractiveness, weights, start, rng, candidates=None):
+    """
+    Строит замкнутый маршрут одного муравья по матрицам привлекательности и весов.
+
+    :param attractiveness: Матрица привлекательности ребер.
+    :param weights: Матрица весов ребер (inf для отсутствующих ребер).
+    :param start: Индекс начального узла.
+    :param rng: Генератор случайных чисел numpy.random.Generator.
+    :param candidates: Матрица списков кандидатов (n x k) или None.
+    :return: Список индексов маршрута и его стоимость, или None и бесконечность.
+    """
+    num_nodes = len(weights)
+    visited_mask = np.zeros(num_nodes, dtype=bool)  # Маска посещенных узлов
+    visited_mask[start] = True
+    route = [start]
+    current = start
+
+    for _ in range(num_nodes - 1):  # Каждый шаг посещает один новый узел
+        row_candidates = None if candidates is None else candidates[current]
+        current = select_index(attractiveness[current], visited_mask, rng, row_candidates)
+        if current is None:  # Тупик: маршрут не удался
+            return None, float('inf')
+        route.append(current)
+        visited_mask[current] = True
+
+    if not np.isfinite(weights[current, start]):  # Нет ребра обратно к стартовому узлу
+        return None, float('inf')
+
+    route.append(start)
+    rows = np.asarray(route)
+    return route, weights[rows[:-1], rows[1:]].sum()
+
+
+def construct_batch(attractiveness, weights, start, ant_count, rng, candidates=None):
+    """
+    Строит маршруты сразу всех муравьев: состояние колонии хранится в двумерных
+    массивах (вектор текущих узлов, матрица посещенных узлов и матрица маршрутов),
+    и каждый шаг продвигает всех муравьев одной векторной операцией.
+
+    :param attractiveness: Матрица привлекательности ребер.
+    :param weights: Матрица весов ребер (inf для отсутствующих ребер).
+    :param start: Индекс начального узла.
+    :param ant_count: Количество муравьев.
+    :param rng: Генератор случайных чисел numpy.random.Generator.
+    :param candidates: Матрица списков кандидатов (n x k) или None.
+    :return: Матрица маршрутов (ant_count x (n + 1)) и вектор стоимостей,
+        в котором неудавшимся маршрутам соответствует inf.
+    """
+    num_nodes = len(weights)
+    ants = np.arange(ant_count)
+    routes = np.empty((ant_count, num_nodes + 1), dtype=np.intp)  # Маршруты всех муравьев
+    routes[:, 0] = start
+    visited = np.zeros((ant_count, num_nodes), dtype=bool)  # Матрица посещенных узлов
+    visited[:, start] = True
+    current = np.full(ant_count, start, dtype=np.intp)  # Текущие узлы муравьев
+    alive = np.ones(ant_count, dtype=bool)  # Муравьи, еще не попавшие в тупик
+
+    for step in range(1, num_nodes):
+        if candidates is None:
+            next_nodes = _batch_step(attractiveness[current], visited, alive, rng)
+        else:
+            cols = candidates[current]  # Кандидаты текущих узлов (ants x k)
+            probabilities = attractiveness[current[:, None], cols]
+            probabilities[visited[ants[:, None], cols]] = 0.0  # Обнуляем посещенных кандидатов
+            has_candidates = probabilities.sum(axis=1) > 0
+            choice = _batch_step(probabilities, None, has_candidates, rng)
+            next_nodes = cols[ants, choice]
+
+            fallback = ~has_candidates  # Все кандидаты посещены: выбираем по полной строке
+            if fallback.any():
+                alive_fallback = alive[fallback]
+                next_nodes[fallback] = _batch_step(
+                    attractiveness[current[fallback]], visited[fallback], alive_fallback, rng
+                )
+                alive[fallback] = alive_fallback
+
+        visited[ants, next_nodes] = True
+        routes[:, step] = next_nodes
+        current = next_nodes
+
+    routes[:, num_nodes] = start
+    costs = weights[routes[:, :-1], routes[:, 1:]].sum(axis=1)  # Стоимости маршрутов
+    alive &= np.isfinite(costs)  # Включает проверку ребра обратно к стартовому узлу
+    costs[~alive] = np.inf
+    return routes, costs
+
+
+def _batch_step(probabilities, visited, alive, rng):
+    """
+    Выполняет построчный выбор методом рулетки для пакета муравьев.
+
+    :param probabilities: Матрица привлекательности (муравьи x варианты), изменяется на месте.
+    :param visited: Маска посещенных вариантов или None.
+    :param alive: Маска живых муравьев; муравьи без доступных вариантов сбрасываются.
+    :param rng: Генератор случайных чисел numpy.random.Generator.
+    :return: Индексы выбранных вариантов по строкам.
+    """
+    if visited is not None:
+        probabilities[visited] = 0.0  # Обнуляем посещенные узлы
+    with np.errstate(over='ignore'):  # Переполнение суммы обрабатывается ниже
+        cumulative = np.cumsum(probabilities, axis=1)  # Накопленная вероятность по строкам
+    totals = cumulative[:, -1]
+    overflow = ~np.isfinite(totals)
+    if overflow.any():  # Переполнение: строки нормируются на максимум, как в _roulette
+        rows = np.nan_to_num(probabilities[overflow], nan=0.0)
+        peaks = rows.max(axis=1, keepdims=True)
+        peaks[peaks == 0] = 1.0  # Строка из одних NaN стала нулевой: муравей выбывает
+        infinite = np.isinf(peaks[:, 0])
+        rows[infinite] = rows[infinite] == peaks[infinite]
+        rows[~infinite] /= peaks[~infinite]
+        probabilities[overflow] = rows
+        cumulative = np.cumsum(probabilities, axis=1)
+        totals = cumulative[:, -1]
+    alive &= totals > 0  # Муравьи без доступных соседей выбывают
+
+    random_choice = rng.random(len(probabilities)) * totals
+    choice = (cumulative <= random_choice[:, None]).sum(axis=1)  # Построчный searchsorted(side='right')
+    return np.minimum(choice, probabilities.shape[1] - 1, out=choice)  # Выбывшие муравьи не выходят за границы
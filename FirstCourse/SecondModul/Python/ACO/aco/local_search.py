@@ -0,0 +1,113 @@
+import numpy as np
+
+EPSILON = 1e-12  # Минимальное улучшение, которое считается выигрышем
+
+
+def two_opt(route, weights, max_passes=50):
+    """
+    Улучшает замкнутый маршрут ходами 2-opt: ребра (a, b) и (c, d) заменяются на
+    (a, c) и (b, d) с разворотом участка между ними. Выигрыш каждого хода
+    вычисляется по матрице весов для всех c сразу, без пересчета стоимости
+    всего маршрута. Предполагается симметричная матрица весов.
+
+    :param route: Замкнутый маршрут в индексах узлов (первый узел равен последнему).
+    :param weights: Матрица весов ребер.
+    :param max_passes: Максимальное число проходов по маршруту.
+    :return: Улучшенный замкнутый маршрут (массив индексов).
+    """
+    tour = np.array(route[:-1], dtype=np.intp)  # Циклический маршрут без повтора стартового узла
+    n = len(tour)
+    if n < 4:
+        return np.asarray(route)
+
+    for _ in range(max_passes):
+        improved = False
+        for i in range(n - 2):
+            a, b = tour[i], tour[i + 1]
+            j = np.arange(i + 2, n if i > 0 else n - 1)  # Ребро (c, d) не должно касаться (a, b)
+            if len(j) == 0:
+                continue
+            c, d = tour[j], tour[(j + 1) % n]
+            delta = weights[a, c] + weights[b, d] - weights[a, b] - weights[c, d]  # Изменение стоимости
+            best = int(np.argmin(delta))
+            if delta[best] < -EPSILON:
+                end = j[best]
+                tour[i + 1:end + 1] = tour[i + 1:end + 1][::-1]  # Разворачиваем участок b..c
+                improved = True
+        if not improved:
+            break
+
+    return _close(tour, route[0])
+
+
+def or_opt(route, weights, segment_lengths=(1, 2, 3), max_passes=50):
+    """
+    Улучшает замкнутый маршрут ходами Or-opt: участок из 1-3 подряд идущих узлов
+    переносится между двумя другими соседними узлами маршрута (в прямом или
+    обратном порядке). Выигрыш вычисляется по матрице весов для всех мест
+    вставки сразу; места вставки — ребра (tour[p], succ[p]) самого маршрута,
+    поэтому маршрут перестраивается только при выполнении хода.
+
+    :param route: Замкнутый маршрут в индексах узлов (первый узел равен последнему).
+    :param weights: Матрица весов ребер.
+    :param segment_lengths: Длины переносимых участков.
+    :param max_passes: Максимальное число проходов по маршруту.
+    :return: Улучшенный замкнутый маршрут (массив индексов).
+    """
+    tour = np.array(route[:-1], dtype=np.intp)  # Циклический маршрут без повтора стартового узла
+    n = len(tour)
+    positions = np.arange(n)
+
+    for _ in range(max_passes):
+        improved = False
+        for length in segment_lengths:
+            if n < length + 3:
+                continue
+            succ = np.roll(tour, -1)  # Ребра маршрута: (tour[p], succ[p])
+            base = weights[tour, succ]  # Веса ребер маршрута
+            for i in range(n):
+                first, last = tour[i], tour[(i + length - 1) % n]  # Участок tour[i..i + length - 1]
+                prev, nxt = tour[i - 1], tour[(i + length) % n]
+                gain = weights[prev, first] + weights[last, nxt] - weights[prev, nxt]  # Выигрыш от удаления участка
+
+                forward = weights[tour, first] + weights[last, succ] - base
+                backward = weights[tour, last] + weights[first, succ] - base
+                touched = (i - 1 + positions[:length + 1]) % n  # Ребра, касающиеся участка, — не места вставки
+                forward[touched] = backward[touched] = np.inf
+                p_forward, p_backward = int(np.argmin(forward)), int(np.argmin(backward))
+                reverse = backward[p_backward] < forward[p_forward]
+                p = p_backward if reverse else p_forward
+                delta = (backward[p] if reverse else forward[p]) - gain  # Изменение стоимости
+                if delta < -EPSILON:
+                    segment = tour[(i + positions[:length]) % n]
+                    rest = tour[(i + length + positions[:n - length]) % n]  # Остаток маршрута, начиная с nxt
+                    k = (p - i - length) % n  # Позиция узла tour[p] в остатке
+                    moved = segment[::-1] if reverse else segment
+                    tour = np.concatenate((rest[:k + 1], moved, rest[k + 1:]))
+                    succ = np.roll(tour, -1)
+                    base = weights[tour, succ]
+                    improved = True
+        if not improved:
+            break
+
+    return _close(tour, route[0])
+
+
+def _close(tour, start):
+    """
+    Поворачивает циклический маршрут так, чтобы он начинался со стартового узла,
+    и замыкает его.
+
+    :param tour: Циклический маршрут без повтора стартового узла.
+    :param start: Индекс стартового узла.
+    :return: Замкнутый маршрут.
+    """
+    shift = int(np.flatnonzero(tour == start)[0])
+    tour = np.roll(tour, -shift)
+    return np.append(tour, start)
+
+
+LOCAL_SEARCHES = {
+    '2-opt': two_opt,
+    'or-opt': or_opt,
+}  # Встроенные процедуры локального поиска по имени
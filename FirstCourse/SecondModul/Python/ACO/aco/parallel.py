@@ -0,0 +1,100 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from aco.kernels import build_tour
+
+_attached = {}  # Блоки разделяемой памяти, подключенные в процессе-работнике
+
+
+class SharedMatrix:
+    def __init__(self, array):
+        """
+        Копирует матрицу в блок разделяемой памяти, чтобы процессы-работники
+        читали ее без сериализации на каждой итерации.
+
+        :param array: Исходная матрица.
+        """
+        self.shape = array.shape  # Форма матрицы
+        self.dtype = array.dtype  # Тип элементов
+        self.shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))  # Блок памяти
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self.shm.buf)  # Представление блока
+        self.array[...] = array
+
+    @property
+    def name(self):
+        """
+        Имя блока разделяемой памяти для подключения из других процессов.
+        """
+        return self.shm.name
+
+    @property
+    def spec(self):
+        """
+        Описание блока (имя, форма, тип) для передачи в задания работников.
+        """
+        return self.shm.name, self.shape, self.dtype.str
+
+    def release(self):
+        """
+        Освобождает блок разделяемой памяти и возвращает обычную копию матрицы.
+        Все внешние ссылки на self.array должны быть сброшены до вызова.
+
+        :return: Копия матрицы в памяти процесса.
+        """
+        result = np.array(self.array)  # Копируем данные из разделяемой памяти
+        del self.array
+        self.shm.close()
+        self.shm.unlink()
+        return result
+
+
+def attach(spec):
+    """
+    Подключает блок разделяемой памяти по имени в процессе-работнике. Подключения
+    кэшируются, а блоки, не используемые текущим заданием, закрываются.
+
+    :param spec: Описание блока (имя, форма, тип) из SharedMatrix.spec.
+    :return: Представление матрицы без копирования.
+    """
+    name, shape, dtype = spec
+    if name not in _attached:
+        shm = shared_memory.SharedMemory(name=name)
+        _attached[name] = (shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+    return _attached[name][1]
+
+
+def release_stale(names):
+    """
+    Закрывает подключения к блокам, которые не входят в переданный набор имен.
+
+    :param names: Имена блоков, которые используются текущим заданием.
+    """
+    for name in list(_attached):
+        if name not in names:
+            shm, _ = _attached.pop(name)
+            shm.close()
+
+
+def construct_tours(attractiveness_spec, weights_spec, candidates_spec, start, seeds):
+    """
+    Задание процесса-работника: строит маршруты для части муравьев. Каждый муравей
+    получает собственный генератор из своего SeedSequence, поэтому результат не
+    зависит от числа работников и порядка выполнения заданий.
+
+    :param attractiveness_spec: Описание блока с матрицей привлекательности.
+    :param weights_spec: Описание блока с матрицей весов.
+    :param candidates_spec: Описание блока со списками кандидатов или None.
+    :param start: Индекс начального узла.
+    :param seeds: Список numpy.random.SeedSequence, по одному на муравья.
+    :return: Список пар (маршрут в индексах или None, стоимость).
+    """
+    specs = [spec for spec in (attractiveness_spec, weights_spec, candidates_spec) if spec is not None]
+    release_stale({spec[0] for spec in specs})
+    attractiveness = attach(attractiveness_spec)
+    weights = attach(weights_spec)
+    candidates = None if candidates_spec is None else attach(candidates_spec)
+    return [
+        build_tour(attractiveness, weights, start, np.random.default_rng(seed), candidates)
+        for seed in seeds
+    ]
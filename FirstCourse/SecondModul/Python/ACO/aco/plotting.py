@@ -0,0 +1,48 @@
+import matplotlib.pyplot as plt
+import numpy as np
+
+
+def plot_path_lengths(colony, show=True):
+    """
+    Строит график длин путей на протяжении всех итераций.
+
+    :param colony: Колония после запуска run().
+    :param show: Показать окно графика (блокирует выполнение).
+    :return: Объект matplotlib.figure.Figure.
+    """
+    best_costs = colony.best_costs[:colony.iterations_done]
+    path_lengths_no_inf = np.where(np.isinf(best_costs), np.nan, best_costs)
+    figure = plt.figure(figsize=(8, 6))
+    plt.plot(range(1, colony.iterations_done + 1), path_lengths_no_inf, color='orange')  # График длины пути
+    plt.title('Path Lengths Over Iterations')  # Заголовок графика
+    plt.xlabel('Iteration')  # Подпись оси X
+    plt.ylabel('Path Length')  # Подпись оси Y
+    plt.tight_layout()  # Автоматически подстраиваем layout
+    plt.grid()  # Включаем сетку
+    if show:
+        plt.show()  # Отображаем график
+    return figure
+
+
+def plot_best_path_probability(colony, show=True):
+    """
+    Строит график вероятности лучшего пути на протяжении всех итераций.
+
+    :param colony: Колония после запуска run().
+    :param show: Показать окно графика (блокирует выполнение).
+    :return: Объект matplotlib.figure.Figure.
+    """
+    figure = plt.figure(figsize=(8, 6))
+    plt.plot(
+        range(1, colony.iterations_done + 1),
+        colony.best_path_probabilities[:colony.iterations_done],
+        color='green',
+    )  # График вероятности
+    plt.title('Best Path Probability Over Iterations')  # Заголовок графика
+    plt.xlabel('Iteration')  # Подпись оси X
+    plt.ylabel('Best Path Probability')  # Подпись оси Y
+    plt.tight_layout()  # Автоматически подстраиваем layout
+    plt.grid()  # Включаем сетку
+    if show:
+        plt.show()  # Отображаем график
+    return figure
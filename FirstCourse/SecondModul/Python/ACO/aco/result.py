@@ -0,0 +1,73 @@
+class ColonyResult:
+    def __init__(self, best_path, best_cost, iterations, wall_time, best_costs, stop_reason):
+        """
+        Результат запуска колонии муравьев.
+
+        :param best_path: Лучший найденный путь.
+        :param best_cost: Стоимость лучшего пути.
+        :param iterations: Количество выполненных итераций.
+        :param wall_time: Время работы в секундах.
+        :param best_costs: Массив стоимостей лучшего пути после каждой выполненной итерации.
+        :param stop_reason: Причина остановки: 'iterations', 'patience', 'branching',
+            'entropy' или 'time_limit'.
+        """
+        self.best_path = best_path  # Лучший найденный путь
+        self.best_cost = best_cost  # Стоимость лучшего пути
+        self.iterations = iterations  # Количество выполненных итераций
+        self.wall_time = wall_time  # Время работы в секундах
+        self.best_costs = best_costs  # Стоимость лучшего пути по итерациям
+        self.stop_reason = stop_reason  # Причина остановки
+
+    def __iter__(self):
+        """
+        Позволяет распаковывать результат как пару (лучший путь, стоимость).
+        """
+        return iter((self.best_path, self.best_cost))
+
+    def __repr__(self):
+        return (
+            f"ColonyResult(best_cost={self.best_cost}, iterations={self.iterations}, "
+            f"wall_time={self.wall_time:.3f}, stop_reason={self.stop_reason!r})"
+        )
+
+
+class IterationStats:
+    def __init__(self, iteration, best_cost, iteration_best_cost, mean_cost, success_ratio, iteration_time, wall_time):
+        """
+        Метрики одной итерации колонии муравьев.
+
+        :param iteration: Номер итерации (с нуля).
+        :param best_cost: Стоимость лучшего найденного пути.
+        :param iteration_best_cost: Стоимость лучшего пути итерации.
+        :param mean_cost: Средняя стоимость успешных путей итерации (inf, если успешных нет).
+        :param success_ratio: Доля муравьев, построивших замкнутый маршрут.
+        :param iteration_time: Время итерации в секундах.
+        :param wall_time: Время с начала запуска в секундах.
+        """
+        self.iteration = iteration  # Номер итерации
+        self.best_cost = best_cost  # Стоимость лучшего найденного пути
+        self.iteration_best_cost = iteration_best_cost  # Стоимость лучшего пути итерации
+        self.mean_cost = mean_cost  # Средняя стоимость успешных путей
+        self.success_ratio = success_ratio  # Доля успешных муравьев
+        self.iteration_time = iteration_time  # Время итерации
+        self.wall_time = wall_time  # Время с начала запуска
+
+    def as_dict(self):
+        """
+        Возвращает метрики в виде словаря (удобно для логирования).
+        """
+        return {
+            'iteration': self.iteration,
+            'best_cost': float(self.best_cost),
+            'iteration_best_cost': float(self.iteration_best_cost),
+            'mean_cost': float(self.mean_cost),
+            'success_ratio': float(self.success_ratio),
+            'iteration_time': float(self.iteration_time),
+            'wall_time': float(self.wall_time),
+        }
+
+    def __repr__(self):
+        return (
+            f"IterationStats(iteration={self.iteration}, best_cost={self.best_cost}, "
+            f"mean_cost={self.mean_cost}, success_ratio={self.success_ratio})"
+        )
@@ -0,0 +1,296 @@
+import numpy as np
+
+from aco import AntColony
+
+RENORMALIZE_BELOW = 1e-30  # Порог decay^max(alpha, 1): хранимые феромоны растут как 1 / decay, привлекательность — как (1 / decay)^alpha
+
+
+class MaxMinAntColony(AntColony):
+    def __init__(self, graph, best_deposit='iteration', min_ratio=None, **kwargs):
+        """
+        MAX-MIN Ant System: феромон откладывает только лучший муравей, а значения
+        феромона ограничены интервалом [tau_min, tau_max].
+
+        Когда известно первое решение, а с ним и tau_max, феромон на всех ребрах
+        устанавливается равным tau_max, как предписывает MMAS.
+
+        Испарение ленивое: в матрице pheromone хранятся значения, деленные на общий
+        множитель испарения decay, поэтому испарение всей матрицы — это одно
+        умножение decay, а обновление затрагивает только ребра отложенного маршрута.
+        Фактический феромон ребра равен clip(pheromone * decay, tau_min, tau_max). Так как
+        равномерное масштабирование не меняет вероятности выбора, матрица
+        привлекательности пересчитывается только на ребрах отложенного маршрута,
+        а границы учитываются при чтении строки.
+
+        :param graph: Граф, в котором будет происходить поиск пути.
+        :param best_deposit: 'iteration' — откладывает лучший муравей итерации,
+            'global' — лучший найденный путь.
+        :param min_ratio: Отношение tau_min / tau_max (по умолчанию 1 / (2 * n)).
+        :param kwargs: Остальные параметры AntColony.
+        """
+        kwargs.setdefault('use_matrix', True)
+        if not kwargs['use_matrix']:
+            raise ValueError("MaxMinAntColony работает только в матричном режиме")
+        if kwargs.get('workers') or kwargs.get('executor'):
+            raise ValueError("MaxMinAntColony не поддерживает пул процессов")
+        if best_deposit not in ('iteration', 'global'):
+            raise ValueError("best_deposit должен быть 'iteration' или 'global'")
+        super().__init__(graph, **kwargs)
+
+        self.best_deposit = best_deposit  # Чей маршрут откладывает феромон
+        self.min_ratio = min_ratio if min_ratio is not None else 1 / (2 * max(self.num_nodes, 1))
+        self.decay = 1.0  # Общий множитель испарения
+        # Порог decay для перенормировки: не дает переполниться ни (1 / decay)^alpha, ни 1 / decay (при alpha < 1)
+        self.renormalize_below = RENORMALIZE_BELOW ** (1 / max(self.alpha, 1))
+        self.tau_max = np.inf  # Верхняя граница феромона (известна после первого решения)
+        self.tau_min = 0.0  # Нижняя граница феромона
+
+    def bounded_attractiveness(self, attractiveness, heuristic_beta):
+        """
+        Ограничивает привлекательность значениями tau_min и tau_max, переведенными
+        в хранимые единицы ((tau / decay)^alpha * eta^beta).
+
+        :param attractiveness: Строка или матрица хранимой привлекательности.
+        :param heuristic_beta: Соответствующая строка или матрица eta^beta.
+        :return: Новый массив с ограниченными значениями.
+        """
+        bounded = np.maximum(attractiveness, (self.tau_min / self.decay) ** self.alpha * heuristic_beta)
+        if np.isfinite(self.tau_max):  # До первого решения верхней границы нет
+            np.minimum(bounded, (self.tau_max / self.decay) ** self.alpha * heuristic_beta, out=bounded)
+        return bounded
+
+    def attractiveness_row(self, current):
+        """
+        Строка привлекательности с учетом границ [tau_min, tau_max].
+        """
+        return self.bounded_attractiveness(self.attractiveness[current], self.heuristic_beta[current])
+
+    def selection_matrix(self):
+        """
+        Полная матрица привлекательности с учетом границ [tau_min, tau_max].
+        """
+        return self.bounded_attractiveness(self.attractiveness, self.heuristic_beta)
+
+    def pheromone_matrix(self):
+        """
+        Фактическая матрица феромонов clip(pheromone * decay, tau_min, tau_max) на ребрах графа.
+        """
+        edges = np.isfinite(self.weights)
+        return np.where(edges, np.clip(self.pheromone * self.decay, self.tau_min, self.tau_max), 0.0)
+
+    def get_pheromone(self, a, b, default=0):
+        """
+        Фактический феромон на ребре с учетом ленивого испарения и границ.
+        """
+        i, j = self.node_index[a], self.node_index[b]
+        if not np.isfinite(self.weights[i, j]):
+            return default
+        return min(max(self.tau_min, self.pheromone[i, j] * self.decay), self.tau_max)
+
+    def edge_pheromones(self, rows_a, rows_b):
+        """
+        Фактические феромоны на наборе ребер с учетом ленивого испарения и границ.
+        """
+        return np.clip(self.pheromone[rows_a, rows_b] * self.decay, self.tau_min, self.tau_max)
+
+    def deposit_route(self, rows, path_cost, scale=1.0):
+        """
+        Муравьи не откладывают феромон при построении (ни по одному, ни пакетом):
+        в MMAS это делает только лучший маршрут в update_pheromones.
+        """
+
+    def update_pheromones(self):
+        """
+        Испаряет феромоны умножением общего множителя decay и откладывает феромон
+        лучшего маршрута с ограничением [tau_min, tau_max]. Затраты — O(длина маршрута);
+        только при первом решении феромон всех ребер устанавливается в tau_max.
+        """
+        path, cost = self.iteration_best_path, self.iteration_best_cost
+        if self.best_deposit == 'global' or path is None:
+            path, cost = self.best_path, self.best_cost
+
+        if self.best_path is not None:
+            first_solution = not np.isfinite(self.tau_max)
+            self.tau_max = self.pheromone_constant / (self.pheromone_evaporation_rate * self.best_cost)
+            self.tau_min = self.tau_max * self.min_ratio
+            if first_solution:  # Начальный феромон MMAS — tau_max на всех ребрах
+                self.pheromone = np.where(np.isfinite(self.weights), self.tau_max, 0.0)
+                self.decay = 1.0
+                self.update_attractiveness()
+
+        self.decay *= (1 - self.pheromone_evaporation_rate)  # Испаряем все ребра одним умножением
+
+        if path is not None:
+            rows = self.route_indices(path)
+            a, b = np.concatenate((rows[:-1], rows[1:])), np.concatenate((rows[1:], rows[:-1]))  # Оба направления
+            current = self.edge_pheromones(a, b)  # Фактические значения
+            updated = np.minimum(current + self.pheromone_constant / cost, self.tau_max)
+            self.pheromone[a, b] = updated / self.decay
+            self.attractiveness[a, b] = self.pheromone[a, b] ** self.alpha * self.heuristic_beta[a, b]
+
+        if self.decay < self.renormalize_below:  # Перенормировка до переполнения феромонов и привлекательности
+            self.renormalize()
+
+    def checkpoint_state(self):
+        """
+        Дополняет состояние контрольной точки множителем испарения и границами феромона.
+        """
+        state = super().checkpoint_state()
+        state.update(decay=self.decay, tau_max=self.tau_max, tau_min=self.tau_min)
+        return state
+
+    def load_state(self, state):
+        """
+        Восстанавливает множитель испарения и границы феромона.
+        """
+        super().load_state(state)
+        self.decay, self.tau_max, self.tau_min = state['decay'], state['tau_max'], state['tau_min']
+
+    def renormalize(self):
+        """
+        Переводит хранимые феромоны в фактические значения и сбрасывает decay в 1.
+        Выполняется редко: после сотен итераций испарения.
+        """
+        self.pheromone = self.pheromone_matrix()
+        self.decay = 1.0
+        self.update_attractiveness()
+
+
+class AntColonySystem(AntColony):
+    def __init__(self, graph, q0=0.9, xi=0.1, tau0=None, **kwargs):
+        """
+        Ant Colony System: псевдослучайное пропорциональное правило выбора,
+        локальное обновление феромона на каждом пройденном ребре и глобальное
+        обновление только на ребрах лучшего найденного пути. Остальные ребра не
+        испаряются, поэтому обновления затрагивают только ребра маршрутов.
+
+        :param graph: Граф, в котором будет происходить поиск пути.
+        :param q0: Вероятность жадного выбора ребра с максимальной привлекательностью.
+        :param xi: Коэффициент локального обновления феромона.
+        :param tau0: Начальный феромон (по умолчанию 1 / (n * C_nn), где C_nn —
+            стоимость маршрута ближайшего соседа).
+        :param kwargs: Остальные параметры AntColony.
+        """
+        kwargs.setdefault('use_matrix', True)
+        if not kwargs['use_matrix']:
+            raise ValueError("AntColonySystem работает только в матричном режиме")
+        if kwargs.get('workers') or kwargs.get('executor') or kwargs.get('batched'):
+            raise ValueError("AntColonySystem строит маршруты последовательно: локальное обновление зависит от порядка муравьев")
+        super().__init__(graph, **kwargs)
+
+        self.q0 = q0  # Вероятность жадного выбора
+        self.xi = xi  # Коэффициент локального обновления
+        self.tau0 = tau0 if tau0 is not None else self.initial_pheromone()  # Начальный феромон
+        self.pheromone *= self.tau0
+        self.update_attractiveness()
+
+    def initial_pheromone(self):
+        """
+        Оценивает начальный феромон 1 / (n * C_nn) по жадному маршруту ближайшего соседа.
+
+        :return: Начальное значение феромона.
+        """
+        start = self.node_index[self.start_node]
+        visited = np.zeros(self.num_nodes, dtype=bool)
+        visited[start] = True
+        current, cost = start, 0.0
+        for _ in range(self.num_nodes - 1):
+            row = np.where(visited, np.inf, self.weights[current])
+            nearest = int(np.argmin(row))
+            if not np.isfinite(row[nearest]):  # Жадный маршрут зашел в тупик: оцениваем по среднему весу
+                finite = self.weights[np.isfinite(self.weights)]
+                cost = finite.mean() * self.num_nodes if len(finite) else 1.0
+                break
+            cost += row[nearest]
+            visited[nearest] = True
+            current = nearest
+        else:
+            cost += self.weights[current, start] if np.isfinite(self.weights[current, start]) else 0.0
+        return 1 / (max(self.num_nodes, 1) * cost) if cost > 0 else 1.0
+
+    def checkpoint_state(self):
+        """
+        Дополняет состояние контрольной точки начальным феромоном tau0.
+        """
+        state = super().checkpoint_state()
+        state['tau0'] = self.tau0
+        return state
+
+    def load_state(self, state):
+        """
+        Восстанавливает начальный феромон tau0.
+        """
+        super().load_state(state)
+        self.tau0 = state['tau0']
+
+    def choose_next_index(self, visited_mask, current):
+        """
+        Выбирает следующий узел псевдослучайным пропорциональным правилом и
+        выполняет локальное обновление феромона на выбранном ребре.
+        """
+        if self.rng.random() < self.q0:  # Жадный выбор
+            next_index = self.greedy_index(visited_mask, current)
+        else:
+            next_index = super().choose_next_index(visited_mask, current)
+        if next_index is not None:
+            self.local_update(current, next_index)
+        return next_index
+
+    def greedy_index(self, visited_mask, current):
+        """
+        Возвращает непосещенный узел с максимальной привлекательностью (сначала среди кандидатов).
+
+        :param visited_mask: Булева маска посещенных узлов.
+        :param current: Индекс текущего узла.
+        :return: Индекс узла или None.
+        """
+        row = self.attractiveness_row(current)
+        if self.candidates is not None:
+            candidates = self.candidates[current]
+            values = np.where(visited_mask[candidates], -1.0, row[candidates])
+            best = int(np.argmax(values))
+            if values[best] > 0:
+                return int(candidates[best])
+
+        values = np.where(visited_mask, -1.0, row)
+        best = int(np.argmax(values))
+        return best if values[best] > 0 else None
+
+    def local_update(self, i, j):
+        """
+        Локальное обновление tau = (1 - xi) * tau + xi * tau0 на ребре (i, j) в обе стороны.
+
+        :param i: Индекс начального узла ребра.
+        :param j: Индекс конечного узла ребра.
+        """
+        for a, b in ((i, j), (j, i)):
+            self.pheromone[a, b] = (1 - self.xi) * self.pheromone[a, b] + self.xi * self.tau0
+            self.attractiveness[a, b] = self.pheromone[a, b] ** self.alpha * self.heuristic_beta[a, b]
+
+    def construct_solution_matrix(self, ant):
+        """
+        Строит решение и выполняет локальное обновление на замыкающем ребре маршрута.
+        """
+        success, path_cost = super().construct_solution_matrix(ant)
+        if success:
+            self.local_update(self.node_index[ant.route[-2]], self.node_index[ant.route[-1]])
+        return success, path_cost
+
+    def deposit_route(self, rows, path_cost, scale=1.0):
+        """
+        Муравьи не откладывают феромон при построении: в ACS это делает только
+        глобальное обновление лучшего пути.
+        """
+
+    def update_pheromones(self):
+        """
+        Глобальное обновление tau = (1 - rho) * tau + rho / C_best только на ребрах
+        лучшего найденного пути. Затраты — O(длина маршрута).
+        """
+        if self.best_path is None:
+            return
+        rho = self.pheromone_evaporation_rate
+        rows = self.route_indices(self.best_path)
+        a, b = np.concatenate((rows[:-1], rows[1:])), np.concatenate((rows[1:], rows[:-1]))  # Оба направления
+        self.pheromone[a, b] = (1 - rho) * self.pheromone[a, b] + rho * self.pheromone_constant / self.best_cost
+        self.attractiveness[a, b] = self.pheromone[a, b] ** self.alpha * self.heuristic_beta[a, b]
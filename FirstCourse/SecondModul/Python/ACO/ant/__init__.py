@@ -1,3 +1,5 @@
+import numpy as np
+
 
 class Ant:
     def __init__(self, alpha=1, beta=1):
@@ -11,6 +13,7 @@ class Ant:
         self.beta = beta    # Параметр эвристической информации
         self.route = []     # Маршрут муравья
         self.visited = set()  # Множество посещенных узлов
+        self.visited_mask = None  # Булева маска посещенных узлов (матричный режим)
 
     def reset(self, start_node):
         """
@@ -20,3 +23,16 @@ class Ant:
         """
         self.route = [start_node]  # Инициализируем маршрут начальным узлом
         self.visited = {start_node}  # Инициализируем множество посещенных узлов
+
+    def reset_mask(self, start_index, num_nodes):
+        """
+        Сбрасывает булеву маску посещенных узлов для матричного режима колонии.
+
+        :param start_index: Индекс начального узла.
+        :param num_nodes: Количество узлов в графе.
+        """
+        if self.visited_mask is None or len(self.visited_mask) != num_nodes:
+            self.visited_mask = np.zeros(num_nodes, dtype=bool)  # Выделяем маску один раз
+        else:
+            self.visited_mask.fill(False)  # Переиспользуем маску между итерациями
+        self.visited_mask[start_index] = True
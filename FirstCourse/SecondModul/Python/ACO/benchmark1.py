@@ -0,0 +1,62 @@
+import argparse
+import random
+import time
+
+from aco import AntColony
+from graph import Graph
+
+
+def build_complete_graph(num_nodes, seed=0):
+    """
+    Строит полный граф со случайными весами ребер.
+
+    :param num_nodes: Количество узлов.
+    :param seed: Зерно генератора случайных чисел.
+    :return: Объект Graph.
+    """
+    rng = random.Random(seed)
+    graph = Graph()
+    for i in range(num_nodes):
+        for j in range(i + 1, num_nodes):
+            graph.add_edge(i, j, rng.uniform(1, 100))
+    return graph
+
+
+def benchmark(graph, use_matrix, ant_count, iterations, updates, seed=0):
+    """
+    Замеряет время работы колонии в заданном режиме хранения феромонов.
+    Колония получает seed, поэтому стоимости и объем работы воспроизводимы.
+
+    :return: Время run(), время одного update_pheromones() и лучшая стоимость.
+    """
+    colony = AntColony(graph, ant_count=ant_count, iterations=iterations, use_matrix=use_matrix, seed=seed)
+
+    start = time.perf_counter()
+    _, best_cost = colony.run()
+    run_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(updates):
+        colony.update_pheromones()
+    update_time = (time.perf_counter() - start) / updates
+
+    return run_time, update_time, best_cost
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Сравнение словарного и матричного режимов AntColony")
+    parser.add_argument("--nodes", type=int, default=200, help="Количество узлов полного графа")
+    parser.add_argument("--ants", type=int, default=10, help="Количество муравьев")
+    parser.add_argument("--iterations", type=int, default=5, help="Количество итераций run()")
+    parser.add_argument("--updates", type=int, default=20, help="Количество замеров update_pheromones()")
+    parser.add_argument("--seed", type=int, default=0, help="Зерно графа и колонии")
+    args = parser.parse_args()
+
+    graph = build_complete_graph(args.nodes, args.seed)
+    print(f"Nodes: {args.nodes}, ants: {args.ants}, iterations: {args.iterations}")
+    for use_matrix in (False, True):
+        run_time, update_time, best_cost = benchmark(
+            graph, use_matrix, args.ants, args.iterations, args.updates, args.seed
+        )
+        mode = "matrix" if use_matrix else "dict"
+        print(f"{mode:>6}: run {run_time:.3f} s, update_pheromones {update_time * 1000:.2f} ms, best cost {best_cost:.2f}")
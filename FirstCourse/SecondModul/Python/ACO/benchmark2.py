@@ -0,0 +1,122 @@
+import argparse
+import time
+import tracemalloc
+
+from aco import AntColony
+from ant import Ant
+from tsplib import load_tsplib, random_euclidean
+
+
+def make_colony(graph, args, iterations=None):
+    """
+    Создает колонию с параметрами из командной строки.
+
+    :param graph: Граф экземпляра.
+    :param args: Аргументы командной строки.
+    :param iterations: Количество итераций (по умолчанию args.iterations).
+    :return: Объект AntColony.
+    """
+    return AntColony(
+        graph,
+        ant_count=args.ants,
+        iterations=iterations or args.iterations,
+        use_matrix=args.mode != 'dict',
+        batched=args.mode == 'batched',
+        candidate_count=args.candidates,
+        local_search=args.local_search,
+        track_best_path_probability=False,
+        seed=args.seed,
+    )
+
+
+def time_construction(colony, repeats):
+    """
+    Замеряет построение маршрутов одной итерации (без обновления феромонов).
+
+    :return: Среднее время построения маршрутов всех муравьев, в секундах.
+    """
+    ants = [Ant(alpha=colony.alpha, beta=colony.beta) for _ in range(colony.ant_count)]
+    start = time.perf_counter()
+    for _ in range(repeats):
+        if colony.batched:
+            colony.construct_batched()
+        else:
+            for _ in colony.construct_sequential(ants):
+                pass
+    return (time.perf_counter() - start) / repeats
+
+
+def time_update(colony, repeats):
+    """
+    Замеряет одно обновление феромонов.
+
+    :return: Среднее время update_pheromones(), в секундах.
+    """
+    start = time.perf_counter()
+    for _ in range(repeats):
+        colony.update_pheromones()
+    return (time.perf_counter() - start) / repeats
+
+
+def peak_memory(graph, args):
+    """
+    Измеряет пиковый объем памяти, выделенной при создании колонии и полном запуске.
+
+    :return: Пик в мегабайтах.
+    """
+    tracemalloc.start()
+    try:
+        make_colony(graph, args).run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 2 ** 20
+
+
+def benchmark(instance, args):
+    """
+    Запускает все замеры для одного экземпляра и печатает строку отчета.
+    """
+    graph = instance.to_graph()
+
+    colony = make_colony(graph, args, iterations=1)
+    construction = time_construction(colony, args.repeats)
+    update = time_update(colony, args.repeats)
+
+    result = make_colony(graph, args).run()
+    memory = peak_memory(graph, args) if args.memory else float('nan')
+
+    gap = instance.gap(result.best_cost)
+    print(
+        f"{instance.name:>16} {instance.dimension:>6} "
+        f"{args.ants / construction:>11.1f} {update * 1000:>10.3f} "
+        f"{result.wall_time:>9.3f} {args.ants * result.iterations / result.wall_time:>10.1f} "
+        f"{memory:>9.1f} {result.best_cost:>12.1f} {'-' if gap is None else f'{gap:.2f}':>7}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Замер производительности AntColony на экземплярах TSPLIB")
+    parser.add_argument("files", nargs="*", help="Файлы TSPLIB (.tsp)")
+    parser.add_argument("--random", type=int, nargs="*", default=[100, 1000, 5000],
+                        help="Размеры случайных евклидовых экземпляров")
+    parser.add_argument("--optimum", type=float, help="Известный оптимум (для одного файла)")
+    parser.add_argument("--mode", choices=["dict", "matrix", "batched"], default="batched",
+                        help="Режим построения маршрутов")
+    parser.add_argument("--ants", type=int, default=20, help="Количество муравьев")
+    parser.add_argument("--iterations", type=int, default=10, help="Количество итераций run()")
+    parser.add_argument("--candidates", type=int, help="Размер списков кандидатов")
+    parser.add_argument("--local-search", choices=["2-opt", "or-opt"], help="Локальный поиск")
+    parser.add_argument("--repeats", type=int, default=3, help="Повторы замеров построения и обновления")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="Не измерять пик памяти")
+    parser.add_argument("--seed", type=int, default=0, help="Зерно генератора случайных чисел")
+    args = parser.parse_args()
+
+    instances = [load_tsplib(path, optimum=args.optimum) for path in args.files]
+    instances += [random_euclidean(n, seed=args.seed) for n in args.random]
+
+    print(f"mode: {args.mode}, ants: {args.ants}, iterations: {args.iterations}, candidates: {args.candidates}")
+    print(f"{'instance':>16} {'nodes':>6} {'tours/s':>11} {'update ms':>10} "
+          f"{'run s':>9} {'run t/s':>10} {'peak MB':>9} {'best':>12} {'gap %':>7}")
+    for instance in instances:
+        benchmark(instance, args)
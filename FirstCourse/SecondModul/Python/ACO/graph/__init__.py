@@ -1,3 +1,6 @@
+import heapq
+
+import numpy as np
 from node import Node  # Импортируем класс Node, который используется для представления узлов графа
 
 
@@ -7,6 +10,8 @@ class Graph:
         Инициализация графа с пустым словарем узлов.
         """
         self.nodes = {}  # Словарь для хранения узлов графа
+        self.candidates = None  # Списки ближайших соседей (кандидатов) для каждого узла
+        self.candidate_count = 0  # Размер списков кандидатов
 
     def add_node(self, node_id):
         """
@@ -29,6 +34,7 @@ class Graph:
         self.add_node(node2_id)
         self.nodes[node1_id].add_edge(node2_id, weight)  # Добавляем ребро в первый узел
         self.nodes[node2_id].add_edge(node1_id, weight)  # Добавляем ребро во второй узел
+        self.candidates = None  # Списки кандидатов устарели
 
     def get_neighbors(self, node_id):
         """
@@ -39,6 +45,15 @@ class Graph:
         """
         return self.nodes[node_id].edges  # Возвращаем словарь соседей узла
 
+    def iter_neighbors(self, node_id):
+        """
+        Перебирает соседей узла вместе с весами ребер.
+
+        :param node_id: Идентификатор узла.
+        :return: Итератор пар (сосед, вес ребра).
+        """
+        return iter(self.nodes[node_id].edges.items())
+
     def get_weight(self, node1_id, node2_id):
         """
         Возвращает вес ребра между двумя узлами.
@@ -48,3 +63,202 @@ class Graph:
         :return: Вес ребра между узлами или бесконечность, если ребра нет.
         """
         return self.nodes[node1_id].edges.get(node2_id, float('inf'))  # Возвращаем вес ребра или бесконечность
+
+    def nearest_neighbors(self, k):
+        """
+        Вычисляет для каждого узла список из k ближайших по весу ребра соседей,
+        не сохраняя его в графе.
+
+        :param k: Количество кандидатов для каждого узла.
+        :return: Словарь узел -> список кандидатов, отсортированных по весу.
+        """
+        return {
+            node_id: [neighbor for neighbor, _ in heapq.nsmallest(k, node.edges.items(), key=lambda edge: edge[1])]
+            for node_id, node in self.nodes.items()
+        }  # k ближайших соседей каждого узла
+
+    def build_candidate_lists(self, k):
+        """
+        Строит и сохраняет в графе списки k ближайших соседей (nearest_neighbors).
+        Списки вычисляются один раз и сбрасываются при добавлении ребер.
+
+        :param k: Количество кандидатов для каждого узла.
+        :return: Словарь узел -> список кандидатов, отсортированных по весу.
+        """
+        self.candidates = self.nearest_neighbors(k)
+        self.candidate_count = k
+        return self.candidates
+
+    def get_candidates(self, node_id):
+        """
+        Возвращает список кандидатов для узла или всех соседей, если списки не построены.
+
+        :param node_id: Идентификатор узла.
+        :return: Список идентификаторов соседних узлов.
+        """
+        if self.candidates is None:
+            return list(self.nodes[node_id].edges)
+        return self.candidates[node_id]
+
+    def freeze(self):
+        """
+        Компилирует граф в неизменяемое CSR-представление с массивами NumPy.
+
+        :return: Объект FrozenGraph.
+        """
+        return FrozenGraph.from_graph(self)
+
+
+class FrozenGraph:
+    def __init__(self, node_ids, indptr, indices, weights):
+        """
+        Неизменяемый граф в формате CSR: соседи узла с индексом i хранятся в
+        indices[indptr[i]:indptr[i + 1]] (по возрастанию), а веса ребер — в том же
+        срезе weights.
+
+        :param node_ids: Список идентификаторов узлов (индекс -> идентификатор).
+        :param indptr: Границы строк, массив длины n + 1.
+        :param indices: Индексы соседних узлов.
+        :param weights: Веса ребер (float64).
+        """
+        self.node_ids = list(node_ids)  # Индекс -> идентификатор узла
+        self.nodes = {node_id: i for i, node_id in enumerate(self.node_ids)}  # Идентификатор узла -> индекс
+        self.indptr = indptr  # Границы строк
+        self.indices = indices  # Индексы соседей
+        self.weights = weights  # Веса ребер
+        self.candidates = None  # Списки ближайших соседей (кандидатов) для каждого узла
+        self.candidate_count = 0  # Размер списков кандидатов
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Строит CSR-представление из изменяемого графа Graph.
+
+        :param graph: Исходный граф.
+        :return: Объект FrozenGraph.
+        """
+        node_ids = list(graph.nodes)
+        index = {node_id: i for i, node_id in enumerate(node_ids)}
+        indptr = np.zeros(len(node_ids) + 1, dtype=np.int64)
+        indices = []
+        weights = []
+        for i, node_id in enumerate(node_ids):
+            edges = sorted((index[neighbor], weight) for neighbor, weight in graph.get_neighbors(node_id).items())
+            indices.extend(j for j, _ in edges)
+            weights.extend(weight for _, weight in edges)
+            indptr[i + 1] = len(indices)
+        return cls(node_ids, indptr, np.asarray(indices, dtype=np.int64), np.asarray(weights, dtype=np.float64))
+
+    @classmethod
+    def from_dense(cls, weights, node_ids=None):
+        """
+        Строит CSR-представление из плотной матрицы весов. Ребрами считаются все
+        конечные элементы вне диагонали.
+
+        :param weights: Матрица весов n x n (inf для отсутствующих ребер).
+        :param node_ids: Идентификаторы узлов (по умолчанию 0..n-1).
+        :return: Объект FrozenGraph.
+        """
+        weights = np.asarray(weights, dtype=np.float64)
+        n = len(weights)
+        edges = np.isfinite(weights)
+        np.fill_diagonal(edges, False)
+        rows, cols = np.nonzero(edges)  # Индексы уже упорядочены по строкам и столбцам
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        node_ids = range(n) if node_ids is None else node_ids
+        return cls(node_ids, indptr, cols.astype(np.int64), weights[rows, cols])
+
+    def row(self, i):
+        """
+        Возвращает соседей и веса ребер узла по его индексу без копирования.
+
+        :param i: Индекс узла.
+        :return: Пара срезов (indices, weights).
+        """
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:end], self.weights[start:end]
+
+    def get_neighbors(self, node_id):
+        """
+        Возвращает соседей для указанного узла.
+
+        :param node_id: Идентификатор узла.
+        :return: Словарь соседей узла с весами ребер.
+        """
+        return dict(self.iter_neighbors(node_id))
+
+    def iter_neighbors(self, node_id):
+        """
+        Перебирает соседей узла прямо по строке CSR, не строя словарь.
+
+        :param node_id: Идентификатор узла.
+        :return: Итератор пар (сосед, вес ребра).
+        """
+        indices, weights = self.row(self.nodes[node_id])
+        return zip(map(self.node_ids.__getitem__, indices.tolist()), weights.tolist())
+
+    def get_weight(self, node1_id, node2_id):
+        """
+        Возвращает вес ребра между двумя узлами бинарным поиском по строке CSR.
+
+        :param node1_id: Идентификатор первого узла.
+        :param node2_id: Идентификатор второго узла.
+        :return: Вес ребра между узлами или бесконечность, если ребра нет.
+        """
+        indices, weights = self.row(self.nodes[node1_id])
+        j = self.nodes[node2_id]
+        position = np.searchsorted(indices, j)
+        if position < len(indices) and indices[position] == j:
+            return float(weights[position])
+        return float('inf')
+
+    def to_dense(self):
+        """
+        Разворачивает граф в плотную матрицу весов (inf для отсутствующих ребер).
+
+        :return: Матрица весов n x n.
+        """
+        n = len(self.node_ids)
+        dense = np.full((n, n), np.inf)
+        rows = np.repeat(np.arange(n), np.diff(self.indptr))  # Номер строки для каждого ребра
+        dense[rows, self.indices] = self.weights
+        return dense
+
+    def nearest_neighbors(self, k):
+        """
+        Вычисляет для каждого узла список из k ближайших по весу ребра соседей,
+        не сохраняя его в графе.
+
+        :param k: Количество кандидатов для каждого узла.
+        :return: Словарь узел -> список кандидатов, отсортированных по весу.
+        """
+        candidates = {}
+        for i, node_id in enumerate(self.node_ids):
+            indices, weights = self.row(i)
+            nearest = indices[np.argsort(weights, kind='stable')[:k]]
+            candidates[node_id] = [self.node_ids[j] for j in nearest.tolist()]
+        return candidates
+
+    def build_candidate_lists(self, k):
+        """
+        Строит и сохраняет в графе списки k ближайших соседей (nearest_neighbors).
+
+        :param k: Количество кандидатов для каждого узла.
+        :return: Словарь узел -> список кандидатов, отсортированных по весу.
+        """
+        self.candidates = self.nearest_neighbors(k)
+        self.candidate_count = k
+        return self.candidates
+
+    def get_candidates(self, node_id):
+        """
+        Возвращает список кандидатов для узла или всех соседей, если списки не построены.
+
+        :param node_id: Идентификатор узла.
+        :return: Список идентификаторов соседних узлов.
+        """
+        if self.candidates is None:
+            indices, _ = self.row(self.nodes[node_id])
+            return [self.node_ids[j] for j in indices.tolist()]
+        return self.candidates[node_id]
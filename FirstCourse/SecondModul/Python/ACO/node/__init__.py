@@ -1,4 +1,6 @@
 class Node:
+    __slots__ = ('id', 'edges')  # Без __dict__: меньше памяти на каждый узел
+
     def __init__(self, id):
         """
         Инициализация узла с заданным идентификатором и пустыми ребрами.
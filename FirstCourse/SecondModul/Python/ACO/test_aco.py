@@ -0,0 +1,529 @@
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from aco import AntColony
+from aco.islands import IslandModel
+from aco.kernels import construct_batch, select_index
+from aco.local_search import or_opt, two_opt
+from aco.variants import AntColonySystem, MaxMinAntColony
+from graph import FrozenGraph, Graph
+from tsplib import coordinate_distances, load_tsplib, random_euclidean
+
+
+@pytest.fixture
+def graph():
+    return random_euclidean(25, seed=1).to_graph()
+
+
+@pytest.fixture
+def small_graph():
+    graph = Graph()
+    rng = np.random.default_rng(0)
+    for i in range(6):
+        for j in range(i + 1, 6):
+            graph.add_edge(i, j, float(rng.integers(1, 20)))
+    return graph
+
+
+BURMA14 = """NAME: burma14
+TYPE: TSP
+DIMENSION: 14
+EDGE_WEIGHT_TYPE: GEO
+NODE_COORD_SECTION
+   1  16.47       96.10
+   2  16.47       94.44
+   3  20.09       92.54
+   4  22.39       93.37
+   5  25.23       97.24
+   6  22.00       96.05
+   7  20.47       97.02
+   8  17.20       96.29
+   9  16.30       97.38
+  10  14.05       98.12
+  11  16.53       97.38
+  12  21.52       95.59
+  13  19.41       97.13
+  14  20.09       94.55
+EOF
+"""
+
+
+def kill_process(route, weights):
+    os.kill(os.getpid(), signal.SIGKILL)  # Имитирует аварийную гибель процесса острова
+
+
+def route_cost(route, weights):
+    route = np.asarray(route)
+    return weights[route[:-1], route[1:]].sum()
+
+
+def test_load_tsplib_geo_matches_known_optimum(tmp_path):
+    path = tmp_path / "burma14.tsp"
+    path.write_text(BURMA14)
+
+    instance = load_tsplib(path)
+    tour = np.array([1, 2, 14, 3, 4, 5, 6, 12, 7, 13, 8, 11, 9, 10, 1]) - 1  # Оптимальный тур из TSPLIB
+
+    assert instance.name == 'burma14' and instance.dimension == 14
+    assert route_cost(tour, instance.weights) == instance.optimum == 3323
+    assert instance.gap(3323) == 0 and instance.gap(3655.3) == pytest.approx(10.0)
+    assert np.all(np.isinf(np.diag(instance.weights)))
+    # С PI = 3.141592 из спецификации TSPLIB, а не math.pi (с ним вышло бы 15693)
+    assert coordinate_distances(np.array([[59.42, -20.0], [-68.55, 60.5]]), 'GEO')[0, 1] == 15692
+
+
+def test_load_tsplib_explicit_and_euclidean(tmp_path):
+    explicit = tmp_path / "tiny.tsp"
+    explicit.write_text(
+        "NAME: tiny\nTYPE: TSP\nDIMENSION: 4\nEDGE_WEIGHT_TYPE: EXPLICIT\nEDGE_WEIGHT_FORMAT: UPPER_ROW\n"
+        "EDGE_WEIGHT_SECTION\n1 2 3\n4 5\n6\nEOF\n"
+    )
+    euclidean = tmp_path / "euc.tsp"
+    euclidean.write_text(
+        "NAME: euc\nTYPE: TSP\nDIMENSION: 3\nEDGE_WEIGHT_TYPE: EUC_2D\nNODE_COORD_SECTION\n"
+        "1 0 0\n2 3 4\n3 0 2.5\nEOF\n"
+    )
+
+    weights = load_tsplib(explicit).weights
+    assert weights[0, 1:].tolist() == [1, 2, 3] and weights[1, 2:].tolist() == [4, 5] and weights[2, 3] == 6
+    assert np.array_equal(weights, weights.T)
+    instance = load_tsplib(euclidean)
+    assert instance.optimum is None and instance.gap(10) is None
+    assert instance.weights[0, 1] == 5 and instance.weights[0, 2] == 3  # 2.5 округляется вверх (nint)
+    assert instance.to_graph().get_weight(1, 2) == instance.weights[1, 2]
+
+
+def test_matrix_mode_compiles_graph(small_graph):
+    colony = AntColony(small_graph, use_matrix=True)
+
+    for a in small_graph.nodes:
+        for b in small_graph.nodes:
+            i, j = colony.node_index[a], colony.node_index[b]
+            assert colony.weights[i, j] == small_graph.get_weight(a, b)
+            if a == b:
+                assert colony.heuristic[i, j] == 0 and colony.pheromone[i, j] == 0
+            else:
+                assert colony.heuristic[i, j] == pytest.approx(1 / small_graph.get_weight(a, b))
+                assert colony.pheromone[i, j] == 1
+
+
+def test_matrix_pheromone_update_matches_dict_mode(small_graph):
+    colonies = [AntColony(small_graph, use_matrix=use_matrix) for use_matrix in (False, True)]
+    paths = [[0, 1, 2, 3, 4, 5, 0], [0, 2, 4, 1, 3, 5, 0]]
+
+    for colony in colonies:
+        for path in paths:
+            colony.update_tmp_pheromones(path, colony.calculate_path_cost(path))
+        colony.update_pheromones()
+
+    dict_colony, matrix_colony = colonies
+    for a, b in dict_colony.pheromone_map:
+        assert matrix_colony.get_pheromone(a, b) == pytest.approx(dict_colony.get_pheromone(a, b))
+    assert matrix_colony.calculate_path_cost(paths[0]) == dict_colony.calculate_path_cost(paths[0])
+
+
+def test_frozen_graph_matches_source(small_graph):
+    small_graph.add_edge(0, 9, 4.0)  # Узел 9 связан только с 0: строки разной длины
+    frozen = FrozenGraph.from_graph(small_graph)
+
+    for node_id in small_graph.nodes:
+        assert frozen.get_neighbors(node_id) == small_graph.get_neighbors(node_id)
+        assert dict(frozen.iter_neighbors(node_id)) == small_graph.get_neighbors(node_id)
+        indices, weights = frozen.row(frozen.nodes[node_id])
+        assert list(indices) == sorted(indices)
+        for other in small_graph.nodes:
+            assert frozen.get_weight(node_id, other) == small_graph.get_weight(node_id, other)
+
+    dense = frozen.to_dense()
+    assert np.isinf(dense[frozen.nodes[9], frozen.nodes[1]])
+    restored = FrozenGraph.from_dense(dense, frozen.node_ids)
+    assert np.array_equal(restored.indptr, frozen.indptr)
+    assert np.array_equal(restored.indices, frozen.indices)
+    assert np.array_equal(restored.weights, frozen.weights)
+
+
+@pytest.mark.parametrize("candidate_count", [None, 3])
+def test_dict_mode_on_frozen_graph_matches_graph(small_graph, candidate_count):
+    frozen = small_graph.freeze()
+    results = [AntColony(g, seed=5, iterations=10, candidate_count=candidate_count).run() for g in (small_graph, frozen)]
+
+    assert results[0].best_path == results[1].best_path
+    assert results[0].best_cost == results[1].best_cost
+
+
+def test_select_index_is_proportional_and_skips_visited():
+    rng = np.random.default_rng(0)
+    row = np.array([1.0, 2.0, 0.0, 7.0])
+    visited = np.array([False, False, False, True])
+
+    counts = np.bincount([select_index(row, visited, rng) for _ in range(6000)], minlength=4)
+
+    assert counts[2] == counts[3] == 0
+    assert counts[1] / counts[0] == pytest.approx(2.0, rel=0.1)
+    assert select_index(row, np.ones(4, dtype=bool), rng) is None
+    assert select_index(np.zeros(4), np.zeros(4, dtype=bool), rng) is None
+
+
+def test_select_index_candidates_and_overflow():
+    rng = np.random.default_rng(0)
+    visited = np.array([True, False, False, False, False])
+    row = np.array([0.0, 5.0, 5.0, 1.0, 1.0])
+
+    assert {select_index(row, visited, rng, np.array([3, 4])) for _ in range(50)} == {3, 4}
+    visited[[3, 4]] = True
+    assert {select_index(row, visited, rng, np.array([3, 4])) for _ in range(50)} == {1, 2}  # Все кандидаты посещены
+
+    huge = np.array([1e308, 1e308, 1.0, 0.0])  # Сумма переполняется
+    with np.errstate(over='ignore'):
+        assert {select_index(huge, np.zeros(4, dtype=bool), rng) for _ in range(200)} <= {0, 1, 2}
+        assert select_index(np.array([np.inf, 1.0, 0.0]), np.zeros(3, dtype=bool), rng) == 0
+
+
+def test_candidate_lists_are_nearest_neighbors(small_graph):
+    colony = AntColony(small_graph, use_matrix=True, candidate_count=2)
+
+    for node_id in small_graph.nodes:
+        weights = sorted(small_graph.get_neighbors(node_id).values())
+        chosen = [small_graph.get_weight(node_id, c) for c in colony.candidate_lists[node_id]]
+        assert chosen == weights[:2]
+        row = colony.candidates[colony.node_index[node_id]]
+        assert [colony.node_ids[j] for j in row] == colony.candidate_lists[node_id]
+
+
+def test_candidate_lists_do_not_mutate_graph(small_graph):
+    small = AntColony(small_graph, candidate_count=2)
+    large = AntColony(small_graph, use_matrix=True, candidate_count=4)
+
+    assert small_graph.candidates is None
+    assert all(len(row) == 2 for row in small.candidate_lists.values())
+    assert all(len(row) == 4 for row in large.candidate_lists.values())
+    assert large.candidates.shape == (6, 4)
+    assert small.run().best_path is not None
+
+
+@pytest.mark.parametrize("candidate_count", [None, 3])
+def test_construct_batch_builds_closed_tours(graph, candidate_count):
+    colony = AntColony(graph, use_matrix=True, candidate_count=candidate_count)
+    start = colony.node_index[0]
+
+    routes, costs = construct_batch(
+        colony.attractiveness, colony.weights, start, 30, np.random.default_rng(1), colony.candidates
+    )
+
+    assert routes.shape == (30, colony.num_nodes + 1)
+    for route, cost in zip(routes, costs):
+        assert route[0] == route[-1] == start
+        assert sorted(route[:-1]) == list(range(colony.num_nodes))
+        assert cost == pytest.approx(route_cost(route, colony.weights))
+
+
+def test_construct_batch_marks_dead_ends():
+    weights = np.full((4, 4), np.inf)
+    for a, b in ((0, 1), (1, 2), (2, 3)):  # Путь без замыкающего ребра: маршрута нет
+        weights[a, b] = weights[b, a] = 1.0
+    attractiveness = np.where(np.isfinite(weights), 1.0, 0.0)
+
+    _, costs = construct_batch(attractiveness, weights, 0, 10, np.random.default_rng(0))
+
+    assert np.all(np.isinf(costs))
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"use_matrix": True},
+    {"use_matrix": True, "batched": True},
+    {"use_matrix": True, "local_search": two_opt},
+])
+def test_same_seed_same_result(graph, options):
+    first = AntColony(graph, seed=7, iterations=20, **options).run()
+    second = AntColony(graph, seed=7, iterations=20, **options).run()
+
+    assert first.best_path == second.best_path
+    assert first.best_cost == second.best_cost
+    assert np.array_equal(first.best_costs, second.best_costs)
+
+
+def test_result_unpacks_and_records_best_costs(small_graph):
+    result = AntColony(small_graph, seed=1, iterations=15).run()
+    path, cost = result
+
+    assert (path, cost) == (result.best_path, result.best_cost)
+    assert result.stop_reason == 'iterations'
+    assert result.iterations == len(result.best_costs) == 15
+    assert np.all(np.diff(result.best_costs) <= 0)
+    assert result.best_costs[-1] == cost
+
+
+@pytest.mark.parametrize("use_matrix", [False, True])
+def test_convergence_metrics_start_uniform(small_graph, use_matrix):
+    colony = AntColony(small_graph, use_matrix=use_matrix)
+
+    assert colony.branching_factor() == pytest.approx(5.0)  # Полный граф: все 5 ребер узла активны
+    assert colony.pheromone_entropy() == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("options, reason", [
+    ({"time_limit": 0}, 'time_limit'),
+    ({"min_branching": 100}, 'branching'),
+    ({"min_entropy": 1.01}, 'entropy'),
+])
+def test_stop_reasons_after_first_iteration(small_graph, options, reason):
+    result = AntColony(small_graph, seed=1, iterations=50, **options).run()
+
+    assert result.stop_reason == reason
+    assert result.iterations == len(result.best_costs) == 1
+
+
+def test_patience_stops_after_stale_iterations(small_graph):
+    result = AntColony(small_graph, seed=1, iterations=500, patience=3).run()
+
+    assert result.stop_reason == 'patience'
+    assert result.iterations < 500
+    assert np.all(result.best_costs[-4:] == result.best_cost)  # Улучшение и три итерации без него
+    assert len(result.best_costs) == 4 or result.best_costs[-5] > result.best_cost
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"batched": True},
+    {"local_search": two_opt},
+])
+def test_incremental_best_path_probability_matches_recompute(graph, options):
+    colony = AntColony(graph, seed=6, iterations=60, ant_count=5, use_matrix=True, **options)
+    full_recomputes = []
+    path_log_pheromone = colony.path_log_pheromone
+    colony.path_log_pheromone = lambda path: full_recomputes.append(path) or path_log_pheromone(path)
+
+    def check(stats):
+        rows = colony.route_indices(colony.best_path)
+        a, b = rows[:-1], rows[1:]
+        expected = colony.alpha * np.log(colony.pheromone[a, b]).sum() - colony.beta * np.log(colony.weights[a, b]).sum()
+        assert colony.best_path_log_probabilities[stats.iteration] == pytest.approx(expected, rel=1e-9)
+
+    colony.run(check)
+
+    assert len(full_recomputes) < colony.iterations_done  # Большая часть итераций — инкрементные
+
+
+def test_callback_receives_iteration_stats(small_graph):
+    stats = []
+    result = AntColony(small_graph, seed=1, iterations=8).run(stats.append)
+
+    assert [s.iteration for s in stats] == list(range(8))
+    assert [s.best_cost for s in stats] == list(result.best_costs)
+    for s in stats:
+        assert 0 <= s.success_ratio <= 1
+        assert s.best_cost <= s.iteration_best_cost <= s.mean_cost
+        assert set(s.as_dict()) == {
+            'iteration', 'best_cost', 'iteration_best_cost', 'mean_cost', 'success_ratio', 'iteration_time', 'wall_time'
+        }
+    assert all(a.wall_time <= b.wall_time for a, b in zip(stats, stats[1:]))
+
+
+def test_best_path_probability_tracking_can_be_disabled(small_graph):
+    tracked = AntColony(small_graph, seed=1, iterations=5)
+    untracked = AntColony(small_graph, seed=1, iterations=5, track_best_path_probability=False)
+
+    assert tracked.run().best_cost == untracked.run().best_cost
+    assert np.all(tracked.best_path_probabilities > 0)
+    assert not untracked.best_path_probabilities.any()
+
+
+def test_import_does_not_require_matplotlib():
+    code = "import sys, aco, aco.variants; assert 'matplotlib' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=Path(__file__).parent)
+
+
+def test_parallel_result_does_not_depend_on_workers(graph):
+    single = AntColony(graph, seed=7, iterations=10, use_matrix=True, workers=1).run()
+    several = AntColony(graph, seed=7, iterations=10, use_matrix=True, workers=3).run()
+
+    assert single.best_path == several.best_path
+    assert single.best_cost == several.best_cost
+    assert np.array_equal(single.best_costs, several.best_costs)
+
+
+@pytest.mark.parametrize("colony_class, options", [
+    (AntColony, {}),
+    (AntColony, {"use_matrix": True}),
+    (MaxMinAntColony, {"use_matrix": True}),
+    (AntColonySystem, {"use_matrix": True}),
+])
+def test_checkpoint_resume_matches_uninterrupted_run(graph, tmp_path, colony_class, options):
+    checkpoint = tmp_path / "ckpt"
+    uninterrupted = colony_class(graph, seed=3, iterations=30, **options)
+    expected = uninterrupted.run(lambda stats: stats.iteration == 11 and uninterrupted.save_checkpoint(checkpoint))
+
+    resumed = colony_class(graph, seed=3, iterations=30, **options)
+    resumed.restore_checkpoint(checkpoint)
+    assert resumed.iterations_done == 12
+    result = resumed.run()
+
+    assert result.best_path == expected.best_path
+    assert result.best_cost == expected.best_cost
+    assert np.array_equal(result.best_costs, expected.best_costs)
+
+
+@pytest.mark.parametrize("improve", [two_opt, or_opt])
+def test_local_search_never_lengthens_route(improve):
+    rng = np.random.default_rng(5)
+    for n in (4, 5, 12, 40):
+        points = rng.random((n, 2))
+        weights = np.linalg.norm(points[:, None] - points[None, :], axis=-1)
+        for _ in range(10):
+            route = np.concatenate(([0], rng.permutation(np.arange(1, n)), [0]))  # Замкнутый маршрут из узла 0
+
+            improved = improve(route, weights)
+
+            assert improved[0] == improved[-1] == 0
+            assert sorted(improved[:-1]) == list(range(n))
+            assert route_cost(improved, weights) <= route_cost(route, weights) + 1e-9
+
+
+def test_or_opt_moves_misplaced_node():
+    points = np.array([[np.cos(t), np.sin(t)] for t in np.linspace(0, 2 * np.pi, 12, endpoint=False)])
+    weights = np.linalg.norm(points[:, None] - points[None, :], axis=-1)
+    route = [0, 1, 2, 7, 3, 4, 5, 6, 8, 9, 10, 11, 0]  # Узел 7 вставлен не на свое место
+
+    improved = or_opt(np.array(route), weights)
+
+    assert improved.tolist() in (list(range(12)) + [0], [0] + list(range(11, 0, -1)) + [0])
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_best_scope_deposits_only_improved_route(graph, batched):
+    """
+    С одним муравьем феромон после итерации — испарение плюс вклад улучшенного
+    маршрута; вклад исходного маршрута должен быть снят.
+    """
+    colony = AntColony(graph, seed=3, ant_count=1, iterations=1, use_matrix=True, batched=batched, local_search=two_opt)
+    result = colony.run()
+
+    expected = np.isfinite(colony.weights) * (1 - colony.pheromone_evaporation_rate)
+    rows = colony.route_indices(result.best_path)
+    expected[rows[:-1], rows[1:]] += colony.pheromone_constant / result.best_cost
+    expected[rows[1:], rows[:-1]] += colony.pheromone_constant / result.best_cost
+    assert np.allclose(colony.pheromone, expected, rtol=0, atol=1e-12)
+
+
+def test_island_model_shares_best_route(graph):
+    """
+    Слабый остров останавливается досрочно, но продолжает обмены: его результат
+    должен отражать маршрут, принятый от соседа на последнем обмене.
+    """
+    islands = [{"beta": 0.0, "ant_count": 1, "patience": 1}, {"local_search": two_opt}]
+    model = IslandModel(graph, islands, migration_interval=5, iterations=12, seed=1, ant_count=5)
+    result = model.run()
+
+    weak, strong = model.island_results
+    assert weak.stop_reason == 'patience' and weak.iterations < 12
+    assert strong.iterations == len(strong.best_costs) == 12
+    for island in model.island_results:  # После последнего обмена оба острова знают общий лучший маршрут
+        assert island.best_cost == island.best_costs[-1] == result.best_cost
+        assert island.best_path[0] == island.best_path[-1] == 0
+    assert route_cost(result.best_path, graph.to_dense()) == pytest.approx(result.best_cost)
+
+
+def test_island_model_fails_when_island_is_killed(graph):
+    def timeout(signum, frame):
+        for process in multiprocessing.active_children():  # Иначе зависшие острова не дадут завершиться pytest
+            process.kill()
+        pytest.fail("IslandModel.run завис после гибели острова")  # Не OSError: его поглотил бы os.waitpid
+
+    previous = signal.signal(signal.SIGALRM, timeout)
+    signal.alarm(30)
+    try:
+        model = IslandModel(graph, [{}, {"local_search": kill_process}], migration_interval=5, iterations=20, seed=1)
+        with pytest.raises(RuntimeError, match="острова 1"):
+            model.run()
+    finally:
+        signal.alarm(0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def test_max_min_pheromone_within_bounds(graph):
+    colony = MaxMinAntColony(graph, seed=2, iterations=40, use_matrix=True, alpha=5.0)
+    result = colony.run()
+
+    assert result.best_path is not None
+    assert colony.iterations_done == 40
+    edges = np.isfinite(colony.weights)
+    pheromone = colony.pheromone_matrix()[edges]
+    assert np.isfinite(colony.tau_max)
+    assert np.all(pheromone >= colony.tau_min)
+    assert np.all(pheromone <= colony.tau_max)
+    rows = colony.route_indices(result.best_path)
+    assert np.all(np.isfinite(colony.edge_pheromones(rows[:-1], rows[1:])))
+
+
+def test_max_min_survives_strong_decay(graph):
+    """
+    Долгий запуск с сильным испарением: затухание decay ** alpha должно
+    перенормироваться, а не переполнять привлекательность.
+    """
+    colony = MaxMinAntColony(graph, seed=4, iterations=300, use_matrix=True, alpha=5.0,
+                             pheromone_evaporation_rate=0.5)
+    result = colony.run()
+
+    assert colony.iterations_done == 300
+    assert np.isfinite(result.best_cost)
+    assert np.all(np.isfinite(colony.attractiveness[np.isfinite(colony.weights)]))
+
+
+def test_batched_deposit_matches_route_by_route(graph):
+    colony = AntColony(graph, use_matrix=True)
+    routes, costs = construct_batch(colony.attractiveness, colony.weights, 0, 5, np.random.default_rng(0))
+
+    colony.deposit_route(routes, costs)
+    batched = colony.tmp_pheromone.copy()
+    colony.tmp_pheromone[:] = 0
+    for route, cost in zip(routes, costs):
+        colony.deposit_route(route, cost)
+
+    assert np.allclose(batched, colony.tmp_pheromone)
+
+
+def test_max_min_batched_does_not_accumulate_deposits(graph):
+    colony = MaxMinAntColony(graph, seed=2, iterations=20, batched=True)
+    colony.run()
+
+    assert not colony.tmp_pheromone.any()  # В MMAS феромон откладывает только лучший маршрут
+    pheromone = colony.pheromone_matrix()[np.isfinite(colony.weights)]
+    assert np.all((pheromone >= colony.tau_min) & (pheromone <= colony.tau_max))
+
+
+def test_max_min_renormalizes_without_alpha(graph):
+    """
+    При alpha = 0 привлекательность от decay не зависит, но сам decay за сотни
+    итераций исчезал бы в ноль, а хранимые феромоны — переполнялись.
+    """
+    colony = MaxMinAntColony(graph, seed=4, iterations=400, use_matrix=True, alpha=0.0,
+                             pheromone_evaporation_rate=0.9)
+    result = colony.run()
+
+    assert colony.iterations_done == 400
+    assert colony.decay > 0
+    pheromone = colony.pheromone_matrix()[np.isfinite(colony.weights)]
+    assert np.all(np.isfinite(colony.pheromone[np.isfinite(colony.weights)]))
+    assert np.all((pheromone >= colony.tau_min) & (pheromone <= colony.tau_max))
+    assert np.isfinite(result.best_cost)
+
+
+def test_colony_system_pheromone_within_bounds(graph):
+    colony = AntColonySystem(graph, seed=2, iterations=40, use_matrix=True)
+    result = colony.run()
+
+    assert result.best_path is not None
+    assert colony.iterations_done == 40
+    # Локальное и глобальное обновления — выпуклые комбинации с tau0 и Q / C_best
+    first_best = colony.pheromone_constant / result.best_costs[0]
+    best = colony.pheromone_constant / result.best_cost
+    pheromone = colony.pheromone[np.isfinite(colony.weights)]
+    assert np.all(pheromone >= min(colony.tau0, first_best) * (1 - 1e-9))
+    assert np.all(pheromone <= max(colony.tau0, best) * (1 + 1e-9))
@@ -0,0 +1,184 @@
+import numpy as np
+from graph import FrozenGraph
+
+GEO_PI = 3.141592  # Значение PI из спецификации TSPLIB: с ним получаются эталонные расстояния GEO
+GEO_RADIUS = 6378.388  # Радиус Земли в TSPLIB, км
+
+# Известные оптимальные длины маршрутов для классических экземпляров TSPLIB
+KNOWN_OPTIMA = {
+    'burma14': 3323,
+    'gr17': 2085,
+    'att48': 10628,
+    'berlin52': 7542,
+    'eil51': 426,
+    'eil76': 538,
+    'eil101': 629,
+    'st70': 675,
+    'pr76': 108159,
+    'rat99': 1211,
+    'kroA100': 21282,
+    'ch150': 6528,
+    'a280': 2579,
+    'pcb442': 50778,
+}
+
+
+class TSPInstance:
+    def __init__(self, name, weights, coords=None, optimum=None):
+        """
+        Экземпляр задачи коммивояжера: матрица расстояний и, если есть, координаты.
+
+        :param name: Имя экземпляра.
+        :param weights: Матрица расстояний n x n (inf на диагонали).
+        :param coords: Массив координат n x 2 или None.
+        :param optimum: Известная оптимальная длина маршрута или None.
+        """
+        self.name = name  # Имя экземпляра
+        self.weights = weights  # Матрица расстояний
+        self.coords = coords  # Координаты узлов
+        self.optimum = optimum  # Известный оптимум
+
+    @property
+    def dimension(self):
+        """
+        Количество узлов.
+        """
+        return len(self.weights)
+
+    def to_graph(self):
+        """
+        Строит неизменяемый CSR-граф прямо из матрицы расстояний, без создания
+        объектов Node для каждого узла.
+
+        :return: Объект FrozenGraph с узлами 0..n-1.
+        """
+        return FrozenGraph.from_dense(self.weights)
+
+    def gap(self, cost):
+        """
+        Отклонение стоимости маршрута от известного оптимума в процентах.
+
+        :param cost: Стоимость маршрута.
+        :return: Отклонение в процентах или None, если оптимум неизвестен.
+        """
+        if not self.optimum:
+            return None
+        return (cost - self.optimum) / self.optimum * 100
+
+
+def load_tsplib(path, optimum=None):
+    """
+    Загружает экземпляр в формате TSPLIB (TYPE: TSP). Поддерживаются типы
+    расстояний EUC_2D, CEIL_2D, ATT, GEO и EXPLICIT (FULL_MATRIX, UPPER_ROW,
+    LOWER_ROW, UPPER_DIAG_ROW, LOWER_DIAG_ROW).
+
+    :param path: Путь к файлу .tsp.
+    :param optimum: Известный оптимум; по умолчанию берется из KNOWN_OPTIMA по имени.
+    :return: Объект TSPInstance.
+    """
+    header = {}
+    coords = []
+    explicit = []
+    section = None
+    with open(path) as file:
+        for line in file:
+            line = line.strip()
+            if not line or line == 'EOF':
+                continue
+            if line.endswith('_SECTION'):
+                section = line
+                continue
+            if ':' in line:  # Строка заголовка KEY : VALUE
+                key, value = line.split(':', 1)
+                header[key.strip()] = value.strip()
+                section = None
+                continue
+            if section == 'NODE_COORD_SECTION':
+                _, x, y = line.split()[:3]
+                coords.append((float(x), float(y)))
+            elif section == 'EDGE_WEIGHT_SECTION':
+                explicit.extend(float(value) for value in line.split())
+
+    name = header.get('NAME', path)
+    dimension = int(header['DIMENSION'])
+    weight_type = header.get('EDGE_WEIGHT_TYPE', 'EUC_2D')
+    if weight_type == 'EXPLICIT':
+        weights = _explicit_matrix(explicit, dimension, header.get('EDGE_WEIGHT_FORMAT', 'FULL_MATRIX'))
+        coords = None
+    else:
+        coords = np.asarray(coords, dtype=np.float64)
+        weights = coordinate_distances(coords, weight_type)
+
+    np.fill_diagonal(weights, np.inf)  # Петли не являются ребрами маршрута
+    return TSPInstance(name, weights, coords, optimum if optimum is not None else KNOWN_OPTIMA.get(name))
+
+
+def random_euclidean(num_nodes, seed=0, size=1000.0):
+    """
+    Генерирует случайный евклидов экземпляр: точки равномерно в квадрате
+    size x size, расстояния округляются по правилу EUC_2D.
+
+    :param num_nodes: Количество узлов.
+    :param seed: Зерно генератора случайных чисел.
+    :param size: Сторона квадрата.
+    :return: Объект TSPInstance (оптимум неизвестен).
+    """
+    rng = np.random.default_rng(seed)
+    coords = rng.uniform(0, size, size=(num_nodes, 2))
+    weights = coordinate_distances(coords, 'EUC_2D')
+    np.fill_diagonal(weights, np.inf)
+    return TSPInstance(f'random{num_nodes}-{seed}', weights, coords)
+
+
+def coordinate_distances(coords, weight_type):
+    """
+    Вычисляет матрицу расстояний TSPLIB по координатам.
+
+    :param coords: Массив координат n x 2.
+    :param weight_type: Тип расстояния: EUC_2D, CEIL_2D, ATT или GEO.
+    :return: Матрица расстояний n x n.
+    """
+    if weight_type == 'GEO':
+        degrees = np.trunc(coords)
+        radians = GEO_PI * (degrees + 5.0 * (coords - degrees) / 3.0) / 180.0  # Градусы и минуты -> радианы
+        latitude, longitude = radians[:, 0], radians[:, 1]
+        q1 = np.cos(longitude[:, None] - longitude[None, :])
+        q2 = np.cos(latitude[:, None] - latitude[None, :])
+        q3 = np.cos(latitude[:, None] + latitude[None, :])
+        cosine = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+        return np.trunc(GEO_RADIUS * np.arccos(cosine) + 1.0)
+
+    delta = coords[:, None, :] - coords[None, :, :]
+    squared = (delta ** 2).sum(axis=2)
+    if weight_type == 'EUC_2D':
+        return np.floor(np.sqrt(squared) + 0.5)
+    if weight_type == 'CEIL_2D':
+        return np.ceil(np.sqrt(squared))
+    if weight_type == 'ATT':
+        r = np.sqrt(squared / 10.0)
+        t = np.floor(r + 0.5)
+        return np.where(t < r, t + 1, t)
+    raise ValueError(f"Неподдерживаемый тип расстояния: {weight_type}")
+
+
+def _explicit_matrix(values, dimension, weight_format):
+    """
+    Собирает матрицу расстояний из секции EDGE_WEIGHT_SECTION.
+
+    :param values: Список чисел из секции.
+    :param dimension: Количество узлов.
+    :param weight_format: Формат EDGE_WEIGHT_FORMAT.
+    :return: Матрица расстояний n x n.
+    """
+    if weight_format == 'FULL_MATRIX':
+        return np.asarray(values, dtype=np.float64).reshape(dimension, dimension)
+
+    weights = np.zeros((dimension, dimension))
+    upper = weight_format.startswith('UPPER')
+    diagonal = 'DIAG' in weight_format
+    values = iter(values)
+    for i in range(dimension):
+        columns = range(i if diagonal else i + 1, dimension) if upper else range(0, i + 1 if diagonal else i)
+        for j in columns:
+            weights[i, j] = weights[j, i] = next(values)
+    return weights
@@ -0,0 +1,82 @@
+import argparse
+import random
+import time
+
+from djikstra import (
+    Edge, Graph, Vertex, bidirectional_dijkstra, build_contraction_hierarchy, dijkstra, dijkstra_compiled,
+)
+
+
+def build_grid_graph(size, seed, keep=0.9):
+    """
+    Строит граф, похожий на дорожную сеть: решетка size x size, где каждое
+    направленное ребро между соседними клетками сохраняется с вероятностью keep.
+
+    Аргументы:
+        size (int): Сторона решетки.
+        seed (int): Зерно генератора случайных чисел.
+        keep (float): Доля сохраняемых ребер.
+
+    Возвращает:
+        tuple: (Graph, список вершин).
+    """
+    rng = random.Random(seed)
+    cells = {(i, j): Vertex((i, j)) for i in range(size) for j in range(size)}
+    adjacency_list = {vertex: [] for vertex in cells.values()}
+    for (i, j), vertex in cells.items():
+        for di, dj in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            neighbor = cells.get((i + di, j + dj))
+            if neighbor is not None and rng.random() < keep:
+                adjacency_list[vertex].append(Edge(rng.uniform(1, 2), neighbor))
+    return Graph(adjacency_list), list(cells.values())
+
+
+def time_queries(function, queries):
+    """
+    Выполняет запросы и возвращает (среднее время запроса в миллисекундах, результаты).
+    """
+    start = time.perf_counter()
+    results = [function(a, b) for a, b in queries]
+    return (time.perf_counter() - start) / len(queries) * 1000, results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Сравнение Contraction Hierarchies с алгоритмом Дейкстры")
+    parser.add_argument("--size", type=int, default=60, help="Сторона решетки (вершин: size * size)")
+    parser.add_argument("--queries", type=int, default=200, help="Количество запросов")
+    parser.add_argument("--witness-limit", type=int, default=64, help="Предел поиска обходных путей")
+    parser.add_argument("--seed", type=int, default=0, help="Зерно генератора случайных чисел")
+    args = parser.parse_args()
+
+    graph, vertices = build_grid_graph(args.size, args.seed)
+    compiled = graph.compile()
+    edges = len(compiled.indices)
+    print(f"Граф: {len(vertices)} вершин, {edges} ребер")
+
+    start = time.perf_counter()
+    hierarchy = build_contraction_hierarchy(compiled, witness_limit=args.witness_limit)
+    preprocessing = time.perf_counter() - start
+    graph_bytes = compiled.indptr.nbytes + compiled.indices.nbytes + compiled.weights.nbytes
+    print(f"Предобработка: {preprocessing:.2f} с, сокращений: {hierarchy.shortcuts}, "
+          f"индекс: {hierarchy.nbytes / 2 ** 20:.2f} МБ (граф CSR: {graph_bytes / 2 ** 20:.2f} МБ)")
+
+    rng = random.Random(args.seed + 1)
+    queries = [(rng.choice(vertices), rng.choice(vertices)) for _ in range(args.queries)]
+    engines = [
+        ('dijkstra', lambda a, b: dijkstra(graph, a, b)),
+        ('dijkstra_compiled', lambda a, b: dijkstra_compiled(compiled, a, b)),
+        ('bidirectional_dijkstra', lambda a, b: bidirectional_dijkstra(compiled, a, b)),
+        ('ContractionHierarchy.query', hierarchy.query),
+    ]
+
+    reference = None
+    print(f"{'алгоритм':>28} {'мс/запрос':>10} {'ошибок':>7}")
+    for name, function in engines:
+        latency, results = time_queries(function, queries)
+        if reference is None:
+            reference = results
+        wrong = sum(
+            (r is None) != (e is None) or (r is not None and abs(r[0] - e[0]) > 1e-9)
+            for r, e in zip(results, reference)
+        )  # Запросы с расстоянием, отличным от dijkstra
+        print(f"{name:>28} {latency:>10.3f} {wrong:>7}")
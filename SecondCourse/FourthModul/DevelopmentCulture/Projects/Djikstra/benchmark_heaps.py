@@ -0,0 +1,125 @@
+import argparse
+import random
+import time
+from heapq import heappop
+
+from djikstra import Edge, Graph, IndexedHeap, PriorityQueue, Vertex, dijkstra
+
+
+class LegacyPriorityQueue(PriorityQueue):
+    """
+    Прежняя реализация для сравнения: приоритет меняется на месте без
+    восстановления кучи, поэтому вершины могут извлекаться в неверном порядке.
+    """
+    def __len__(self):
+        return len(self.pq)
+
+    def update_priority(self, priority, task):
+        entry = self.entry_finder[task]
+        entry[0], entry[1] = priority, next(self.counter)
+
+    def pop_task(self):
+        while self.pq:
+            priority, count, task = heappop(self.pq)
+            del self.entry_finder[task]
+            return priority, task
+        raise KeyError('pop from an empty priority queue')
+
+
+def build_random_graph(num_vertices, num_edges, seed):
+    """
+    Строит случайный ориентированный граф: кольцо для связности и случайные ребра.
+
+    Аргументы:
+        num_vertices (int): Количество вершин.
+        num_edges (int): Количество ребер (не меньше num_vertices).
+        seed (int): Зерно генератора случайных чисел.
+
+    Возвращает:
+        tuple: (Graph, список вершин).
+    """
+    rng = random.Random(seed)
+    vertices = [Vertex(i) for i in range(num_vertices)]
+    adjacency_list = {vertex: [] for vertex in vertices}
+    for i, vertex in enumerate(vertices):
+        adjacency_list[vertex].append(Edge(rng.uniform(1, 10), vertices[(i + 1) % num_vertices]))
+    for _ in range(num_edges - num_vertices):
+        a, b = rng.randrange(num_vertices), rng.randrange(num_vertices)
+        adjacency_list[vertices[a]].append(Edge(rng.uniform(1, 10), vertices[b]))
+    return Graph(adjacency_list), vertices
+
+
+def count_operations(queue_class, **kwargs):
+    """
+    Создает подкласс очереди, который считает добавления и извлечения.
+
+    Аргументы:
+        queue_class (type): Класс очереди.
+        kwargs: Параметры конструктора очереди.
+
+    Возвращает:
+        tuple: (подкласс, словарь счетчиков).
+    """
+    counts = {'add': 0, 'pop': 0}
+
+    class Counted(queue_class):
+        def __init__(self):
+            super().__init__(**kwargs)
+
+        def add_task(self, priority, task):
+            counts['add'] += 1
+            return super().add_task(priority, task)
+
+        def pop_task(self):
+            counts['pop'] += 1
+            return super().pop_task()
+
+    return Counted, counts
+
+
+def benchmark(graph, queries, queue_class, **kwargs):
+    """
+    Выполняет запросы с заданной очередью.
+
+    Возвращает:
+        tuple: (время в секундах, результаты, счетчики операций).
+    """
+    counted, counts = count_operations(queue_class, **kwargs)
+    start = time.perf_counter()
+    results = [dijkstra(graph, a, b, queue_class=counted) for a, b in queries]
+    return time.perf_counter() - start, results, counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Сравнение очередей с приоритетом в алгоритме Дейкстры")
+    parser.add_argument("--vertices", type=int, default=100_000, help="Количество вершин")
+    parser.add_argument("--edges", type=int, default=1_000_000, help="Количество ребер")
+    parser.add_argument("--queries", type=int, default=5, help="Количество запросов")
+    parser.add_argument("--seed", type=int, default=0, help="Зерно генератора случайных чисел")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    graph, vertices = build_random_graph(args.vertices, args.edges, args.seed)
+    print(f"Граф: {args.vertices} вершин, {args.edges} ребер, построен за {time.perf_counter() - start:.2f} с")
+
+    rng = random.Random(args.seed + 1)
+    queries = [(rng.choice(vertices), rng.choice(vertices)) for _ in range(args.queries)]
+    queues = [
+        ('PriorityQueue (lazy deletion)', PriorityQueue, {}),
+        ('IndexedHeap d=2', IndexedHeap, {'d': 2}),
+        ('IndexedHeap d=4', IndexedHeap, {'d': 4}),
+        ('IndexedHeap d=8', IndexedHeap, {'d': 8}),
+        ('legacy (in-place update)', LegacyPriorityQueue, {}),
+    ]
+
+    reference = None
+    print(f"{'очередь':>30} {'с/запрос':>10} {'add':>10} {'pop':>10} {'ошибок':>7}")
+    for name, queue_class, kwargs in queues:
+        elapsed, results, counts = benchmark(graph, queries, queue_class, **kwargs)
+        if reference is None:
+            reference = results  # Эталон — первая исправленная очередь
+        wrong = sum(
+            (r is None) != (e is None) or (r is not None and abs(r[0] - e[0]) > 1e-9)
+            for r, e in zip(results, reference)
+        )  # Запросы с расстоянием, отличным от эталона
+        print(f"{name:>30} {elapsed / len(queries):>10.3f} {counts['add']:>10} {counts['pop']:>10} {wrong:>7}")
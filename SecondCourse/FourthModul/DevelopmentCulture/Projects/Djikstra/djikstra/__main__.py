@@ -0,0 +1,178 @@
+"""
+Командная строка: python -m djikstra ГРАФ < запросы
+
+Граф читается из списка ребер («начало конец [вес]»), CSV или двоичного файла
+save_binary (он отображается в память и открывается сразу). Запросы —
+строки «начало конец» (через табуляцию, если метки содержат пробелы). Они
+обрабатываются пакетами: запросы пакета с общей стартовой вершиной отвечаются
+одним деревом кратчайших путей, а ответы пакета выводятся сразу, поэтому через
+программу можно пропускать файлы запросов любого размера. Строка ответа:
+«начало<TAB>конец<TAB>расстояние<TAB>путь»; для недостижимой вершины
+расстояние равно inf, а путь пуст. Строки запросов, в которых не две метки,
+пропускаются с сообщением в stderr, а код завершения в этом случае равен 1.
+Если получатель вывода закрыл канал (например, head), программа молча
+завершается с кодом 1.
+"""
+import argparse
+import itertools
+import os
+import sys
+
+from djikstra.batch import solve_groups
+from djikstra.binary import is_binary_graph, load_binary, save_binary
+from djikstra.loaders import read_csv, read_edge_list
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m djikstra",
+                                     description="Кратчайшие пути по графу из файла для запросов из stdin")
+    parser.add_argument("graph", help="Файл графа")
+    parser.add_argument("--format", choices=("auto", "edges", "csv", "binary"), default="auto",
+                        help="Формат файла (auto — двоичный по сигнатуре, иначе по расширению: .csv или список ребер)")
+    parser.add_argument("--undirected", action="store_true", help="Добавить обратное ребро для каждого ребра")
+    parser.add_argument("--batch-size", type=int, default=1024, help="Количество запросов в пакете")
+    parser.add_argument("--distance-only", action="store_true", help="Не выводить путь")
+    parser.add_argument("--save", metavar="PATH", help="Сохранить граф в двоичном формате и завершить работу")
+    return parser
+
+
+def load_graph(path, file_format="auto", directed=True):
+    """
+    Загружает граф из файла.
+
+    Аргументы:
+        path (str): Путь к файлу.
+        file_format (str): "edges", "csv", "binary" или "auto" (двоичный по сигнатуре,
+            иначе по расширению).
+        directed (bool): Если False, для каждого ребра добавляется обратное
+            (для двоичного файла не применяется: он хранит уже готовые ребра).
+
+    Возвращает:
+        tuple: (Graph, словарь метка -> Vertex) или (MappedGraph, None) для двоичного файла.
+    """
+    if file_format == "auto":
+        if is_binary_graph(path):
+            file_format = "binary"
+        else:
+            file_format = "csv" if path.lower().endswith(".csv") else "edges"
+    if file_format == "binary":
+        return load_binary(path), None
+    if file_format == "csv":
+        return read_csv(path, directed=directed)
+    return read_edge_list(path, directed=directed)
+
+
+def read_queries(lines, on_error=None):
+    """
+    Возвращает пары меток (начало, конец) из строк запросов, пропуская пустые строки и комментарии.
+
+    Аргументы:
+        lines (iterable): Строки запросов.
+        on_error (callable): Функция (номер строки, сообщение), которая вызывается для
+            строки, где не две метки; такая строка пропускается. Если не задана,
+            выбрасывается ValueError.
+
+    Исключения:
+        ValueError: Если в строке не две метки, а on_error не задана.
+    """
+    for line_number, line in enumerate(lines, 1):
+        line = line.rstrip("\r\n")
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        fields = line.split("\t") if "\t" in line else line.split()
+        if len(fields) != 2:
+            message = f"запрос {line_number}: ожидается «начало конец», получено {line!r}"
+            if on_error is None:
+                raise ValueError(message)
+            on_error(line_number, message)
+            continue
+        yield fields[0], fields[1]
+
+
+def answer_batch(graph, vertices, batch):
+    """
+    Отвечает на пакет запросов по меткам вершин.
+
+    Возвращает:
+        list: Результаты в порядке запросов, как у dijkstra (None — путь не найден
+        или вершины нет в графе).
+    """
+    groups = {}
+    results = [None] * len(batch)
+    for position, (start, end) in enumerate(batch):
+        if start == end and start in vertices:
+            results[position] = (0, [start])
+        elif start in vertices and end in vertices:
+            groups.setdefault(vertices[start], []).append((position, vertices[end]))
+    for position, result in solve_groups(graph, list(groups.items())):
+        results[position] = result
+    return results
+
+
+def format_result(start, end, result, distance_only=False):
+    """
+    Форматирует строку ответа.
+    """
+    if result is None:
+        return f"{start}\t{end}\tinf" + ("" if distance_only else "\t")
+    distance, path = result
+    if distance_only:
+        return f"{start}\t{end}\t{distance:.10g}"
+    return f"{start}\t{end}\t{distance:.10g}\t{' '.join(map(str, path))}"
+
+
+def main(argv=None, stdin=None, stdout=None, stderr=None):
+    """
+    Точка входа командной строки.
+
+    Возвращает:
+        int: Код завершения: 0, или 1, если были пропущены некорректные строки запросов
+            либо получатель вывода закрыл канал.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    try:
+        graph, vertices = load_graph(args.graph, args.format, directed=not args.undirected)
+    except (OSError, ValueError) as error:  # Нет файла или ошибка формата: сообщение без трассировки
+        parser.exit(1, f"{parser.prog}: {error}\n")
+    if args.save:
+        if vertices is None:
+            parser.exit(1, f"{parser.prog}: {args.graph}: граф уже в двоичном формате\n")
+        save_binary(graph, args.save)
+        return 0
+    if vertices is None:
+        answer = graph.query_many
+    else:
+        def answer(batch):
+            return answer_batch(graph, vertices, batch)
+
+    skipped = []
+
+    def report(line_number, message):
+        skipped.append(line_number)
+        stderr.write(f"{parser.prog}: {message}\n")
+
+    queries = read_queries(stdin, on_error=report)
+    try:
+        while True:
+            batch = list(itertools.islice(queries, args.batch_size))
+            if not batch:
+                break
+            for (start, end), result in zip(batch, answer(batch)):
+                stdout.write(format_result(start, end, result, args.distance_only) + "\n")
+            stdout.flush()
+    except BrokenPipeError:  # Вывод передан в программу, которая закрыла канал (например, head)
+        # При выходе Python еще раз сбросит буфер stdout: направляем его дескриптор в devnull,
+        # чтобы не было второй ошибки, а stderr остается рабочим
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, stdout.fileno())
+        os.close(devnull)
+        return 1
+    return 1 if skipped else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+import math
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from djikstra.compiled import CompiledGraph
+from djikstra.heaps import IndexedHeap
+
+EARTH_RADIUS_KM = 6371.0  # Средний радиус Земли в километрах
+
+
+class CoordinateHeuristic(ABC):
+    """
+    Базовый класс эвристик по координатам вершин. Эвристика вызывается как
+    heuristic(compiled, target) и возвращает функцию номер вершины -> нижняя
+    оценка расстояния до target, поэтому astar вычисляет оценки только для
+    достигнутых вершин. Координаты раскладываются по номерам вершин
+    скомпилированного графа один раз на граф.
+
+    Атрибуты:
+        coordinates (dict): Вершина -> пара координат.
+        scale (float): Множитель, переводящий геометрическое расстояние в единицы весов ребер.
+    """
+    def __init__(self, coordinates, scale=1.0):
+        self.coordinates = coordinates
+        self.scale = scale
+        self.compiled = None
+        self.points = None
+
+    def __call__(self, compiled, target):
+        """
+        Возвращает функцию оценки расстояния до target.
+
+        Аргументы:
+            compiled (CompiledGraph): Скомпилированный граф.
+            target (int): Номер конечной вершины.
+
+        Возвращает:
+            callable: Номер вершины -> нижняя оценка расстояния до target (0 для вершин без координат).
+        """
+        if self.compiled is not compiled:
+            self.points = [None] * len(compiled)
+            for vertex, point in self.coordinates.items():
+                if vertex in compiled.index:
+                    self.points[compiled.index[vertex]] = tuple(point)
+            self.compiled = compiled
+        points, goal, scale, distance = self.points, self.points[target], self.scale, self.distance
+
+        def estimate(vertex):
+            point = points[vertex]
+            if point is None or goal is None:
+                return 0.0
+            return distance(point, goal) * scale
+        return estimate
+
+    @abstractmethod
+    def distance(self, point, target):
+        """
+        Геометрическое расстояние между точками point и target.
+        """
+
+
+class EuclideanHeuristic(CoordinateHeuristic):
+    """
+    Евклидово расстояние по координатам (x, y). Допустима, если вес каждого ребра
+    не меньше scale * длины отрезка между его концами.
+    """
+    def distance(self, point, target):
+        return math.hypot(point[0] - target[0], point[1] - target[1])
+
+
+class HaversineHeuristic(CoordinateHeuristic):
+    """
+    Расстояние по дуге большого круга (формула гаверсинусов) по координатам
+    (широта, долгота) в градусах, в километрах. Допустима, если веса ребер —
+    длины дорог в километрах (или scale переводит километры в их единицы).
+    """
+    def __init__(self, coordinates, scale=1.0, radius=EARTH_RADIUS_KM):
+        super().__init__(coordinates, scale)
+        self.radius = radius
+
+    def distance(self, point, target):
+        lat, lon = math.radians(point[0]), math.radians(point[1])
+        target_lat, target_lon = math.radians(target[0]), math.radians(target[1])
+        a = math.sin((lat - target_lat) / 2) ** 2 + math.cos(lat) * math.cos(target_lat) * math.sin((lon - target_lon) / 2) ** 2
+        return 2 * self.radius * math.asin(math.sqrt(min(a, 1.0)))
+
+
+def euclidean_heuristic(coordinates, scale=1.0):
+    """
+    Создает евклидову эвристику.
+
+    Аргументы:
+        coordinates (dict): Вершина -> (x, y).
+        scale (float): Множитель для перевода расстояния в единицы весов ребер.
+
+    Возвращает:
+        EuclideanHeuristic: Эвристика для astar.
+    """
+    return EuclideanHeuristic(coordinates, scale)
+
+
+def haversine_heuristic(coordinates, scale=1.0, radius=EARTH_RADIUS_KM):
+    """
+    Создает эвристику по расстоянию на сфере.
+
+    Аргументы:
+        coordinates (dict): Вершина -> (широта, долгота) в градусах.
+        scale (float): Множитель для перевода километров в единицы весов ребер.
+        radius (float): Радиус сферы в километрах.
+
+    Возвращает:
+        HaversineHeuristic: Эвристика для astar.
+    """
+    return HaversineHeuristic(coordinates, scale, radius)
+
+
+def astar(graph, start, end, heuristic):
+    """
+    Алгоритм A*: вершины извлекаются из IndexedHeap в порядке g + h, где g —
+    известное расстояние от start, а h — нижняя оценка расстояния до end. С
+    допустимой эвристикой результат совпадает с dijkstra, а обрабатывается меньше
+    вершин. Вершина может быть обработана повторно, если к ней найден более
+    короткий путь, поэтому достаточно допустимости эвристики (согласованность не требуется).
+
+    Аргументы:
+        graph (CompiledGraph): Скомпилированный граф (Graph компилируется при каждом вызове).
+        start (Vertex): Стартовая вершина.
+        end (Vertex): Конечная вершина.
+        heuristic (callable): Функция (compiled, номер end) -> функция номер вершины ->
+            нижняя оценка расстояния до end, которая вызывается только для достигнутых
+            вершин (например, euclidean_heuristic(coordinates) или LandmarkIndex), либо
+            массив оценок для всех вершин.
+
+    Возвращает:
+        tuple: (расстояние, список значений вершин пути) или None, если путь не найден.
+    """
+    if start == end:
+        return 0, [start.value]
+    compiled = graph if isinstance(graph, CompiledGraph) else CompiledGraph.from_graph(graph)
+    if start not in compiled.index or end not in compiled.index:
+        return None
+
+    source, target = compiled.index[start], compiled.index[end]
+    estimate = heuristic(compiled, target)
+    if callable(estimate):
+        estimate = LazyEstimate(estimate)
+    else:
+        estimate = np.asarray(estimate, dtype=np.float64).tolist()
+    indptr, indices, weights = compiled.adjacency
+    dist = {source: 0.0}
+    prev = {source: -1}
+    queue = IndexedHeap()
+    queue.add_task(estimate[source], source)
+    while queue:
+        _, vertex = queue.pop_task()
+        distance = dist[vertex]
+        if vertex == target:
+            path = []
+            while vertex != -1:
+                path.append(compiled.vertices[vertex].value)
+                vertex = prev[vertex]
+            return distance, path[::-1]
+
+        for k in range(indptr[vertex], indptr[vertex + 1]):
+            neighbor = indices[k]
+            new_distance = distance + weights[k]
+            if new_distance < dist.get(neighbor, float("inf")):
+                dist[neighbor] = new_distance
+                prev[neighbor] = vertex
+                queue.add_task(new_distance + estimate[neighbor], neighbor)  # Уменьшение ключа или повторное добавление
+    return None
+
+
+class LazyEstimate(dict):
+    """
+    Кэш оценок эвристики, вычисляемых по одной вершине при первом обращении.
+    """
+    def __init__(self, function):
+        super().__init__()
+        self.function = function
+
+    def __missing__(self, vertex):
+        value = self[vertex] = self.function(vertex)
+        return value
@@ -0,0 +1,138 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heappush, heappop
+
+
+class ShortestPathTree:
+    """
+    Дерево кратчайших путей от одной стартовой вершины.
+
+    Атрибуты:
+        source (Vertex): Стартовая вершина.
+        distances (dict): Кратчайшие расстояния до обработанных вершин.
+        previous (dict): Предшественник каждой обработанной вершины в кратчайшем пути.
+        complete (bool): True, если дерево построено по всему графу, а не до набора целей.
+    """
+    def __init__(self, source, distances, previous, complete):
+        self.source = source
+        self.distances = distances
+        self.previous = previous
+        self.complete = complete
+
+    def query(self, target):
+        """
+        Возвращает кратчайший путь до вершины в том же виде, что и dijkstra.
+        Работает за O(длина пути).
+
+        Аргументы:
+            target (Vertex): Конечная вершина.
+
+        Возвращает:
+            tuple: (расстояние, список значений вершин пути) или None, если вершина недостижима.
+        """
+        if target not in self.distances:
+            return None
+        path = []
+        vertex = target
+        while vertex is not None:
+            path.append(vertex.value)
+            vertex = self.previous[vertex]
+        return self.distances[target], path[::-1]
+
+
+def shortest_path_tree(graph, source, targets=None):
+    """
+    Строит дерево кратчайших путей алгоритмом Дейкстры от одной вершины.
+
+    Аргументы:
+        graph (Graph): Граф, представленный списком смежности из вершин и ребер.
+        source (Vertex): Стартовая вершина.
+        targets (iterable): Вершины, после обработки которых поиск можно остановить.
+            Если не задан, дерево строится по всему графу.
+
+    Возвращает:
+        ShortestPathTree: Дерево с расстояниями только до окончательно обработанных вершин.
+    """
+    remaining = None if targets is None else set(targets)
+    distances = {}
+    previous = {source: None}
+    best = {source: 0}
+    counter = itertools.count()
+    heap = [(0, next(counter), source)]
+    while heap:
+        distance, _, vertex = heappop(heap)
+        if vertex in distances:
+            continue
+        distances[vertex] = distance
+
+        if remaining is not None:
+            remaining.discard(vertex)
+            if not remaining:
+                break
+
+        for edge in graph.adjacency_list.get(vertex, ()):
+            neighbor = edge.vertex
+            if neighbor in distances:
+                continue
+            new_distance = distance + edge.distance
+            if new_distance < best.get(neighbor, float("inf")):
+                best[neighbor] = new_distance
+                previous[neighbor] = vertex
+                heappush(heap, (new_distance, next(counter), neighbor))
+
+    return ShortestPathTree(source, distances, previous, complete=not heap or remaining is None)
+
+
+def dijkstra_many(graph, pairs, workers=None):
+    """
+    Отвечает на набор запросов (start, end). Запросы группируются по стартовой
+    вершине, и для каждой группы строится одно дерево кратчайших путей, которое
+    останавливается, как только обработаны все цели группы.
+
+    Аргументы:
+        graph (Graph): Граф, представленный списком смежности из вершин и ребер.
+        pairs (iterable): Пары (start, end) вершин.
+        workers (int): Количество процессов, между которыми распределяются группы.
+            Если не задан, запросы обрабатываются в текущем процессе.
+
+    Возвращает:
+        list: Результаты в порядке запросов, каждый в том же виде, что и у dijkstra.
+    """
+    pairs = list(pairs)
+    groups = {}
+    for position, (start, end) in enumerate(pairs):
+        groups.setdefault(start, []).append((position, end))
+    groups = list(groups.items())
+
+    results = [None] * len(pairs)
+    if workers and len(groups) > 1:
+        chunk_size = -(-len(groups) // workers)
+        chunks = [groups[i:i + chunk_size] for i in range(0, len(groups), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Граф и группы сериализуются вместе, поэтому вершины в задании остаются теми же объектами
+            answers = itertools.chain.from_iterable(executor.map(solve_groups, itertools.repeat(graph), chunks))
+            for position, result in answers:
+                results[position] = result
+    else:
+        for position, result in solve_groups(graph, groups):
+            results[position] = result
+    return results
+
+
+def solve_groups(graph, groups):
+    """
+    Отвечает на запросы нескольких групп с общей стартовой вершиной.
+
+    Аргументы:
+        graph (Graph): Граф.
+        groups (list): Пары (start, [(номер запроса, end), ...]).
+
+    Возвращает:
+        list: Пары (номер запроса, результат).
+    """
+    answers = []
+    for start, queries in groups:
+        tree = shortest_path_tree(graph, start, targets=[end for _, end in queries])
+        for position, end in queries:
+            answers.append((position, tree.query(end)))
+    return answers
@@ -0,0 +1,76 @@
+from heapq import heappush, heappop
+
+from djikstra.compiled import CompiledGraph
+
+
+def bidirectional_dijkstra(graph, start, end):
+    """
+    Двунаправленный алгоритм Дейкстры: прямой поиск растет от start, обратный —
+    от end по обращенным ребрам. На каждом шаге расширяется фронт с меньшим
+    минимальным расстоянием. Лучшая найденная длина пути mu обновляется, когда
+    ребро ведет в вершину, уже достигнутую другим поиском; поиск завершается,
+    как только сумма минимумов обоих фронтов не меньше mu — более короткого пути
+    не существует. Расстояния хранятся в словарях, поэтому запрос затрагивает
+    только посещенные вершины.
+
+    Аргументы:
+        graph (CompiledGraph): Скомпилированный граф (Graph компилируется при каждом вызове).
+        start (Vertex): Стартовая вершина.
+        end (Vertex): Конечная вершина.
+
+    Возвращает:
+        tuple: (расстояние, список значений вершин пути) или None, если путь не найден —
+        то же, что и dijkstra.
+    """
+    if start == end:
+        return 0, [start.value]
+    compiled = graph if isinstance(graph, CompiledGraph) else CompiledGraph.from_graph(graph)
+    if start not in compiled.index or end not in compiled.index:
+        return None
+
+    source, target = compiled.index[start], compiled.index[end]
+    searches = (
+        (compiled.adjacency, {source: 0.0}, {source: -1}, [(0.0, source)], set()),
+        (compiled.reverse().adjacency, {target: 0.0}, {target: -1}, [(0.0, target)], set()),
+    )  # Прямой и обратный поиск: (списки CSR, расстояния, предшественники, куча, обработанные вершины)
+    best, meeting = float("inf"), -1
+    forward_heap, backward_heap = searches[0][3], searches[1][3]
+
+    while forward_heap and backward_heap:
+        if forward_heap[0][0] + backward_heap[0][0] >= best:
+            break
+        side = 0 if forward_heap[0][0] <= backward_heap[0][0] else 1
+        (indptr, indices, weights), dist, prev, heap, settled = searches[side]
+        other_dist = searches[1 - side][1]
+
+        distance, vertex = heappop(heap)
+        if vertex in settled:
+            continue
+        settled.add(vertex)
+
+        for k in range(indptr[vertex], indptr[vertex + 1]):
+            neighbor = indices[k]
+            new_distance = distance + weights[k]
+            if new_distance < dist.get(neighbor, float("inf")):
+                dist[neighbor] = new_distance
+                prev[neighbor] = vertex
+                heappush(heap, (new_distance, neighbor))
+            if neighbor in other_dist and dist[neighbor] + other_dist[neighbor] < best:
+                best = dist[neighbor] + other_dist[neighbor]
+                meeting = neighbor
+
+    if meeting == -1:
+        return None
+
+    forward_prev, backward_prev = searches[0][2], searches[1][2]
+    path = []
+    vertex = meeting
+    while vertex != -1:
+        path.append(compiled.vertices[vertex].value)
+        vertex = forward_prev[vertex]
+    path.reverse()
+    vertex = backward_prev[meeting]
+    while vertex != -1:
+        path.append(compiled.vertices[vertex].value)
+        vertex = backward_prev[vertex]
+    return best, path
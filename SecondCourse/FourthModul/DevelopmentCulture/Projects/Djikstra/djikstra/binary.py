@@ -0,0 +1,301 @@
+import itertools
+import os
+import struct
+import sys
+from heapq import heappush, heappop
+
+import numpy as np
+
+from djikstra.compiled import CompiledGraph
+
+MAGIC = b"DJKGRAPH"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sIIQQQ")  # Сигнатура, версия, резерв, число вершин, число ребер, байт в метках
+HEADER_SIZE = 64
+
+
+def _layout(n, m, label_bytes):
+    """
+    Возвращает смещения и размеры разделов файла: (имя, смещение, dtype, длина).
+    Все разделы с 8-байтовыми элементами выровнены по 8 байтам.
+    """
+    sections = []
+    offset = HEADER_SIZE
+    for name, dtype, count in (
+        ("indptr", np.int64, n + 1),
+        ("indices", np.int64, m),
+        ("weights", np.float64, m),
+        ("label_offsets", np.int64, n + 1),
+        ("label_order", np.int64, n),
+        ("label_data", np.uint8, label_bytes),
+    ):
+        sections.append((name, offset, dtype, count))
+        offset += np.dtype(dtype).itemsize * count
+    return sections, offset
+
+
+def save_binary(graph, path):
+    """
+    Сохраняет граф в двоичном формате, который открывается load_binary без
+    разбора. Файл (little-endian):
+
+    - заголовок 64 байта: сигнатура DJKGRAPH, версия формата, число вершин n,
+      число ребер m и размер таблицы меток;
+    - indptr (int64, n + 1), indices (int64, m), weights (float64, m) — CSR;
+    - label_offsets (int64, n + 1) и label_data (UTF-8) — метки вершин str(vertex.value);
+    - label_order (int64, n) — номера вершин, упорядоченные по байтам меток,
+      для поиска вершины по метке двоичным поиском без построения словаря.
+
+    Файл записывается во временный и затем атомарно заменяет path.
+
+    Аргументы:
+        graph (Graph | CompiledGraph): Граф.
+        path (str): Путь к файлу.
+
+    Исключения:
+        ValueError: Если метки вершин не уникальны.
+    """
+    compiled = graph if isinstance(graph, CompiledGraph) else CompiledGraph.from_graph(graph)
+    labels = [str(vertex.value).encode("utf-8") for vertex in compiled.vertices]
+    order = sorted(range(len(labels)), key=labels.__getitem__)
+    for a, b in zip(order, order[1:]):
+        if labels[a] == labels[b]:
+            raise ValueError(f"Метка вершины {labels[a].decode('utf-8')!r} встречается несколько раз")
+    label_offsets = np.zeros(len(labels) + 1, dtype=np.int64)
+    np.cumsum([len(label) for label in labels], out=label_offsets[1:])
+
+    arrays = {
+        "indptr": compiled.indptr,
+        "indices": compiled.indices,
+        "weights": compiled.weights,
+        "label_offsets": label_offsets,
+        "label_order": np.array(order, dtype=np.int64),
+        "label_data": np.frombuffer(b"".join(labels), dtype=np.uint8),
+    }
+    n, m, label_bytes = len(labels), len(compiled.indices), int(label_offsets[-1])
+    sections, _ = _layout(n, m, label_bytes)
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, n, m, label_bytes).ljust(HEADER_SIZE, b"\0"))
+        for name, offset, dtype, count in sections:
+            file.write(b"\0" * (offset - file.tell()))
+            file.write(np.ascontiguousarray(arrays[name], dtype=np.dtype(dtype).newbyteorder("<")).tobytes())
+    os.replace(temporary, path)
+
+
+def is_binary_graph(path):
+    """
+    Проверяет, начинается ли файл с сигнатуры двоичного формата.
+    """
+    with open(path, "rb") as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def load_binary(path):
+    """
+    Открывает граф, сохраненный save_binary, через np.memmap: данные не читаются
+    целиком, а подгружаются страницами по мере обращения, поэтому граф любого
+    размера открывается за миллисекунды, а несколько процессов, открывших один
+    файл, делят его страницы в кэше ОС.
+
+    Аргументы:
+        path (str): Путь к файлу.
+
+    Возвращает:
+        MappedGraph: Граф только для чтения.
+
+    Исключения:
+        ValueError: Если файл не в двоичном формате графа или поврежден.
+    """
+    return MappedGraph(path)
+
+
+class MappedGraph:
+    """
+    Граф в формате CSR, отображенный в память из файла save_binary. Вершины
+    задаются номерами или строковыми метками; объекты Vertex и Edge не создаются.
+    При передаче в другой процесс (pickle) файл открывается заново, а не копируется.
+
+    Атрибуты:
+        filename (str): Путь к файлу.
+        indptr (numpy.ndarray): Начала списков ребер вершин.
+        indices (numpy.ndarray): Номера конечных вершин ребер.
+        weights (numpy.ndarray): Веса ребер.
+        label_offsets (numpy.ndarray): Границы меток в label_data.
+        label_order (numpy.ndarray): Номера вершин в порядке возрастания меток.
+        label_data (numpy.ndarray): Байты меток (UTF-8).
+        adjacency (tuple): indptr, indices и weights в виде memoryview того же отображения:
+            поэлементный доступ к ним в цикле поиска в разы быстрее, чем к numpy.
+        labels (tuple): label_offsets и label_data в виде memoryview.
+    """
+    def __init__(self, path):
+        self.filename = os.fspath(path)
+        data = np.memmap(self.filename, dtype=np.uint8, mode="r")
+        if len(data) < HEADER_SIZE:
+            raise ValueError(f"{self.filename}: файл слишком мал для двоичного графа")
+        magic, version, _, n, m, label_bytes = HEADER.unpack_from(data[:HEADER.size].tobytes())
+        if magic != MAGIC:
+            raise ValueError(f"{self.filename}: неизвестная сигнатура файла")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{self.filename}: неподдерживаемая версия формата {version}")
+        sections, size = _layout(n, m, label_bytes)
+        if len(data) < size:
+            raise ValueError(f"{self.filename}: файл обрезан (ожидается {size} байт, найдено {len(data)})")
+        views = {}
+        for name, offset, dtype, count in sections:
+            end = offset + np.dtype(dtype).itemsize * count
+            setattr(self, name, data[offset:end].view(np.dtype(dtype).newbyteorder("<")))
+            if sys.byteorder == "little":
+                views[name] = memoryview(data)[offset:end].cast(np.dtype(dtype).char)
+            else:  # memoryview не умеет менять порядок байтов, остаются массивы numpy
+                views[name] = getattr(self, name)
+        self.adjacency = (views["indptr"], views["indices"], views["weights"])
+        self.labels = (views["label_offsets"], views["label_data"])
+
+    def __reduce__(self):
+        return MappedGraph, (self.filename,)
+
+    def __len__(self):
+        """
+        Возвращает количество вершин.
+        """
+        return len(self.label_order)
+
+    @property
+    def num_edges(self):
+        """
+        Количество ребер.
+        """
+        return len(self.indices)
+
+    def label(self, vertex):
+        """
+        Возвращает метку вершины по номеру.
+        """
+        return self._label_bytes(vertex).decode("utf-8")
+
+    def find(self, label):
+        """
+        Возвращает номер вершины по метке двоичным поиском по label_order.
+
+        Исключения:
+            KeyError: Если вершины с такой меткой нет.
+        """
+        key = str(label).encode("utf-8")
+        low, high = 0, len(self.label_order)
+        while low < high:
+            middle = (low + high) // 2
+            if self._label_bytes(int(self.label_order[middle])) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self.label_order):
+            vertex = int(self.label_order[low])
+            if self._label_bytes(vertex) == key:
+                return vertex
+        raise KeyError(label)
+
+    def __contains__(self, label):
+        try:
+            self.find(label)
+        except KeyError:
+            return False
+        return True
+
+    def _label_bytes(self, vertex):
+        offsets, data = self.labels
+        return data[offsets[vertex]:offsets[vertex + 1]].tobytes()
+
+    def search(self, source, targets=None):
+        """
+        Алгоритм Дейкстры по отображенным массивам. Расстояния хранятся в словаре,
+        поэтому память запроса пропорциональна числу обработанных вершин, а не
+        размеру графа.
+
+        Аргументы:
+            source (int): Номер стартовой вершины.
+            targets (iterable): Номера вершин, после обработки которых поиск можно
+                остановить. Если не задан, обрабатывается весь граф.
+
+        Возвращает:
+            tuple: (расстояния до обработанных вершин, словарь предшественников).
+        """
+        remaining = None if targets is None else set(targets)
+        indptr, indices, weights = self.adjacency
+        distances = {}
+        previous = {source: -1}
+        best = {source: 0.0}
+        counter = itertools.count()
+        heap = [(0.0, next(counter), source)]
+        while heap:
+            distance, _, vertex = heappop(heap)
+            if vertex in distances:
+                continue
+            distances[vertex] = distance
+            if remaining is not None:
+                remaining.discard(vertex)
+                if not remaining:
+                    break
+
+            begin, end = indptr[vertex], indptr[vertex + 1]
+            for neighbor, weight in zip(indices[begin:end].tolist(), weights[begin:end].tolist()):
+                if neighbor in distances:
+                    continue
+                new_distance = distance + weight
+                if new_distance < best.get(neighbor, float("inf")):
+                    best[neighbor] = new_distance
+                    previous[neighbor] = vertex
+                    heappush(heap, (new_distance, next(counter), neighbor))
+        return distances, previous
+
+    def path(self, previous, target):
+        """
+        Восстанавливает метки вершин пути до target по словарю предшественников.
+        """
+        path = []
+        vertex = target
+        while vertex != -1:
+            path.append(self.label(vertex))
+            vertex = previous[vertex]
+        return path[::-1]
+
+    def query(self, start, end):
+        """
+        Находит кратчайший путь между вершинами по меткам.
+
+        Возвращает:
+            tuple: (расстояние, список меток вершин пути) или None — то же, что и dijkstra.
+        """
+        return self.query_many([(start, end)])[0]
+
+    def query_many(self, pairs):
+        """
+        Отвечает на набор запросов (начало, конец) по меткам. Запросы с общей
+        стартовой вершиной отвечаются одним поиском, который останавливается,
+        как только обработаны все их цели.
+
+        Аргументы:
+            pairs (iterable): Пары меток.
+
+        Возвращает:
+            list: Результаты в порядке запросов, как у dijkstra (None — путь не
+            найден или вершины нет в графе).
+        """
+        pairs = list(pairs)
+        results = [None] * len(pairs)
+        groups = {}
+        for position, (start, end) in enumerate(pairs):
+            try:
+                source, target = self.find(start), self.find(end)
+            except KeyError:
+                continue
+            if source == target:
+                results[position] = (0, [self.label(source)])
+            else:
+                groups.setdefault(source, []).append((position, target))
+        for source, queries in groups.items():
+            distances, previous = self.search(source, [target for _, target in queries])
+            for position, target in queries:
+                if target in distances:
+                    results[position] = (distances[target], self.path(previous, target))
+        return results
@@ -0,0 +1,188 @@
+import threading
+from collections import OrderedDict
+
+from djikstra.batch import shortest_path_tree
+from djikstra.dynamic import DynamicShortestPathTree, incoming_edges, register_added_edges
+
+
+class QueryCache:
+    """
+    Ограниченный потокобезопасный LRU-кэш результатов dijkstra для одного графа.
+
+    Кэшируются ответы на пары (start, end) и полные деревья кратчайших путей
+    для «горячих» стартовых вершин: после tree_threshold промахов с одной
+    стартовой вершиной строится её дерево, и любой запрос от неё отвечается за
+    O(длина пути). Все записи сбрасываются, когда меняется graph.version, кроме
+    изменений весов через update_edges кэша: тогда деревья восстанавливаются на
+    месте (DynamicShortestPathTree.repair), а сбрасываются только ответы на пары.
+    Поиск выполняется без блокировки, поэтому запросы из разных потоков идут
+    параллельно; результат, посчитанный по устаревшей версии графа, не сохраняется.
+
+    Атрибуты:
+        graph (Graph): Граф.
+        maxsize (int): Максимальное число кэшированных пар.
+        max_trees (int): Максимальное число кэшированных деревьев.
+        tree_threshold (int): Число промахов от одной вершины, после которого строится её дерево.
+        hits (int): Количество ответов из кэша пар и деревьев.
+        misses (int): Количество запросов, потребовавших поиска.
+        evictions (int): Количество вытесненных записей.
+        invalidations (int): Количество сбросов кэша из-за изменения графа.
+        repairs (int): Количество пакетов изменений, после которых деревья были восстановлены.
+        incoming (dict): Общий для деревьев обратный индекс ребер (строится при первом дереве).
+    """
+    def __init__(self, graph, maxsize=4096, max_trees=64, tree_threshold=4):
+        self.graph = graph
+        self.maxsize = maxsize
+        self.max_trees = max_trees
+        self.tree_threshold = tree_threshold
+        self.pairs = OrderedDict()
+        self.trees = OrderedDict()
+        self.source_misses = {}
+        self.version = graph.version
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.repairs = 0
+        self.incoming = None
+
+    def __call__(self, start, end):
+        """
+        То же, что и query.
+        """
+        return self.query(start, end)
+
+    def query(self, start, end):
+        """
+        Возвращает кратчайший путь из кэша или вычисляет его.
+
+        Аргументы:
+            start (Vertex): Стартовая вершина.
+            end (Vertex): Конечная вершина.
+
+        Возвращает:
+            tuple: (расстояние, список значений вершин пути) или None — то же, что и dijkstra.
+        """
+        with self.lock:
+            self._check_version()
+            version = self.version
+            incoming = self.incoming
+            key = (start, end)
+            if key in self.pairs:
+                self.pairs.move_to_end(key)
+                self.hits += 1
+                return _copy(self.pairs[key])
+            tree = self.trees.get(start)
+            if tree is not None:
+                self.trees.move_to_end(start)
+                self.hits += 1
+                return tree.query(end)
+            self.misses += 1
+            misses = self.source_misses[start] = self.source_misses.get(start, 0) + 1
+            build_tree = misses >= self.tree_threshold
+            if build_tree:
+                del self.source_misses[start]
+            elif len(self.source_misses) > self.maxsize:  # Счётчики редких вершин не копятся бесконечно
+                self.source_misses.clear()
+
+        if build_tree:
+            if incoming is None:
+                incoming = incoming_edges(self.graph)
+            tree = DynamicShortestPathTree(self.graph, start, incoming)
+            result = tree.query(end)
+        else:
+            result = shortest_path_tree(self.graph, start, targets=[end]).query(end)
+
+        with self.lock:
+            if self.graph.version == version == self.version:
+                if build_tree:
+                    if self.incoming is None:
+                        self.incoming = incoming
+                    tree.incoming = self.incoming
+                    self._store(self.trees, start, tree, self.max_trees)
+                else:
+                    self._store(self.pairs, key, result, self.maxsize)
+        return _copy(result)
+
+    def stats(self):
+        """
+        Возвращает счётчики кэша.
+
+        Возвращает:
+            dict: hits, misses, evictions, invalidations, repairs, pairs, trees.
+        """
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'repairs': self.repairs,
+                'pairs': len(self.pairs),
+                'trees': len(self.trees),
+            }
+
+    def update_edges(self, updates):
+        """
+        Изменяет веса ребер графа (Graph.update_edges) и восстанавливает
+        кэшированные деревья, затрагивая только вершины, чьи расстояния могли
+        измениться. Ответы на пары сбрасываются.
+
+        Аргументы:
+            updates (iterable): Тройки (начальная вершина, конечная вершина, новый вес).
+
+        Возвращает:
+            list: Изменения, которые вернул Graph.update_edges.
+        """
+        with self.lock:
+            self._check_version()
+            changes = self.graph.update_edges(updates)
+            if changes:
+                if self.incoming is not None:
+                    register_added_edges(self.incoming, changes)
+                for tree in self.trees.values():
+                    tree.repair(changes, update_incoming=False)
+                self.pairs.clear()
+                self.version = self.graph.version
+                self.repairs += 1
+            return changes
+
+    def clear(self):
+        """
+        Удаляет все записи (счётчики сохраняются).
+        """
+        with self.lock:
+            self.pairs.clear()
+            self.trees.clear()
+            self.source_misses.clear()
+            self.incoming = None
+
+    def _check_version(self):
+        """
+        Сбрасывает записи, если граф изменился. Вызывается под блокировкой.
+        """
+        if self.graph.version != self.version:
+            self.pairs.clear()
+            self.trees.clear()
+            self.source_misses.clear()
+            self.incoming = None
+            self.version = self.graph.version
+            self.invalidations += 1
+
+    def _store(self, entries, key, value, limit):
+        """
+        Добавляет запись в LRU-словарь и вытесняет самые старые. Вызывается под блокировкой.
+        """
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > limit:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+
+def _copy(result):
+    """
+    Копирует список пути, чтобы вызывающий код не мог изменить кэшированный ответ.
+    """
+    return None if result is None else (result[0], list(result[1]))
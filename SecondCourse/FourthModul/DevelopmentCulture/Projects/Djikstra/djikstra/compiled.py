@@ -0,0 +1,163 @@
+from heapq import heappush, heappop
+
+import numpy as np
+
+
+class CompiledGraph:
+    """
+    Граф, скомпилированный в массивы CSR: вершины пронумерованы подряд, ребра
+    вершины i лежат в indices[indptr[i]:indptr[i + 1]], а их веса — в тех же
+    позициях массива weights.
+
+    Атрибуты:
+        vertices (list): Номер -> объект Vertex.
+        index (dict): Объект Vertex -> номер.
+        indptr (numpy.ndarray): Начала списков ребер вершин (int64, длина n + 1).
+        indices (numpy.ndarray): Номера конечных вершин ребер (int64).
+        weights (numpy.ndarray): Веса ребер (float64).
+        dist (numpy.ndarray): Буфер расстояний, переиспользуемый между запросами.
+        prev (numpy.ndarray): Буфер предшественников (-1 — нет предшественника).
+        reversed_graph (CompiledGraph): Кэш графа с обращенными ребрами (см. reverse).
+    """
+    def __init__(self, vertices, indptr, indices, weights):
+        self.vertices = vertices
+        self.index = {vertex: i for i, vertex in enumerate(vertices)}
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.dist = np.empty(len(vertices))
+        self.prev = np.empty(len(vertices), dtype=np.int64)
+        # Копии массивов в списках: поэлементный доступ к спискам в цикле релаксации быстрее, чем к numpy
+        self.adjacency = (indptr.tolist(), indices.tolist(), weights.tolist())
+        self.reversed_graph = None
+
+    def __len__(self):
+        """
+        Возвращает количество вершин.
+        """
+        return len(self.vertices)
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Компилирует Graph. Вершины нумеруются в порядке adjacency_list; вершины,
+        встречающиеся только как концы ребер, добавляются следом.
+
+        Аргументы:
+            graph (Graph): Граф со списками смежности.
+
+        Возвращает:
+            CompiledGraph: Скомпилированный граф.
+        """
+        vertices = list(graph.adjacency_list)
+        index = {vertex: i for i, vertex in enumerate(vertices)}
+        for edges in graph.adjacency_list.values():
+            for edge in edges:
+                if edge.vertex not in index:
+                    index[edge.vertex] = len(vertices)
+                    vertices.append(edge.vertex)
+
+        degrees = [len(graph.adjacency_list.get(vertex, ())) for vertex in vertices]
+        indptr = np.zeros(len(vertices) + 1, dtype=np.int64)
+        np.cumsum(degrees, out=indptr[1:])
+        edges = [edge for vertex in vertices for edge in graph.adjacency_list.get(vertex, ())]
+        indices = np.fromiter((index[edge.vertex] for edge in edges), dtype=np.int64, count=len(edges))
+        weights = np.fromiter((edge.distance for edge in edges), dtype=np.float64, count=len(edges))
+        return cls(vertices, indptr, indices, weights)
+
+    def reverse(self):
+        """
+        Возвращает граф с обращенными ребрами (для обратного поиска). Результат
+        вычисляется один раз и кэшируется.
+
+        Возвращает:
+            CompiledGraph: Граф с теми же номерами вершин и обращенными ребрами.
+        """
+        if self.reversed_graph is None:
+            sources = np.repeat(np.arange(len(self.vertices), dtype=np.int64), np.diff(self.indptr))
+            order = np.argsort(self.indices, kind='stable')
+            indptr = np.zeros(len(self.vertices) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.indices, minlength=len(self.vertices)), out=indptr[1:])
+            self.reversed_graph = CompiledGraph(self.vertices, indptr, sources[order], self.weights[order])
+            self.reversed_graph.reversed_graph = self
+        return self.reversed_graph
+
+    def search(self, source, target=-1):
+        """
+        Алгоритм Дейкстры по массивам CSR, результаты пишутся в буферы dist и prev.
+        Векторная релаксация всех ребер вершины не используется: при типичной
+        степени вершин накладные расходы numpy на короткие срезы больше выигрыша.
+
+        Аргументы:
+            source (int): Номер стартовой вершины.
+            target (int): Номер конечной вершины; -1 — построить дерево по всему графу.
+
+        Возвращает:
+            numpy.ndarray: Булева маска окончательно обработанных вершин.
+        """
+        indptr, indices, weights = self.adjacency
+        dist, prev = self.dist, self.prev
+        dist.fill(np.inf)
+        prev.fill(-1)
+        settled = bytearray(len(self.vertices))
+        dist[source] = 0.0
+        heap = [(0.0, source)]
+        while heap:
+            distance, vertex = heappop(heap)
+            if settled[vertex]:
+                continue
+            settled[vertex] = 1
+            if vertex == target:
+                break
+
+            for k in range(indptr[vertex], indptr[vertex + 1]):
+                neighbor = indices[k]
+                new_distance = distance + weights[k]
+                if new_distance < dist[neighbor]:
+                    dist[neighbor] = new_distance
+                    prev[neighbor] = vertex
+                    heappush(heap, (new_distance, neighbor))
+        return np.frombuffer(settled, dtype=bool)
+
+    def path(self, target):
+        """
+        Восстанавливает путь до вершины по буферу prev последнего поиска.
+
+        Аргументы:
+            target (int): Номер конечной вершины.
+
+        Возвращает:
+            list: Значения вершин пути от стартовой до конечной.
+        """
+        path = []
+        vertex = target
+        while vertex != -1:
+            path.append(self.vertices[vertex].value)
+            vertex = int(self.prev[vertex])
+        return path[::-1]
+
+
+def dijkstra_compiled(compiled, start, end):
+    """
+    Алгоритм Дейкстры по скомпилированному графу. Возвращает то же, что и dijkstra.
+    Буферы dist и prev общие для всех запросов к графу, поэтому один CompiledGraph
+    не следует опрашивать из нескольких потоков одновременно.
+
+    Аргументы:
+        compiled (CompiledGraph): Скомпилированный граф.
+        start (Vertex): Стартовая вершина.
+        end (Vertex): Конечная вершина.
+
+    Возвращает:
+        tuple: (расстояние, список значений вершин пути) или None, если путь не найден.
+    """
+    if start == end:
+        return 0, [start.value]
+    if start not in compiled.index or end not in compiled.index:
+        return None
+
+    target = compiled.index[end]
+    settled = compiled.search(compiled.index[start], target)
+    if not settled[target]:
+        return None
+    return float(compiled.dist[target]), compiled.path(target)
@@ -0,0 +1,310 @@
+from heapq import heappush, heappop
+
+import numpy as np
+
+from djikstra.compiled import CompiledGraph
+
+
+class ContractionHierarchy:
+    """
+    Иерархия сжатия (Contraction Hierarchies) ориентированного графа. Вершины
+    упорядочены по рангу; при сжатии вершины v для каждой пары соседей u -> v -> w,
+    у которой нет более короткого обходного пути, добавляется ребро-сокращение
+    u -> w. Запрос — двунаправленный поиск только по ребрам, ведущим к вершинам
+    с большим рангом, поэтому обрабатывается очень мало вершин.
+
+    Атрибуты:
+        compiled (CompiledGraph): Исходный скомпилированный граф (номера и значения вершин).
+        rank (numpy.ndarray): Порядковый номер сжатия каждой вершины.
+        upward (tuple): CSR (indptr, indices, weights, middles) ребер v -> w с rank[w] > rank[v].
+        downward (tuple): CSR (indptr, indices, weights, middles) ребер u -> v с rank[u] > rank[v],
+            сгруппированных по v. middles — сжатая вершина сокращения или -1 для исходного ребра.
+        shortcuts (int): Количество добавленных сокращений.
+    """
+    def __init__(self, compiled, rank, upward, downward, shortcuts):
+        self.compiled = compiled
+        self.rank = rank
+        self.upward = upward
+        self.downward = downward
+        self.shortcuts = shortcuts
+        # Копии в списках для цикла запроса (поэлементный доступ к спискам быстрее, чем к numpy)
+        self.upward_lists = tuple(array.tolist() for array in upward)
+        self.downward_lists = tuple(array.tolist() for array in downward)
+
+    @property
+    def nbytes(self):
+        """
+        Размер индекса (массивов CSR и рангов) в байтах.
+        """
+        return self.rank.nbytes + sum(array.nbytes for array in self.upward + self.downward)
+
+    @classmethod
+    def build(cls, graph, witness_limit=64):
+        """
+        Строит иерархию. Порядок сжатия выбирается ленивыми обновлениями по
+        приоритету: удвоенная разность ребер (сокращения минус удаляемые ребра)
+        плюс число уже сжатых соседей. Поиск обходного пути ограничен witness_limit
+        обработанными вершинами: если обход не найден, сокращение добавляется
+        (лишнее сокращение не влияет на корректность).
+
+        Аргументы:
+            graph (Graph | CompiledGraph): Граф.
+            witness_limit (int): Предел обработанных вершин в поиске обходного пути.
+
+        Возвращает:
+            ContractionHierarchy: Построенная иерархия.
+        """
+        compiled = graph if isinstance(graph, CompiledGraph) else CompiledGraph.from_graph(graph)
+        n = len(compiled)
+        outgoing = [{} for _ in range(n)]  # v -> {w: (вес, середина)} среди несжатых вершин
+        incoming = [{} for _ in range(n)]  # v -> {u: (вес, середина)}
+        indptr, indices, weights = compiled.adjacency
+        for u in range(n):
+            for k in range(indptr[u], indptr[u + 1]):
+                w, weight = indices[k], weights[k]
+                if w != u and weight < outgoing[u].get(w, (float("inf"),))[0]:
+                    outgoing[u][w] = (weight, -1)
+                    incoming[w][u] = (weight, -1)
+
+        contractor = _Contractor(outgoing, incoming, witness_limit)
+        heap = [(contractor.priority(v), v) for v in range(n)]
+        heap.sort()
+        rank = np.empty(n, dtype=np.int64)
+        upward = [[] for _ in range(n)]
+        downward = [[] for _ in range(n)]
+        shortcuts = 0
+        order = 0
+        while heap:
+            _, v = heappop(heap)
+            priority = contractor.priority(v)
+            if heap and priority > heap[0][0]:  # Приоритет устарел: возвращаем вершину в очередь
+                heappush(heap, (priority, v))
+                continue
+            rank[v] = order
+            order += 1
+            upward[v] = [(w, weight, middle) for w, (weight, middle) in outgoing[v].items()]
+            downward[v] = [(u, weight, middle) for u, (weight, middle) in incoming[v].items()]
+            shortcuts += contractor.contract(v)
+
+        return cls(compiled, rank, _to_csr(upward), _to_csr(downward), shortcuts)
+
+    def query(self, start, end):
+        """
+        Находит кратчайший путь двунаправленным поиском вверх по иерархии и
+        разворачивает сокращения в исходные ребра.
+
+        Аргументы:
+            start (Vertex): Стартовая вершина.
+            end (Vertex): Конечная вершина.
+
+        Возвращает:
+            tuple: (расстояние, список значений вершин пути) или None, если путь не найден —
+            то же, что и dijkstra.
+        """
+        if start == end:
+            return 0, [start.value]
+        index = self.compiled.index
+        if start not in index or end not in index:
+            return None
+
+        source, target = index[start], index[end]
+        searches = (
+            (self.upward_lists, {source: 0.0}, {source: -1}, [(0.0, source)]),
+            (self.downward_lists, {target: 0.0}, {target: -1}, [(0.0, target)]),
+        )  # Прямой поиск по ребрам вверх и обратный по ребрам вниз
+        best, meeting = float("inf"), -1
+        while searches[0][3] or searches[1][3]:
+            for side in (0, 1):
+                (indptr, indices, weights, _), dist, prev, heap = searches[side]
+                if not heap:
+                    continue
+                distance, vertex = heappop(heap)
+                if distance > dist[vertex]:
+                    continue
+                if distance >= best:  # Дальнейший поиск с этой стороны не улучшит путь
+                    heap.clear()
+                    continue
+                other = searches[1 - side][1]
+                if vertex in other and distance + other[vertex] < best:
+                    best, meeting = distance + other[vertex], vertex
+                for k in range(indptr[vertex], indptr[vertex + 1]):
+                    neighbor = indices[k]
+                    new_distance = distance + weights[k]
+                    if new_distance < dist.get(neighbor, float("inf")):
+                        dist[neighbor] = new_distance
+                        prev[neighbor] = vertex
+                        heappush(heap, (new_distance, neighbor))
+
+        if meeting == -1:
+            return None
+
+        forward_prev, backward_prev = searches[0][2], searches[1][2]
+        chain = []
+        vertex = meeting
+        while vertex != -1:
+            chain.append(vertex)
+            vertex = forward_prev[vertex]
+        chain.reverse()
+        vertex = backward_prev[meeting]
+        while vertex != -1:
+            chain.append(vertex)
+            vertex = backward_prev[vertex]
+
+        path = [chain[0]]
+        for a, b in zip(chain, chain[1:]):
+            path.extend(self.unpack(a, b)[1:])
+        return best, [self.compiled.vertices[vertex].value for vertex in path]
+
+    def edge_middle(self, a, b):
+        """
+        Возвращает середину ребра a -> b иерархии (-1 для исходного ребра).
+        """
+        if self.rank[a] < self.rank[b]:
+            indptr, indices, _, middles = self.upward_lists
+            row, neighbor = a, b
+        else:
+            indptr, indices, _, middles = self.downward_lists
+            row, neighbor = b, a
+        for k in range(indptr[row], indptr[row + 1]):
+            if indices[k] == neighbor:
+                return middles[k]
+        raise KeyError((a, b))
+
+    def unpack(self, a, b):
+        """
+        Разворачивает ребро иерархии a -> b в последовательность вершин исходного графа.
+
+        Аргументы:
+            a (int): Номер начальной вершины.
+            b (int): Номер конечной вершины.
+
+        Возвращает:
+            list: Номера вершин от a до b.
+        """
+        path = [a]
+        stack = [(a, b)]
+        while stack:
+            u, w = stack.pop()
+            middle = self.edge_middle(u, w)
+            if middle == -1:
+                path.append(w)
+            else:
+                stack.append((middle, w))  # Правая половина разворачивается после левой
+                stack.append((u, middle))
+        return path
+
+
+class _Contractor:
+    """
+    Сжатие вершин по текущему графу несжатых вершин.
+    """
+    def __init__(self, outgoing, incoming, witness_limit):
+        self.outgoing = outgoing
+        self.incoming = incoming
+        self.witness_limit = witness_limit
+        self.contracted_neighbors = [0] * len(outgoing)
+        self.pending = (None, None)  # Сокращения, найденные при последнем расчете приоритета
+
+    def shortcuts(self, v):
+        """
+        Возвращает сокращения (u, w, вес), необходимые при сжатии вершины v.
+        """
+        result = []
+        outgoing = self.outgoing[v]
+        if not outgoing:
+            return result
+        max_out = max(weight for weight, _ in outgoing.values())
+        for u, (weight_in, _) in self.incoming[v].items():
+            witness = self.witness_search(u, v, weight_in + max_out)
+            for w, (weight_out, _) in outgoing.items():
+                if w == u:
+                    continue
+                through = weight_in + weight_out
+                if witness.get(w, float("inf")) > through:
+                    result.append((u, w, through))
+        return result
+
+    def witness_search(self, source, excluded, limit):
+        """
+        Ограниченный поиск от source, не проходящий через excluded.
+
+        Возвращает:
+            dict: Найденные расстояния (для необработанных вершин — верхние оценки).
+        """
+        dist = {source: 0.0}
+        heap = [(0.0, source)]
+        settled = 0
+        while heap and settled < self.witness_limit:
+            distance, vertex = heappop(heap)
+            if distance > dist[vertex]:
+                continue
+            settled += 1
+            for neighbor, (weight, _) in self.outgoing[vertex].items():
+                if neighbor == excluded:
+                    continue
+                new_distance = distance + weight
+                if new_distance <= limit and new_distance < dist.get(neighbor, float("inf")):
+                    dist[neighbor] = new_distance
+                    heappush(heap, (new_distance, neighbor))
+        return dist
+
+    def priority(self, v):
+        """
+        Приоритет сжатия: удвоенная разность ребер плюс число уже сжатых соседей.
+        """
+        shortcuts = self.shortcuts(v)
+        self.pending = (v, shortcuts)
+        removed = len(self.outgoing[v]) + len(self.incoming[v])
+        return 2 * (len(shortcuts) - removed) + self.contracted_neighbors[v]
+
+    def contract(self, v):
+        """
+        Сжимает вершину v: добавляет сокращения и удаляет её ребра.
+
+        Возвращает:
+            int: Количество добавленных или укороченных сокращений.
+        """
+        shortcuts = self.pending[1] if self.pending[0] == v else self.shortcuts(v)
+        self.pending = (None, None)
+        added = 0
+        for u, w, weight in shortcuts:
+            if weight < self.outgoing[u].get(w, (float("inf"),))[0]:
+                self.outgoing[u][w] = (weight, v)
+                self.incoming[w][u] = (weight, v)
+                added += 1
+        for w in self.outgoing[v]:
+            del self.incoming[w][v]
+            self.contracted_neighbors[w] += 1
+        for u in self.incoming[v]:
+            del self.outgoing[u][v]
+            self.contracted_neighbors[u] += 1
+        self.outgoing[v] = {}
+        self.incoming[v] = {}
+        return added
+
+
+def _to_csr(rows):
+    """
+    Переводит списки (сосед, вес, середина) в массивы CSR.
+    """
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum([len(row) for row in rows], out=indptr[1:])
+    edges = [edge for row in rows for edge in row]
+    indices = np.array([edge[0] for edge in edges], dtype=np.int64)
+    weights = np.array([edge[1] for edge in edges], dtype=np.float64)
+    middles = np.array([edge[2] for edge in edges], dtype=np.int64)
+    return indptr, indices, weights, middles
+
+
+def build_contraction_hierarchy(graph, witness_limit=64):
+    """
+    Строит иерархию сжатия для графа.
+
+    Аргументы:
+        graph (Graph | CompiledGraph): Граф.
+        witness_limit (int): Предел обработанных вершин в поиске обходного пути.
+
+    Возвращает:
+        ContractionHierarchy: Иерархия; запросы выполняются методом query(start, end).
+    """
+    return ContractionHierarchy.build(graph, witness_limit)
@@ -0,0 +1,246 @@
+import itertools
+from heapq import heappush, heappop
+
+from djikstra.heaps import IndexedHeap
+
+class Graph:
+    """
+    Представляет граф с использованием списков смежности.
+
+    Атрибуты:
+        adjacency_list (dict): Словарь, где ключи — объекты Vertex, 
+        а значения — списки объектов Edge, представляющих связи и их веса.
+        version (int): Счётчик изменений графа; кэши запросов сбрасываются при его изменении.
+    """
+    def __init__(self, adjacency_list):
+        self.adjacency_list = adjacency_list
+        self.version = 0
+
+    def mark_changed(self):
+        """
+        Увеличивает счётчик версии. Вызывается после изменения adjacency_list
+        напрямую, чтобы кэши запросов к графу стали недействительными.
+        """
+        self.version += 1
+
+    def update_edges(self, updates):
+        """
+        Пакетно изменяет веса ребер. Для каждой тройки (start, end, distance)
+        меняется вес первого ребра start -> end, а если такого ребра нет, оно
+        добавляется. Версия графа увеличивается один раз на весь пакет. Чтобы
+        закрыть ребро, ему можно задать вес float("inf").
+
+        Аргументы:
+            updates (iterable): Тройки (начальная вершина, конечная вершина, новый вес).
+
+        Возвращает:
+            list: Изменения (начальная вершина, ребро, старый вес); старый вес равен None
+            для добавленного ребра. Список передается в DynamicShortestPathTree.repair.
+        """
+        changes = []
+        for start, end, distance in updates:
+            edges = self.adjacency_list.setdefault(start, [])
+            self.adjacency_list.setdefault(end, [])
+            for edge in edges:
+                if edge.vertex is end:
+                    if edge.distance != distance:
+                        changes.append((start, edge, edge.distance))
+                        edge.distance = distance
+                    break
+            else:
+                edge = Edge(distance, end)
+                edges.append(edge)
+                changes.append((start, edge, None))
+        if changes:
+            self.mark_changed()
+        return changes
+
+    def compile(self):
+        """
+        Компилирует граф в массивы CSR с последовательными номерами вершин.
+
+        Возвращает:
+            CompiledGraph: Скомпилированный граф для dijkstra_compiled.
+        """
+        from djikstra.compiled import CompiledGraph  # numpy загружается только при компиляции
+        return CompiledGraph.from_graph(self)
+
+
+class Vertex:
+    """
+    Представляет вершину (узел) в графе.
+
+    Атрибуты:
+        value (any): Уникальный идентификатор вершины, например, строка или число.
+    """
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class Edge:
+    """
+    Представляет ребро, соединяющее две вершины в графе.
+
+    Атрибуты:
+        distance (float): Вес ребра.
+        vertex (Vertex): Вершина, к которой ведет это ребро.
+    """
+    __slots__ = ('distance', 'vertex')
+
+    def __init__(self, distance, vertex):
+        self.distance = distance
+        self.vertex = vertex
+
+
+def dijkstra(graph, start, end, queue_class=None):
+    """
+    Реализация алгоритма Дейкстры для нахождения кратчайшего пути в графе с весами.
+
+    Аргументы:
+        graph (Graph): Граф, представленный списком смежности из вершин и ребер.
+        start (Vertex): Стартовая вершина.
+        end (Vertex): Конечная вершина, до которой нужно найти кратчайший путь.
+        queue_class (type): Класс очереди с приоритетом с методами add_task и pop_task
+            (по умолчанию IndexedHeap с d=4: устаревших записей в ней нет; сравнение
+            скорости с PriorityQueue — в benchmark_heaps.py).
+
+    Логика работы:
+    1. Инициализация:
+        - 'previous': Словарь для отслеживания предшественников каждой вершины в кратчайшем пути.
+        - 'visited': Словарь для отметки, была ли вершина полностью обработана.
+        - 'distances': Словарь с минимально известными расстояниями от стартовой вершины до каждой вершины.
+    2. Устанавливается расстояние до стартовой вершины равным 0, остальные — бесконечность.
+    3. Используется очередь с приоритетами для выбора вершины с минимальным известным расстоянием.
+    4. Для каждого соседа текущей вершины:
+        - Если сосед ещё не посещён, рассчитывается новое расстояние через текущую вершину.
+        - Если это расстояние меньше ранее известного, оно обновляется.
+        - Записывается предшественник для восстановления пути.
+    5. Обработка завершается, когда достигается конечная вершина или очередь становится пустой.
+    6. Кратчайший путь восстанавливается с использованием словаря 'previous'.
+
+    Возвращает:
+        tuple: (расстояние, список значений вершин пути) или None, если путь не найден.
+    """
+    if start == end:
+        return 0, [start.value]
+    
+    previous = {v: None for v in graph.adjacency_list.keys()}
+    visited = {v: False for v in graph.adjacency_list.keys()}
+    distances = {v: float("inf") for v in graph.adjacency_list.keys()}
+    distances[start] = 0
+    queue = queue_class() if queue_class else IndexedHeap()
+    queue.add_task(0, start)
+    path = []
+    while queue:
+        removed_distance, removed = queue.pop_task()
+        visited[removed] = True
+
+        if removed is end:
+            while previous[removed]:
+                path.append(removed.value)
+                removed = previous[removed]
+            path.append(start.value)
+            return distances[end], path[::-1]
+
+        for edge in graph.adjacency_list[removed]:
+            if visited[edge.vertex]:
+                continue
+            new_distance = removed_distance + edge.distance
+            if new_distance < distances[edge.vertex]:
+                distances[edge.vertex] = new_distance
+                previous[edge.vertex] = removed
+                queue.add_task(new_distance, edge.vertex)
+    return
+
+REMOVED = object()  # Метка устаревшей записи в куче
+
+
+class PriorityQueue:
+    """
+    Очередь с приоритетом, реализованная с использованием кучи (min-heap) для 
+    эффективного извлечения задач с наименьшим приоритетом.
+
+    Изменение приоритета выполняется ленивым удалением: старая запись помечается
+    как устаревшая и остаётся в куче, а новая добавляется отдельно. Устаревшие
+    записи пропускаются при извлечении, поэтому инвариант кучи не нарушается.
+
+    Атрибуты:
+        pq (list): Список элементов, организованных в виде кучи, где каждая запись — 
+        это список [priority, count, task].
+        entry_finder (dict): Словарь для быстрого доступа к актуальной записи по задаче.
+        counter (itertools.count): Уникальный счётчик для разрешения конфликтов приоритетов.
+
+    Методы:
+        add_task(priority, task):
+            Добавляет новую задачу или обновляет приоритет существующей.
+        update_priority(priority, task):
+            Обновляет приоритет существующей задачи.
+        pop_task():
+            Извлекает и возвращает задачу с наименьшим приоритетом.
+        __len__():
+            Возвращает количество задач в очереди.
+    """
+    def __init__(self):
+        self.pq = []
+        self.entry_finder = {}
+        self.counter = itertools.count()
+
+    def __len__(self):
+        """
+        Возвращает количество задач в очереди (без устаревших записей).
+        """
+        return len(self.entry_finder)
+
+    def add_task(self, priority, task):
+        """
+        Добавляет новую задачу в очередь или обновляет приоритет существующей.
+
+        Аргументы:
+            priority (float): Приоритет задачи, где меньшие значения означают более высокий приоритет.
+            task (any): Задача, которую нужно добавить или обновить.
+
+        Если задача уже существует, её приоритет обновляется.
+        """
+        if task in self.entry_finder:
+            self.update_priority(priority, task)
+            return self
+        count = next(self.counter)
+        entry = [priority, count, task]
+        self.entry_finder[task] = entry
+        heappush(self.pq, entry)
+
+    def update_priority(self, priority, task):
+        """
+        Обновляет приоритет существующей задачи: старая запись помечается как
+        устаревшая, а в кучу добавляется новая.
+
+        Аргументы:
+            priority (float): Новое значение приоритета для задачи.
+            task (any): Задача, для которой нужно обновить приоритет.
+        """
+        entry = self.entry_finder.pop(task)
+        entry[-1] = REMOVED
+        count = next(self.counter)
+        entry = [priority, count, task]
+        self.entry_finder[task] = entry
+        heappush(self.pq, entry)
+
+    def pop_task(self):
+        """
+        Удаляет и возвращает задачу с наименьшим приоритетом из очереди,
+        пропуская устаревшие записи.
+
+        Возвращает:
+            tuple: Кортеж (priority, task) для задачи с минимальным приоритетом.
+
+        Исключения:
+            KeyError: Если очередь пуста.
+        """
+        while self.pq:
+            priority, count, task = heappop(self.pq)
+            if task is not REMOVED:
+                del self.entry_finder[task]
+                return priority, task
+        raise KeyError('pop from an empty priority queue')
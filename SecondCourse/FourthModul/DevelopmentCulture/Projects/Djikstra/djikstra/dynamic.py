@@ -0,0 +1,147 @@
+import itertools
+from heapq import heappush, heappop
+
+from djikstra.batch import ShortestPathTree, shortest_path_tree
+
+
+def incoming_edges(graph):
+    """
+    Строит обратный индекс ребер: для каждой вершины — список пар (начало ребра, Edge).
+    Индекс хранит сами объекты Edge, поэтому изменения весов через update_edges
+    видны в нём без перестроения.
+
+    Аргументы:
+        graph (Graph): Граф.
+
+    Возвращает:
+        dict: Вершина -> список (начальная вершина, ребро).
+    """
+    incoming = {}
+    for start, edges in graph.adjacency_list.items():
+        for edge in edges:
+            incoming.setdefault(edge.vertex, []).append((start, edge))
+    return incoming
+
+
+def register_added_edges(incoming, changes):
+    """
+    Добавляет в обратный индекс ребра, созданные update_edges.
+
+    Аргументы:
+        incoming (dict): Обратный индекс из incoming_edges.
+        changes (list): Изменения (начальная вершина, ребро, старый вес) из Graph.update_edges.
+    """
+    for start, edge, old_distance in changes:
+        if old_distance is None:
+            incoming.setdefault(edge.vertex, []).append((start, edge))
+
+
+class DynamicShortestPathTree(ShortestPathTree):
+    """
+    Дерево кратчайших путей от одной вершины, которое восстанавливается после
+    изменения весов ребер, затрагивая только вершины, чьи расстояния могли
+    измениться (в духе алгоритма Рамалингама — Репса):
+
+    - при увеличении веса ребра дерева расстояния всего поддерева его конца
+      сбрасываются и пересчитываются от ребер, входящих в поддерево извне;
+    - при уменьшении веса (или добавлении ребра) конец ребра получает новое
+      расстояние, и улучшение распространяется поиском Дейкстры от него.
+
+    Атрибуты:
+        graph (Graph): Граф.
+        incoming (dict): Обратный индекс ребер (может быть общим для нескольких деревьев).
+        children (dict): Вершина -> множество её потомков в дереве.
+    """
+    def __init__(self, graph, source, incoming=None):
+        tree = shortest_path_tree(graph, source)
+        super().__init__(source, tree.distances, tree.previous, complete=True)
+        self.graph = graph
+        self.incoming = incoming if incoming is not None else incoming_edges(graph)
+        self.children = {}
+        for vertex, parent in self.previous.items():
+            if parent is not None:
+                self.children.setdefault(parent, set()).add(vertex)
+
+    def repair(self, changes, update_incoming=True):
+        """
+        Восстанавливает дерево после Graph.update_edges.
+
+        Аргументы:
+            changes (list): Изменения (начальная вершина, ребро, старый вес), которые
+                вернул Graph.update_edges.
+            update_incoming (bool): Добавить новые ребра в обратный индекс. Если индекс
+                общий для нескольких деревьев, его обновляют один раз и передают False.
+
+        Возвращает:
+            int: Количество вершин, расстояние до которых было пересчитано.
+        """
+        if update_incoming:
+            register_added_edges(self.incoming, changes)
+        distances, previous, children = self.distances, self.previous, self.children
+        tentative = {}
+        parents = {}
+        heap = []
+        counter = itertools.count()
+
+        # Увеличение веса ребра дерева: поддерево его конца теряет расстояния
+        affected = set()
+        for start, edge, old_distance in changes:
+            vertex = edge.vertex
+            if (old_distance is not None and edge.distance > old_distance and vertex not in affected
+                    and previous.get(vertex) is start):
+                stack = [vertex]
+                while stack:
+                    current = stack.pop()
+                    if current not in affected:
+                        affected.add(current)
+                        stack.extend(children.get(current, ()))
+        for vertex in affected:
+            parent = previous.pop(vertex)
+            if parent not in affected:
+                children[parent].discard(vertex)
+            children.pop(vertex, None)
+            del distances[vertex]
+        for vertex in affected:
+            for start, edge in self.incoming.get(vertex, ()):
+                if start in distances:
+                    candidate = distances[start] + edge.distance
+                    if candidate < tentative.get(vertex, float("inf")):
+                        tentative[vertex] = candidate
+                        parents[vertex] = start
+            if vertex in tentative:
+                heappush(heap, (tentative[vertex], next(counter), vertex))
+
+        # Уменьшение веса или новое ребро: конец ребра может получить более короткий путь
+        for start, edge, old_distance in changes:
+            if start in distances and (old_distance is None or edge.distance < old_distance):
+                self._offer(edge.vertex, distances[start] + edge.distance, start, tentative, parents, heap, counter)
+
+        # Распространение изменений поиском Дейкстры только по затронутым вершинам
+        touched = 0
+        while heap:
+            distance, _, vertex = heappop(heap)
+            if tentative.get(vertex) != distance:
+                continue
+            del tentative[vertex]
+            touched += 1
+            old_parent = previous.get(vertex)
+            if old_parent is not None and old_parent in children:
+                children[old_parent].discard(vertex)
+            parent = parents.pop(vertex)
+            distances[vertex] = distance
+            previous[vertex] = parent
+            children.setdefault(parent, set()).add(vertex)
+            for edge in self.graph.adjacency_list.get(vertex, ()):
+                self._offer(edge.vertex, distance + edge.distance, vertex, tentative, parents, heap, counter)
+        return touched
+
+    def _offer(self, vertex, candidate, parent, tentative, parents, heap, counter):
+        """
+        Предлагает вершине новое расстояние, если оно меньше известного.
+        """
+        current = self.distances.get(vertex, tentative.get(vertex, float("inf")))
+        if candidate < current:
+            self.distances.pop(vertex, None)  # Вершина будет окончательно обработана заново
+            tentative[vertex] = candidate
+            parents[vertex] = parent
+            heappush(heap, (candidate, next(counter), vertex))
@@ -0,0 +1,131 @@
+class IndexedHeap:
+    """
+    Индексированная d-арная куча (min-heap) с настоящим уменьшением ключа:
+    для каждой задачи хранится её позиция в куче, поэтому изменение приоритета
+    перемещает существующую запись за O(log_d n) без устаревших копий.
+    Интерфейс совпадает с PriorityQueue, поэтому кучу можно передать в dijkstra
+    как queue_class.
+
+    Атрибуты:
+        d (int): Число потомков каждого узла кучи.
+        priorities (list): Приоритеты записей в порядке кучи.
+        tasks (list): Задачи в порядке кучи.
+        position (dict): Задача -> позиция в куче.
+    """
+    def __init__(self, d=4):
+        if d < 2:
+            raise ValueError("Арность кучи должна быть не меньше 2")
+        self.d = d
+        self.priorities = []
+        self.tasks = []
+        self.position = {}
+
+    def __len__(self):
+        """
+        Возвращает количество задач в куче.
+        """
+        return len(self.tasks)
+
+    def __contains__(self, task):
+        """
+        Проверяет, находится ли задача в куче.
+        """
+        return task in self.position
+
+    def add_task(self, priority, task):
+        """
+        Добавляет новую задачу или изменяет приоритет существующей.
+
+        Аргументы:
+            priority (float): Приоритет задачи, где меньшие значения означают более высокий приоритет.
+            task (any): Задача (хешируемый объект).
+        """
+        i = self.position.get(task)
+        if i is None:
+            self.priorities.append(priority)
+            self.tasks.append(task)
+            self.position[task] = len(self.tasks) - 1
+            self._sift_up(len(self.tasks) - 1)
+        elif priority < self.priorities[i]:
+            self.priorities[i] = priority
+            self._sift_up(i)
+        elif priority > self.priorities[i]:
+            self.priorities[i] = priority
+            self._sift_down(i)
+
+    def update_priority(self, priority, task):
+        """
+        Изменяет приоритет задачи, которая уже находится в куче.
+
+        Аргументы:
+            priority (float): Новое значение приоритета.
+            task (any): Задача.
+
+        Исключения:
+            KeyError: Если задачи нет в куче.
+        """
+        if task not in self.position:
+            raise KeyError(task)
+        self.add_task(priority, task)
+
+    def pop_task(self):
+        """
+        Удаляет и возвращает задачу с наименьшим приоритетом.
+
+        Возвращает:
+            tuple: Кортеж (priority, task).
+
+        Исключения:
+            KeyError: Если куча пуста.
+        """
+        if not self.tasks:
+            raise KeyError('pop from an empty priority queue')
+        priority, task = self.priorities[0], self.tasks[0]
+        del self.position[task]
+        last_priority, last_task = self.priorities.pop(), self.tasks.pop()
+        if self.tasks:
+            self.priorities[0], self.tasks[0] = last_priority, last_task
+            self.position[last_task] = 0
+            self._sift_down(0)
+        return priority, task
+
+    def _sift_up(self, i):
+        """
+        Поднимает запись с позиции i, пока её приоритет меньше приоритета родителя.
+        """
+        priorities, tasks, position, d = self.priorities, self.tasks, self.position, self.d
+        priority, task = priorities[i], tasks[i]
+        while i > 0:
+            parent = (i - 1) // d
+            if priorities[parent] <= priority:
+                break
+            moved = tasks[parent]
+            priorities[i], tasks[i] = priorities[parent], moved
+            position[moved] = i
+            i = parent
+        priorities[i], tasks[i] = priority, task
+        position[task] = i
+
+    def _sift_down(self, i):
+        """
+        Опускает запись с позиции i, пока среди потомков есть запись с меньшим приоритетом.
+        """
+        priorities, tasks, position, d = self.priorities, self.tasks, self.position, self.d
+        size = len(tasks)
+        priority, task = priorities[i], tasks[i]
+        while True:
+            first = d * i + 1
+            if first >= size:
+                break
+            child, smallest = first, priorities[first]
+            for k in range(first + 1, min(first + d, size)):  # Явный цикл быстрее min(..., key=...)
+                if priorities[k] < smallest:
+                    child, smallest = k, priorities[k]
+            if smallest >= priority:
+                break
+            moved = tasks[child]
+            priorities[i], tasks[i] = smallest, moved
+            position[moved] = i
+            i = child
+        priorities[i], tasks[i] = priority, task
+        position[task] = i
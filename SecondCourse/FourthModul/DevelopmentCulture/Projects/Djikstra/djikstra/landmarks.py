@@ -0,0 +1,148 @@
+import json
+import os
+
+import numpy as np
+
+DISTANCES_FILE = 'distances.npy'  # Таблица расстояний (n, 2, K) float32
+META_FILE = 'meta.json'  # Ориентиры и параметры индекса
+
+
+class LandmarkIndex:
+    """
+    Индекс ориентиров для A* (ALT: A*, landmarks, triangle inequality). Для каждого
+    ориентира L хранятся расстояния d(L, v) и d(v, L) до всех вершин в матрице
+    float32. По неравенству треугольника расстояние от v до t не меньше
+    max(d(L, t) - d(L, v), d(v, L) - d(t, L)), что дает допустимую эвристику.
+
+    Таблица хранится по вершинам: расстояния одной вершины до всех ориентиров
+    лежат подряд, поэтому запрос к индексу, отображенному в память, читает с
+    диска только страницы достигнутых вершин. Индекс передается в astar как
+    эвристика: index(compiled, target) возвращает функцию оценки вершины.
+
+    Атрибуты:
+        landmarks (numpy.ndarray): Номера вершин-ориентиров.
+        distances (numpy.ndarray): Матрица (n, 2, K) float32: [v, 0] — d(L, v), [v, 1] — d(v, L).
+            Недостижимые вершины имеют расстояние inf.
+        num_edges (int): Количество ребер графа, по которому построен индекс.
+        slack (float): Запас на погрешность округления до float32, вычитаемый из оценок.
+    """
+    def __init__(self, landmarks, distances, num_edges, slack):
+        self.landmarks = landmarks
+        self.distances = distances
+        self.num_edges = num_edges
+        self.slack = slack
+
+    @classmethod
+    def build(cls, compiled, count=16, first=0):
+        """
+        Выбирает ориентиры и считает таблицы расстояний. Ориентиры выбираются
+        жадно: очередной ориентир — вершина, наиболее удаленная от уже выбранных,
+        поэтому ориентиры оказываются на окраинах графа. Для каждого ориентира
+        выполняется полный поиск по графу и по графу с обращенными ребрами.
+
+        Аргументы:
+            compiled (CompiledGraph): Скомпилированный граф.
+            count (int): Количество ориентиров K.
+            first (int): Номер первого ориентира.
+
+        Возвращает:
+            LandmarkIndex: Построенный индекс.
+        """
+        n = len(compiled)
+        count = min(count, n)
+        distances = np.full((n, 2, count), np.inf, dtype=np.float32)
+        landmarks = np.empty(count, dtype=np.int64)
+        nearest = np.full(n, np.inf)  # Расстояние от ближайшего выбранного ориентира до вершины
+        reverse = compiled.reverse()
+
+        candidate = first
+        for i in range(count):
+            landmarks[i] = candidate
+            compiled.search(candidate)
+            distances[:, 0, i] = compiled.dist
+            np.minimum(nearest, compiled.dist, out=nearest)
+            reverse.search(candidate)
+            distances[:, 1, i] = reverse.dist
+
+            # Следующий ориентир — самая удаленная вершина; вершины, недостижимые
+            # от всех ориентиров, считаются самыми удаленными
+            farthest = np.where(np.isfinite(nearest), nearest, np.finfo(np.float64).max)
+            farthest[landmarks[:i + 1]] = -1.0
+            candidate = int(np.argmax(farthest))
+
+        finite = distances[np.isfinite(distances)]
+        slack = 2 * float(np.finfo(np.float32).eps) * (float(finite.max()) if len(finite) else 0.0)
+        return cls(landmarks, distances, len(compiled.indices), slack)
+
+    def __call__(self, compiled, target):
+        """
+        Возвращает функцию нижней оценки расстояния от вершины до target.
+
+        Аргументы:
+            compiled (CompiledGraph): Скомпилированный граф, по которому построен индекс.
+            target (int): Номер конечной вершины.
+
+        Возвращает:
+            callable: Номер вершины -> нижняя оценка расстояния до target.
+        """
+        if len(self.distances) != len(compiled) or self.num_edges != len(compiled.indices):
+            raise ValueError("Индекс ориентиров построен для другого графа")
+        target_from, target_to = self.distances[target].tolist()
+        distances, slack = self.distances, self.slack
+
+        def estimate(vertex):
+            from_landmark, to_landmark = distances[vertex].tolist()  # Одна строка таблицы, без numpy-арифметики
+            bound = 0.0
+            for a, b in zip(target_from, from_landmark):
+                if a - b > bound:  # inf - inf дает nan, и сравнение ложно: ориентир ничего не говорит
+                    bound = a - b
+            for a, b in zip(to_landmark, target_to):
+                if a - b > bound:
+                    bound = a - b
+            return max(bound - slack, 0.0)
+
+        return estimate
+
+    def save(self, path):
+        """
+        Сохраняет индекс в каталог: таблицу в distances.npy, ориентиры и параметры в meta.json.
+
+        Аргументы:
+            path (str): Путь к каталогу.
+        """
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, DISTANCES_FILE), self.distances)
+        with open(os.path.join(path, META_FILE), 'w') as file:
+            json.dump({'landmarks': self.landmarks.tolist(), 'num_edges': self.num_edges, 'slack': self.slack}, file)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Загружает индекс из каталога.
+
+        Аргументы:
+            path (str): Путь к каталогу.
+            mmap (bool): Отобразить distances.npy в память только для чтения: файл
+                не читается целиком, а процессы с одним индексом делят страницы кэша.
+
+        Возвращает:
+            LandmarkIndex: Загруженный индекс.
+        """
+        with open(os.path.join(path, META_FILE)) as file:
+            meta = json.load(file)
+        distances = np.load(os.path.join(path, DISTANCES_FILE), mmap_mode='r' if mmap else None)
+        return cls(np.array(meta['landmarks'], dtype=np.int64), distances, meta['num_edges'], meta['slack'])
+
+
+def build_landmarks(compiled, count=16):
+    """
+    Строит индекс ориентиров для скомпилированного графа.
+
+    Аргументы:
+        compiled (CompiledGraph): Скомпилированный граф.
+        count (int): Количество ориентиров.
+
+    Возвращает:
+        LandmarkIndex: Индекс, который передается в astar как эвристика.
+    """
+    return LandmarkIndex.build(compiled, count)
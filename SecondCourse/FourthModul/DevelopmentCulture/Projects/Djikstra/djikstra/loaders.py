@@ -0,0 +1,85 @@
+import csv
+
+from djikstra.core import Edge, Graph, Vertex
+
+
+def read_edge_list(path, directed=True, default_weight=1.0):
+    """
+    Читает граф из текстового списка ребер: каждая строка — «начало конец [вес]»,
+    разделенные пробелами или табуляцией. Пустые строки и строки, начинающиеся
+    с #, пропускаются.
+
+    Аргументы:
+        path (str): Путь к файлу.
+        directed (bool): Если False, для каждого ребра добавляется обратное.
+        default_weight (float): Вес ребра, для которого он не указан.
+
+    Возвращает:
+        tuple: (Graph, словарь метка -> Vertex).
+
+    Исключения:
+        ValueError: Если строка содержит меньше двух или больше трех полей.
+    """
+    builder = _GraphBuilder(directed)
+    with open(path, encoding='utf-8') as file:
+        for line_number, line in enumerate(file, 1):
+            fields = line.split()
+            if not fields or fields[0].startswith('#'):
+                continue
+            if len(fields) not in (2, 3):
+                raise ValueError(f"{path}:{line_number}: ожидается «начало конец [вес]»")
+            weight = float(fields[2]) if len(fields) == 3 else default_weight
+            builder.add(fields[0], fields[1], weight)
+    return builder.graph, builder.vertices
+
+
+def read_csv(path, directed=True, source='source', target='target', weight='weight', default_weight=1.0):
+    """
+    Читает граф из CSV с заголовком. Столбец веса необязателен.
+
+    Аргументы:
+        path (str): Путь к файлу.
+        directed (bool): Если False, для каждого ребра добавляется обратное.
+        source (str): Имя столбца начальной вершины.
+        target (str): Имя столбца конечной вершины.
+        weight (str): Имя столбца веса.
+        default_weight (float): Вес ребра, если столбца веса нет или ячейка пуста.
+
+    Возвращает:
+        tuple: (Graph, словарь метка -> Vertex).
+
+    Исключения:
+        ValueError: Если в заголовке нет столбцов начальной или конечной вершины.
+    """
+    builder = _GraphBuilder(directed)
+    with open(path, encoding='utf-8', newline='') as file:
+        reader = csv.DictReader(file)
+        if source not in (reader.fieldnames or ()) or target not in reader.fieldnames:
+            raise ValueError(f"{path}: в заголовке нет столбцов {source!r} и {target!r}")
+        for row in reader:
+            value = row.get(weight)
+            builder.add(row[source], row[target], float(value) if value else default_weight)
+    return builder.graph, builder.vertices
+
+
+class _GraphBuilder:
+    """
+    Собирает Graph из ребер с метками вершин.
+    """
+    def __init__(self, directed):
+        self.directed = directed
+        self.vertices = {}
+        self.graph = Graph({})
+
+    def vertex(self, label):
+        vertex = self.vertices.get(label)
+        if vertex is None:
+            vertex = self.vertices[label] = Vertex(label)
+            self.graph.adjacency_list[vertex] = []
+        return vertex
+
+    def add(self, start, end, weight):
+        start, end = self.vertex(start), self.vertex(end)
+        self.graph.adjacency_list[start].append(Edge(weight, end))
+        if not self.directed:
+            self.graph.adjacency_list[end].append(Edge(weight, start))
@@ -10,8 +10,7 @@ setup(
    url='https://github.com/rudessa/djikstra_lib',
    packages=['djikstra'],
    install_requires=[
-       'itertools',
-       'heapq'
+       'numpy'
    ], 
    extras_require={
         'test': [
@@ -1,5 +1,19 @@
+import io
+import os
+import pickle
+import subprocess
+import sys
+
+import numpy as np
 import pytest
-from djikstra import Graph, Vertex, Edge, dijkstra
+from djikstra import (
+    Graph, Vertex, Edge, DynamicShortestPathTree, IndexedHeap, LandmarkIndex, PriorityQueue, QueryCache, astar,
+    bidirectional_dijkstra,
+    build_contraction_hierarchy, build_landmarks, dijkstra, dijkstra_compiled, dijkstra_many, euclidean_heuristic,
+    haversine_heuristic, load_binary, read_csv, read_edge_list, save_binary, shortest_path_tree,
+)
+from djikstra.__main__ import main
+from djikstra.astar import CoordinateHeuristic, EuclideanHeuristic
 
 @pytest.fixture
 def setup_graph():
@@ -45,4 +59,359 @@ def test_dijkstra_unreachable_node(setup_graph):
     
     result = dijkstra(graph, vertices["A"], isolated_vertex)
     
-    assert result is None
\ No newline at end of file
+    assert result is None
+
+def test_dijkstra_many_matches_dijkstra(setup_graph):
+    graph, vertices = setup_graph
+    pairs = [(vertices[a], vertices[b]) for a in "ABCDEFGH" for b in "ABCDEFGH"]
+
+    results = dijkstra_many(graph, pairs)
+
+    assert results == [dijkstra(graph, start, end) for start, end in pairs]
+
+
+def test_dijkstra_many_workers(setup_graph):
+    graph, vertices = setup_graph
+    pairs = [(vertices["A"], vertices["H"]), (vertices["G"], vertices["B"]), (vertices["A"], Vertex("X"))]
+
+    results = dijkstra_many(graph, pairs, workers=2)
+
+    assert results == [dijkstra(graph, start, end) for start, end in pairs]
+    assert results[2] is None
+
+
+def test_shortest_path_tree_query(setup_graph):
+    graph, vertices = setup_graph
+
+    tree = shortest_path_tree(graph, vertices["A"])
+
+    assert tree.complete
+    assert tree.query(vertices["H"]) == dijkstra(graph, vertices["A"], vertices["H"])
+    assert tree.query(vertices["A"]) == (0, ["A"])
+
+
+def test_dijkstra_compiled_matches_dijkstra(setup_graph):
+    graph, vertices = setup_graph
+    compiled = graph.compile()
+
+    for start in vertices.values():
+        for end in vertices.values():
+            expected = dijkstra(graph, start, end)
+            result = dijkstra_compiled(compiled, start, end)
+            assert result[0] == pytest.approx(expected[0])
+            assert result[1] == expected[1]
+    assert dijkstra_compiled(compiled, vertices["A"], Vertex("X")) is None
+
+
+@pytest.mark.parametrize("queue_class", [PriorityQueue, IndexedHeap])
+def test_priority_queue_decrease_key_order(queue_class):
+    queue = queue_class()
+    for priority, task in [(5, "a"), (3, "b"), (4, "c"), (6, "d")]:
+        queue.add_task(priority, task)
+    queue.add_task(1, "d")
+    queue.add_task(2, "a")
+
+    popped = [queue.pop_task() for _ in range(len(queue))]
+
+    assert popped == [(1, "d"), (2, "a"), (3, "b"), (4, "c")]
+    with pytest.raises(KeyError):
+        queue.pop_task()
+
+
+def test_dijkstra_with_indexed_heap(setup_graph):
+    graph, vertices = setup_graph
+
+    for end in vertices.values():
+        assert dijkstra(graph, vertices["A"], end, queue_class=IndexedHeap) == dijkstra(graph, vertices["A"], end)
+
+
+def test_bidirectional_dijkstra_matches_dijkstra(setup_graph):
+    graph, vertices = setup_graph
+    compiled = graph.compile()
+
+    for start in vertices.values():
+        for end in vertices.values():
+            expected = dijkstra(graph, start, end)
+            result = bidirectional_dijkstra(compiled, start, end)
+            assert result[0] == pytest.approx(expected[0])
+            assert result[1] == expected[1]
+
+
+def test_bidirectional_dijkstra_one_way_edge():
+    a, b, c = Vertex("A"), Vertex("B"), Vertex("C")
+    graph = Graph({a: [Edge(1, b)], b: [Edge(2, c)], c: []})
+
+    assert bidirectional_dijkstra(graph, a, c) == (3, ["A", "B", "C"])
+    assert bidirectional_dijkstra(graph, c, a) is None
+
+
+def test_astar_zero_heuristic_matches_dijkstra(setup_graph):
+    graph, vertices = setup_graph
+    compiled = graph.compile()
+
+    def zero(compiled, target):
+        return [0.0] * len(compiled)
+
+    for end in vertices.values():
+        expected = dijkstra(graph, vertices["A"], end)
+        result = astar(compiled, vertices["A"], end, zero)
+        assert result[0] == pytest.approx(expected[0])
+        assert result[1] == expected[1]
+
+
+def test_astar_coordinate_heuristics():
+    a, b, c, d = Vertex("A"), Vertex("B"), Vertex("C"), Vertex("D")
+    graph = Graph({
+        a: [Edge(1.0, b), Edge(1.5, c)],
+        b: [Edge(1.0, d)],
+        c: [Edge(0.6, d)],
+        d: [],
+    })
+    coordinates = {a: (0, 0), b: (1, 0), c: (0, 1), d: (1, 1)}
+    geo = {vertex: (55.75 + y * 0.001, 37.61 + x * 0.001) for vertex, (x, y) in coordinates.items()}
+
+    assert astar(graph, a, d, euclidean_heuristic(coordinates, scale=0.5)) == (2.0, ["A", "B", "D"])
+    assert astar(graph, a, d, haversine_heuristic(geo)) == (2.0, ["A", "B", "D"])
+    assert astar(graph, d, a, euclidean_heuristic(coordinates)) is None
+
+
+def test_coordinate_heuristic_is_lazy():
+    with pytest.raises(TypeError):
+        CoordinateHeuristic({})
+
+    class Counted(EuclideanHeuristic):
+        calls = 0
+
+        def distance(self, point, target):
+            Counted.calls += 1
+            return super().distance(point, target)
+
+    size = 30
+    grid = {(x, y): Vertex(f"{x},{y}") for x in range(size) for y in range(size)}
+    adjacency = {vertex: [] for vertex in grid.values()}
+    for (x, y), vertex in grid.items():
+        for neighbor in ((x + 1, y), (x, y + 1)):
+            if neighbor in grid:
+                adjacency[vertex].append(Edge(1.0, grid[neighbor]))
+    graph = Graph(adjacency)
+    compiled = graph.compile()
+    heuristic = Counted({vertex: point for point, vertex in grid.items()})
+    start, end = grid[0, 0], grid[3, 2]
+
+    assert astar(compiled, start, end, heuristic)[0] == dijkstra(graph, start, end)[0]
+    assert 0 < Counted.calls < len(grid) // 10  # Оценки только для достигнутых вершин
+
+
+def test_landmark_index_astar(setup_graph, tmp_path):
+    graph, vertices = setup_graph
+    compiled = graph.compile()
+    index = build_landmarks(compiled, count=3)
+    index.save(tmp_path)
+    loaded = LandmarkIndex.load(tmp_path)
+
+    assert loaded.distances.dtype == np.float32
+    assert isinstance(loaded.distances, np.memmap)
+    for start in vertices.values():
+        for end in vertices.values():
+            expected = dijkstra(graph, start, end)
+            result = astar(compiled, start, end, loaded)
+            assert result[0] == pytest.approx(expected[0])
+            assert result[1] == expected[1]
+
+
+def test_contraction_hierarchy_matches_dijkstra(setup_graph):
+    graph, vertices = setup_graph
+    hierarchy = build_contraction_hierarchy(graph)
+
+    for start in vertices.values():
+        for end in vertices.values():
+            expected = dijkstra(graph, start, end)
+            result = hierarchy.query(start, end)
+            assert result[0] == pytest.approx(expected[0])
+            assert result[1] == expected[1]
+
+
+def test_contraction_hierarchy_directed_path():
+    a, b, c, d = Vertex("A"), Vertex("B"), Vertex("C"), Vertex("D")
+    graph = Graph({a: [Edge(1, b)], b: [Edge(1, c)], c: [Edge(1, d)], d: []})
+    hierarchy = build_contraction_hierarchy(graph)
+
+    assert hierarchy.query(a, d) == (3, ["A", "B", "C", "D"])
+    assert hierarchy.query(d, a) is None
+
+
+def test_query_cache_counters_and_invalidation(setup_graph):
+    graph, vertices = setup_graph
+    cache = QueryCache(graph, maxsize=2, tree_threshold=10)
+    a, h, g, c = vertices["A"], vertices["H"], vertices["G"], vertices["C"]
+
+    assert cache.query(a, h) == dijkstra(graph, a, h)
+    assert cache.query(a, h) == dijkstra(graph, a, h)
+    cache.query(a, g)
+    cache.query(a, c)
+    assert cache.stats() == {'hits': 1, 'misses': 3, 'evictions': 1, 'invalidations': 0, 'repairs': 0, 'pairs': 2,
+                             'trees': 0}
+
+    graph.mark_changed()
+    cache.query(a, c)
+    assert cache.stats()['invalidations'] == 1
+    assert cache.stats()['misses'] == 4
+
+
+def test_query_cache_hot_source_tree(setup_graph):
+    graph, vertices = setup_graph
+    cache = QueryCache(graph, tree_threshold=2)
+    a = vertices["A"]
+
+    cache.query(a, vertices["B"])
+    cache.query(a, vertices["C"])
+    results = [cache.query(a, end) for end in vertices.values()]
+
+    assert results == [dijkstra(graph, a, end) for end in vertices.values()]
+    assert cache.stats()['trees'] == 1
+    assert cache.stats()['hits'] == len(vertices)
+
+
+def test_update_edges_changes_and_version(setup_graph):
+    graph, vertices = setup_graph
+    a, c, h = vertices["A"], vertices["C"], vertices["H"]
+
+    changes = graph.update_edges([(a, c, 1.5), (a, h, 0.5), (c, a, 9.0)])
+
+    assert graph.version == 1
+    assert [(start.value, edge.vertex.value, old) for start, edge, old in changes] == [("A", "H", None), ("C", "A", 1.5)]
+    assert dijkstra(graph, a, h) == (0.5, ["A", "H"])
+    assert graph.update_edges([(a, h, 0.5)]) == []
+    assert graph.version == 1
+
+
+def test_dynamic_tree_repair_matches_dijkstra(setup_graph):
+    graph, vertices = setup_graph
+    v = vertices
+    tree = DynamicShortestPathTree(graph, v["A"])
+    batches = [
+        [(v["A"], v["C"], 5.0), (v["F"], v["H"], 0.2)],            # Увеличение ребра дерева и уменьшение
+        [(v["A"], v["D"], float("inf")), (v["A"], v["G"], 0.3)],   # Закрытое ребро и новое ребро
+        [(v["A"], v["C"], 0.1), (v["A"], v["D"], 1.0)],
+    ]
+    for batch in batches:
+        tree.repair(graph.update_edges(batch))
+        for end in vertices.values():
+            expected = dijkstra(graph, v["A"], end)
+            result = tree.query(end)
+            assert result[0] == pytest.approx(expected[0])
+            assert result[1] == expected[1]
+
+
+def test_query_cache_repairs_trees(setup_graph):
+    graph, vertices = setup_graph
+    cache = QueryCache(graph, tree_threshold=1)
+    a = vertices["A"]
+    cache.query(a, vertices["H"])
+
+    cache.update_edges([(vertices["D"], vertices["G"], 0.1), (vertices["G"], vertices["H"], 0.1)])
+    results = [cache.query(a, end) for end in vertices.values()]
+
+    assert results == [dijkstra(graph, a, end) for end in vertices.values()]
+    assert cache.stats()['trees'] == 1
+    assert cache.stats()['repairs'] == 1
+    assert cache.stats()['invalidations'] == 0
+
+
+def test_import_is_lazy():
+    code = "import sys, djikstra; print('numpy' in sys.modules, 'djikstra.batch' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+
+    assert output.split() == ["False", "False"]
+
+
+def test_read_edge_list_and_csv(tmp_path):
+    edges = tmp_path / "graph.txt"
+    edges.write_text("# комментарий\nA B 2\nB C\n", encoding="utf-8")
+    table = tmp_path / "graph.csv"
+    table.write_text("source,target,weight\nA,B,2\nB,C,\n", encoding="utf-8")
+
+    for graph, vertices in (read_edge_list(edges), read_csv(table)):
+        assert dijkstra(graph, vertices["A"], vertices["C"]) == (3.0, ["A", "B", "C"])
+        assert dijkstra(graph, vertices["C"], vertices["A"]) is None
+    graph, vertices = read_edge_list(edges, directed=False)
+    assert dijkstra(graph, vertices["C"], vertices["A"]) == (3.0, ["C", "B", "A"])
+
+
+def test_cli_answers_queries(tmp_path):
+    edges = tmp_path / "graph.txt"
+    edges.write_text("A B 2\nB C 1.5\nA C 4\n", encoding="utf-8")
+    stdout = io.StringIO()
+
+    main([str(edges), "--batch-size", "2"], stdin=io.StringIO("A C\nA B\n\nC A\nA Z\nB B\n"), stdout=stdout)
+
+    assert stdout.getvalue().splitlines() == [
+        "A\tC\t3.5\tA B C", "A\tB\t2\tA B", "C\tA\tinf\t", "A\tZ\tinf\t", "B\tB\t0\tB",
+    ]
+
+
+def test_cli_skips_malformed_queries(tmp_path, capsys):
+    edges = tmp_path / "graph.txt"
+    edges.write_text("A B 2\nB C 1.5\n", encoding="utf-8")
+    stdout, stderr = io.StringIO(), io.StringIO()
+
+    status = main([str(edges)], stdin=io.StringIO("A C\nA B C\nA\nB C\n"), stdout=stdout, stderr=stderr)
+
+    assert status == 1
+    assert stdout.getvalue().splitlines() == ["A\tC\t3.5\tA B C", "B\tC\t1.5\tB C"]
+    assert [line.split(":")[1].strip() for line in stderr.getvalue().splitlines()] == ["запрос 2", "запрос 3"]
+
+    with pytest.raises(SystemExit) as error:
+        main([str(tmp_path / "missing.txt")], stdin=io.StringIO(""), stdout=io.StringIO())
+    assert error.value.code == 1
+    assert "Traceback" not in capsys.readouterr().err
+
+
+def test_binary_graph_round_trip(setup_graph, tmp_path):
+    graph, vertices = setup_graph
+    path = tmp_path / "graph.djg"
+    save_binary(graph, path)
+
+    mapped = pickle.loads(pickle.dumps(load_binary(path)))
+
+    assert len(mapped) == 8 and mapped.num_edges == 26
+    assert mapped.label(mapped.find("F")) == "F" and "Z" not in mapped
+    for end in vertices.values():
+        assert mapped.query("A", end.value) == dijkstra(graph, vertices["A"], end)
+    assert mapped.query("A", "Z") is None
+
+
+def test_binary_graph_rejects_other_files(tmp_path):
+    path = tmp_path / "graph.txt"
+    path.write_bytes(b"A B 1\n" * 20)
+
+    with pytest.raises(ValueError):
+        load_binary(path)
+
+
+def test_cli_closed_output_pipe(tmp_path):
+    edges = tmp_path / "graph.txt"
+    edges.write_text("A B 2\nB C 1.5\n", encoding="utf-8")
+    read_end, write_end = os.pipe()
+    os.close(read_end)  # Получатель вывода уже закрыл канал, как head после первых строк
+
+    process = subprocess.run(
+        [sys.executable, "-m", "djikstra", str(edges)], input="A C\n" * 20000, stdout=write_end,
+        stderr=subprocess.PIPE, text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    os.close(write_end)
+
+    assert process.returncode == 1
+    assert process.stderr == ""
+
+
+def test_cli_binary_graph(tmp_path):
+    edges = tmp_path / "graph.txt"
+    edges.write_text("A B 2\nB C 1.5\n", encoding="utf-8")
+    binary = tmp_path / "graph.djg"
+    main([str(edges), "--save", str(binary)])
+    stdout = io.StringIO()
+
+    main([str(binary)], stdin=io.StringIO("A C\nC A\n"), stdout=stdout)
+
+    assert stdout.getvalue().splitlines() == ["A\tC\t3.5\tA B C", "C\tA\tinf\t"]